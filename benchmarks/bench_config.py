@@ -0,0 +1,89 @@
+"""
+Benchmark `read_config` dengan cache dibandingkan parsing ulang setiap pemanggilan.
+
+File dibuat seukuran `config.json` (~300 kunci) dan `ui-config.json` (~2000 kunci) WebUI,
+plus versi YAML dan TOML dari config yang sama.
+
+Contoh:
+    python benchmarks/bench_config.py --iterations 500
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import toml
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exnavy.utils.config_utils import read_config
+
+def webui_config(keys):
+    config = {}
+    for index in range(keys):
+        kind = index % 5
+        if kind == 0:
+            config[f"option_{index}"] = index % 2 == 0
+        elif kind == 1:
+            config[f"option_{index}"] = index * 0.5
+        elif kind == 2:
+            config[f"option_{index}"] = f"value {index} " * 3
+        elif kind == 3:
+            config[f"option_{index}"] = [f"item{i}" for i in range(5)]
+        else:
+            config[f"option_{index}"] = index
+    return config
+
+def ui_config(keys):
+    return {f"txt2img/Element {index}/{'value' if index % 2 else 'visible'}": index if index % 2 else True for index in range(keys)}
+
+def legacy_read(filename):
+    with open(filename, "r") as f:
+        if filename.endswith(".json"):
+            return json.load(f)
+        if filename.endswith(".yaml"):
+            return yaml.safe_load(f)
+        return toml.load(f)
+
+def bench(func, filename, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(filename)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="exnavy-bench-")
+    try:
+        files = {}
+        files["config.json"] = webui_config(300)
+        files["ui-config.json"] = ui_config(2000)
+        files["config.yaml"] = files["config.json"]
+        files["config.toml"] = files["config.json"]
+
+        for name, config in files.items():
+            path = os.path.join(workdir, name)
+            with open(path, "w") as f:
+                if name.endswith(".json"):
+                    json.dump(config, f, indent=4)
+                elif name.endswith(".yaml"):
+                    yaml.dump(config, f)
+                else:
+                    toml.dump(config, f)
+
+            legacy = bench(legacy_read, path, args.iterations)
+            uncached = bench(lambda filename: read_config(filename, use_cache=False), path, args.iterations)
+            cached = bench(read_config, path, args.iterations)
+            print(f"{name:15} {os.path.getsize(path) / 1024:7.1f} KiB  legacy {legacy:9.1f} us  parser {uncached:9.1f} us  cached {cached:8.1f} us  ({legacy / cached:.1f}x)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark throughput baca untuk setiap backend `layered_dir` yang tersedia.
+
+File besar dibuat di layer bawah, lalu dibaca lewat tampilan gabungan setiap backend
+(ditambah baca langsung sebagai baseline). Page cache sudah hangat, sehingga angka ini
+mengukur overhead lapisan (misalnya hop FUSE), bukan kecepatan disk.
+
+Contoh:
+    python benchmarks/bench_layered_dir.py --size-mb 1024
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exnavy.utils.ubuntu import LAYER_BACKENDS, layered_dir, unmount_layered_dir
+
+def read_throughput(path, repeat, chunk_size=1024 * 1024):
+    size = os.path.getsize(path)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        with open(path, "rb", buffering=0) as f:
+            while f.read(chunk_size):
+                pass
+    return size * repeat / (time.perf_counter() - start) / 2**20
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="exnavy-bench-")
+    try:
+        lower = os.path.join(workdir, "lower")
+        os.makedirs(lower)
+        model = os.path.join(lower, "model.safetensors")
+        with open(model, "wb") as f:
+            for _ in range(args.size_mb):
+                f.write(os.urandom(1024 * 1024))
+
+        print(f"{'direct':15}: {read_throughput(model, args.repeat):8.1f} MiB/s")
+        for backend in LAYER_BACKENDS:
+            merged = os.path.join(workdir, f"merged-{backend}")
+            try:
+                layered_dir([lower], os.path.join(workdir, f"upper-{backend}"), merged, backend=backend)
+            except RuntimeError:
+                print(f"{backend:15}: tidak tersedia")
+                continue
+            try:
+                print(f"{backend:15}: {read_throughput(os.path.join(merged, 'model.safetensors'), args.repeat):8.1f} MiB/s")
+            finally:
+                unmount_layered_dir(merged, backend)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark `nested_zip_extractor` dibandingkan implementasi lama berbasis `dir_map`.
+
+Kedua implementasi dijalankan pada zip sintetis, hasil layout-nya dibandingkan, lalu
+waktu dan puncak memori (tracemalloc) dicetak.
+
+Contoh:
+    python benchmarks/bench_nested_zip.py --entries 500000
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+import zlib
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exnavy.utils.package_utils import _nested_zip_layout, nested_zip_extractor
+
+def legacy_nested_zip_extractor(zip_path, extract_to):
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        dir_map = defaultdict(list)
+        for name in zip_ref.namelist():
+            if not name.endswith('/'):
+                parts = name.split('/')
+                for i in range(1, len(parts)):
+                    dir_map['/'.join(parts[:i])].append(name)
+
+        subfolders = [folder for folder in dir_map.keys() if len(dir_map[folder]) > 0]
+        if len(subfolders) == 1:
+            extract_to = os.path.join(extract_to, subfolders[0])
+
+        for member in zip_ref.infolist():
+            if not member.is_dir():
+                parts = member.filename.split('/')
+                for i in range(len(parts) - 1, 0, -1):
+                    directory = '/'.join(parts[:i])
+                    if len(dir_map[directory]) > 1 or i == 1:
+                        target_path = os.path.join(extract_to, *parts[i-1:])
+                        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                        with zip_ref.open(member) as source, open(target_path, 'wb') as target:
+                            shutil.copyfileobj(source, target)
+                        break
+
+def legacy_layout(infolist, extract_to):
+    dir_map = defaultdict(list)
+    for info in infolist:
+        if not info.filename.endswith('/'):
+            parts = info.filename.split('/')
+            for i in range(1, len(parts)):
+                dir_map['/'.join(parts[:i])].append(info.filename)
+
+    if len(dir_map) == 1:
+        extract_to = os.path.join(extract_to, next(iter(dir_map)))
+
+    for info in infolist:
+        if not info.is_dir():
+            parts = info.filename.split('/')
+            for i in range(len(parts) - 1, 0, -1):
+                if len(dir_map['/'.join(parts[:i])]) > 1 or i == 1:
+                    yield info, os.path.join(extract_to, *parts[i-1:])
+                    break
+
+def make_zip(path, entries, seed=0):
+    rng = random.Random(seed)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zip_ref:
+        for index in range(entries):
+            depth = rng.randint(1, 6)
+            parts = ["root"] + [f"d{rng.randint(0, 3 if level < 3 else 40)}" for level in range(depth - 1)]
+            if rng.random() < 0.05:
+                parts.append(f"solo{index}")
+            zip_ref.writestr("/".join(parts + [f"f{index}.txt"]), b"x")
+
+def listing(directory):
+    return sorted(os.path.relpath(os.path.join(root, name), directory) for root, _, files in os.walk(directory) for name in files)
+
+def measure(func, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=500000)
+    parser.add_argument("--plan-only", action="store_true", help="Hanya ukur penentuan layout, tanpa menulis file.")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="exnavy-bench-")
+    try:
+        archive = os.path.join(workdir, "nested.zip")
+        make_zip(archive, args.entries)
+
+        if args.plan_only:
+            with zipfile.ZipFile(archive) as zip_ref:
+                infolist = zip_ref.infolist()
+            layouts = {}
+            for label, layout in (("legacy", legacy_layout), ("new", _nested_zip_layout)):
+                tracemalloc.start()
+                start = time.perf_counter()
+                layouts[label] = sum(zlib.crc32(target.encode()) for _, target in layout(infolist, workdir))
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f"{label:7}: {elapsed:.2f}s peak={peak / 2**20:.1f} MiB")
+            print(f"entries={args.entries} identical={layouts['legacy'] == layouts['new']}")
+            return
+
+        legacy_dir = os.path.join(workdir, "legacy")
+        new_dir = os.path.join(workdir, "new")
+        legacy_time, legacy_peak = measure(legacy_nested_zip_extractor, archive, legacy_dir)
+        new_time, new_peak = measure(nested_zip_extractor, archive, new_dir)
+
+        print(f"entries={args.entries} identical={listing(legacy_dir) == listing(new_dir)}")
+        print(f"legacy : {legacy_time:.2f}s peak={legacy_peak / 2**20:.1f} MiB")
+        print(f"new    : {new_time:.2f}s peak={new_peak / 2**20:.1f} MiB ({legacy_time / new_time:.2f}x)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark ekstraksi zip: `ZipFile.extractall` dibandingkan `parallel_extract_zip`.
+
+Contoh:
+    python benchmarks/bench_zip_extract.py --files 20000 --size 65536
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exnavy.utils.package_utils import parallel_extract_zip
+
+def make_zip(path, files, size):
+    block = os.urandom(size // 2)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+        for index in range(files):
+            zip_ref.writestr(f"data/{index % 100:02d}/{index}.bin", block + bytes(size - len(block)))
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=64 * 1024)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="exnavy-bench-")
+    try:
+        archive = os.path.join(workdir, "bench.zip")
+        make_zip(archive, args.files, args.size)
+
+        with zipfile.ZipFile(archive) as zip_ref:
+            baseline = timed(zip_ref.extractall, os.path.join(workdir, "extractall"))
+        parallel = timed(parallel_extract_zip, archive, os.path.join(workdir, "parallel"), workers=args.workers)
+
+        print(f"files={args.files} size={args.size} cpus={os.cpu_count()}")
+        print(f"extractall          : {baseline:.3f}s")
+        print(f"parallel_extract_zip: {parallel:.3f}s ({baseline / parallel:.2f}x)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Simulasi cold start notebook dari VM kosong sampai WebUI siap, tanpa internet.
+
+Harness menjalankan server HTTP lokal yang menyajikan "model" sintetis berukuran besar
+(mendukung Range, dengan latensi dan batas bandwidth yang bisa diatur) dan membuat repositori
+Git bare lokal. Setelah itu fase-fase setup dijalankan seperti notebook sungguhan:
+`batch_clone` ekstensi, `batch_download` model, `extract_package` paket, lalu `batch_update`
+setelah origin mendapat komit baru. Waktu setiap fase dicetak beserta ringkasan span dari
+`trace_utils`, dan bisa disimpan ke JSON untuk dibandingkan dengan baseline.
+
+Contoh:
+    python benchmarks/bootstrap_sim.py --models 2 --model-size 2048 --latency 0.05 --bandwidth 200
+    python benchmarks/bootstrap_sim.py --output before.json
+    python benchmarks/bootstrap_sim.py --compare before.json --trace trace.json
+"""
+import argparse
+import hashlib
+import http.server
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MiB = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+class Throttle:
+    """
+    Token bucket sederhana; `rate` dalam byte per detik, Tidak Ada berarti tanpa batas.
+    """
+    def __init__(self, rate):
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.next_time = time.monotonic()
+
+    def consume(self, size):
+        if not self.rate:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start = max(self.next_time, now)
+            self.next_time = start + size / self.rate
+            delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+
+class SyntheticFile:
+    """
+    Isi file deterministik yang dibangkitkan saat dibaca, jadi file multi-GB tidak perlu ada di disk.
+    """
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        seed = hashlib.sha256(name.encode()).digest()
+        self.block = (seed * (MiB // len(seed) + 1))[:MiB]
+
+    def read(self, offset, size):
+        start = offset % len(self.block)
+        data = self.block[start:start + size]
+        while len(data) < size:
+            data += self.block[:size - len(data)]
+        return data
+
+class StandInServer:
+    """
+    Server HTTP lokal dengan dukungan HEAD, Range, latensi per request, dan batas bandwidth
+    total maupun per koneksi.
+    """
+    def __init__(self, files, latency=0.0, bandwidth=None, conn_bandwidth=None):
+        self.files = {item.name: item for item in files}
+        self.latency = latency
+        self.throttle = Throttle(bandwidth)
+        self.conn_bandwidth = conn_bandwidth
+        self.requests = 0
+        self.bytes_sent = 0
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _serve(self, send_body):
+                server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                item = server.files.get(self.path.split("?")[0].lstrip("/"))
+                if item is None:
+                    self.send_error(404)
+                    return
+
+                start, end = 0, item.size - 1
+                match = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+                if match and (match.group(1) or match.group(2)):
+                    if match.group(1):
+                        start = int(match.group(1))
+                        end = min(int(match.group(2)), item.size - 1) if match.group(2) else item.size - 1
+                    else:
+                        start = max(0, item.size - int(match.group(2)))
+                    if start > end:
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{item.size}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{item.size}")
+                else:
+                    self.send_response(200)
+
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("Content-Length", str(end - start + 1))
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("ETag", f'"{item.name}-{item.size}"')
+                self.end_headers()
+                if not send_body:
+                    return
+
+                connection = Throttle(server.conn_bandwidth)
+                offset = start
+                try:
+                    while offset <= end:
+                        size = min(CHUNK_SIZE, end - offset + 1)
+                        server.throttle.consume(size)
+                        connection.consume(size)
+                        self.wfile.write(item.read(offset, size))
+                        offset += size
+                        server.bytes_sent += size
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def do_HEAD(self):
+                self._serve(False)
+
+            def do_GET(self):
+                self._serve(True)
+
+        return Handler
+
+def git(*args, cwd=None):
+    subprocess.run(["git", "-c", "user.name=sim", "-c", "user.email=sim@localhost", *args], cwd=cwd, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def make_origin_repos(root, count, files):
+    origins = []
+    for index in range(count):
+        work = os.path.join(root, "seed", f"extension-{index}")
+        bare = os.path.join(root, "origin", f"extension-{index}.git")
+        os.makedirs(os.path.join(work, "scripts"))
+        for number in range(files):
+            with open(os.path.join(work, "scripts", f"module_{number}.py"), "w") as f:
+                f.write(f"# extension {index} module {number}\n" * 50)
+        git("init", "--quiet", "-b", "main", cwd=work)
+        git("add", "-A", cwd=work)
+        git("commit", "--quiet", "-m", "initial", cwd=work)
+        git("init", "--quiet", "--bare", "-b", "main", bare)
+        git("push", "--quiet", bare, "main", cwd=work)
+        origins.append((work, bare))
+    return origins
+
+def advance_origins(origins):
+    for work, bare in origins:
+        with open(os.path.join(work, "CHANGELOG.md"), "a") as f:
+            f.write(f"update {time.time()}\n")
+        git("add", "-A", cwd=work)
+        git("commit", "--quiet", "-m", "update", cwd=work)
+        git("push", "--quiet", bare, "main", cwd=work)
+
+def make_package(path, files, size):
+    with tarfile.open(path, "w:gz", compresslevel=1) as tar:
+        for index in range(files):
+            data = (f"# file {index}\n" * max(1, size // files // 10)).encode()
+            info = tarfile.TarInfo(f"venv/lib/site-packages/pkg_{index % 50}/module_{index}.py")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+def run_phase(name, func, phases):
+    from exnavy.utils.trace_utils import span
+    print(f"[{name}] ...", file=sys.stderr)
+    start = time.perf_counter()
+    try:
+        with span(f"phase.{name}", category="phase"):
+            detail = func()
+        phases[name] = {"seconds": time.perf_counter() - start, "detail": detail}
+    except ImportError as e:
+        phases[name] = {"skipped": f"{type(e).__name__}: {e}"}
+    except Exception as e:
+        phases[name] = {"seconds": time.perf_counter() - start, "error": f"{type(e).__name__}: {e}"}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", type=int, default=2, help="Jumlah model sintetis.")
+    parser.add_argument("--model-size", type=int, default=512, help="Ukuran setiap model dalam MiB.")
+    parser.add_argument("--repos", type=int, default=20, help="Jumlah repositori ekstensi.")
+    parser.add_argument("--repo-files", type=int, default=100, help="Jumlah file per repositori.")
+    parser.add_argument("--package-size", type=int, default=64, help="Ukuran kira-kira isi paket dalam MiB.")
+    parser.add_argument("--package-files", type=int, default=5000, help="Jumlah file di dalam paket.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latensi per request HTTP dalam detik.")
+    parser.add_argument("--bandwidth", type=float, default=None, help="Batas bandwidth total server dalam MiB/s.")
+    parser.add_argument("--conn-bandwidth", type=float, default=None, help="Batas bandwidth per koneksi dalam MiB/s.")
+    parser.add_argument("--phases", default="clone,download,extract,update", help="Fase yang dijalankan, dipisah koma.")
+    parser.add_argument("--workdir", help="Direktori kerja. Defaultnya direktori sementara yang dihapus setelah selesai.")
+    parser.add_argument("--output", help="Simpan hasil ke file JSON.")
+    parser.add_argument("--compare", help="File JSON baseline untuk dibandingkan.")
+    parser.add_argument("--trace", help="Simpan Chrome trace ke file ini.")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="exnavy-bootstrap-")
+    os.makedirs(workdir, exist_ok=True)
+    os.environ["EXNAVY_CACHE_DIR"] = os.path.join(workdir, "cache")
+
+    from exnavy.utils.trace_utils import clear_trace, enable_tracing, export_chrome_trace, print_trace_summary
+    enable_tracing()
+
+    models = [SyntheticFile(f"models/model_{index}.safetensors", args.model_size * MiB) for index in range(args.models)]
+    content = os.path.join(workdir, "content")
+    server = None
+    try:
+        print("menyiapkan fixture...", file=sys.stderr)
+        origins = make_origin_repos(os.path.join(workdir, "remote"), args.repos, args.repo_files)
+        package = os.path.join(workdir, "remote", "venv.tar.gz")
+        make_package(package, args.package_files, args.package_size * MiB)
+
+        server = StandInServer(models, latency=args.latency,
+                               bandwidth=args.bandwidth * MiB if args.bandwidth else None,
+                               conn_bandwidth=args.conn_bandwidth * MiB if args.conn_bandwidth else None).start()
+        clear_trace()
+
+        extensions = os.path.join(content, "extensions")
+        model_dir = os.path.join(content, "models")
+        os.makedirs(extensions, exist_ok=True)
+        os.makedirs(model_dir, exist_ok=True)
+
+        def clone():
+            from exnavy.utils.git_utils import batch_clone
+            results = batch_clone([f"file://{bare}" for _, bare in origins], directory=extensions, quiet=True)
+            return {"ok": sum(result.ok for result in results), "total": len(results)}
+
+        def download():
+            from exnavy.sd_models.downloader import batch_download
+            batch_download([f"{server.url}/{model.name}" for model in models], model_dir, quiet=True)
+            sizes = [os.path.getsize(os.path.join(model_dir, os.path.basename(model.name))) for model in models
+                     if os.path.exists(os.path.join(model_dir, os.path.basename(model.name)))]
+            return {"files": len(sizes), "bytes": sum(sizes), "requests": server.requests}
+
+        def extract():
+            from exnavy.utils.package_utils import extract_package
+            extract_package(package, content, quiet=True)
+            return {"bytes": os.path.getsize(package)}
+
+        def update():
+            from exnavy.utils.git_utils import batch_update
+            advance_origins(origins)
+            results = batch_update(extensions, quiet=True)
+            return {"updated": sum(result.status == "updated" for result in results), "total": len(results)}
+
+        steps = {"clone": clone, "download": download, "extract": extract, "update": update}
+        phases = {}
+        total_start = time.perf_counter()
+        for name in args.phases.split(","):
+            run_phase(name, steps[name], phases)
+        total = time.perf_counter() - total_start
+    finally:
+        if server is not None:
+            server.stop()
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+
+    print(f"{'phase':<10} {'seconds':>9}  detail")
+    for name, phase in phases.items():
+        if "skipped" in phase:
+            print(f"{name:<10} {'skipped':>9}  {phase['skipped']}")
+            continue
+        line = f"{name:<10} {phase['seconds']:>9.2f}  {phase.get('error') or json.dumps(phase['detail'])}"
+        base = (baseline or {}).get("phases", {}).get(name, {})
+        if "seconds" in base:
+            line += f"  (baseline {base['seconds']:.2f}s, {base['seconds'] / phase['seconds']:.2f}x)"
+        print(line)
+    print(f"{'total':<10} {total:>9.2f}" + (f"  (baseline {baseline['total']:.2f}s)" if baseline else ""))
+    print()
+    print_trace_summary()
+
+    if args.trace:
+        export_chrome_trace(args.trace)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "created": time.time(), "total": total, "phases": phases}, f, indent=4)
+
+if __name__ == "__main__":
+    main()
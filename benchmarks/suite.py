@@ -0,0 +1,358 @@
+"""
+Suite micro-benchmark untuk jalur panas exnavy.
+
+Semua fixture (file acak, safetensors sintetis, arsip zip/tar, config, file teks besar) dibuat
+di direktori sementara, jadi suite berjalan tanpa internet. Setiap benchmark dijalankan beberapa
+kali; waktu min/median dan throughput disimpan ke JSON agar bisa dibandingkan sebelum dan sesudah
+perubahan. Benchmark yang dependensinya tidak terpasang ditandai "skipped".
+
+Contoh:
+    python benchmarks/suite.py --output benchmarks/results/before.json
+    python benchmarks/suite.py --compare benchmarks/results/before.json
+    python benchmarks/suite.py --only config,extract --scale 0.25
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import struct
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_config import ui_config, webui_config
+
+MiB = 1024 * 1024
+
+BENCHMARKS = []
+
+def benchmark(name, repeat=5):
+    """
+    Mendaftarkan benchmark. Fungsi menerima `Fixtures` dan mengembalikan (callable, bytes);
+    hanya callable yang diukur.
+    """
+    def decorator(func):
+        BENCHMARKS.append((name, func, repeat))
+        return func
+    return decorator
+
+class Fixtures:
+    def __init__(self, workdir, scale):
+        self.workdir = workdir
+        self.scale = scale
+        self._cache = {}
+        self._counter = 0
+
+    def path(self, name):
+        return os.path.join(self.workdir, name)
+
+    def fresh_dir(self, prefix):
+        self._counter += 1
+        return self.path(f"{prefix}-{self._counter}")
+
+    def size(self, size):
+        return max(1, int(size * self.scale))
+
+    def once(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def random_file(self, name, size):
+        def build():
+            path = self.path(name)
+            with open(path, "wb") as f:
+                remaining = size
+                while remaining:
+                    chunk = min(remaining, MiB)
+                    f.write(os.urandom(chunk))
+                    remaining -= chunk
+            return path
+        return self.once(("random", name, size), build)
+
+    def safetensors_file(self, tensors=400, shape=(128, 128)):
+        def build():
+            path = self.path("lora.safetensors")
+            tensor_bytes = shape[0] * shape[1] * 2
+            header = {"__metadata__": {
+                "ss_network_module": "networks.lora",
+                "ss_network_dim"   : "32",
+                "ss_network_alpha" : "16",
+                "ss_network_args"  : json.dumps({"conv_dim": "8", "conv_alpha": "4", "algo": "lora"}),
+            }}
+            for index in range(tensors):
+                header[f"lora_unet_block_{index}.lora_down.weight"] = {
+                    "dtype": "F16", "shape": list(shape), "data_offsets": [index * tensor_bytes, (index + 1) * tensor_bytes],
+                }
+            header_bytes = json.dumps(header).encode()
+            header_bytes += b" " * (-len(header_bytes) % 8)
+            with open(path, "wb") as f:
+                f.write(struct.pack("<Q", len(header_bytes)))
+                f.write(header_bytes)
+                f.write(b"\0" * tensor_bytes * tensors)
+            return path
+        return self.once("safetensors", build)
+
+    def tree(self):
+        def build():
+            rng = random.Random(0)
+            files = {}
+            for index in range(self.size(4000)):
+                files[f"extensions/ext{index % 40}/scripts/module_{index}.py"] = (f"# module {index}\n" * rng.randint(5, 200)).encode()
+            for index in range(4):
+                files[f"models/model_{index}.bin"] = os.urandom(self.size(16 * MiB))
+            return files
+        return self.once("tree", build)
+
+    def zip_file(self):
+        def build():
+            path = self.path("package.zip")
+            with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+                for name, data in self.tree().items():
+                    zf.writestr(name, data, compress_type=zipfile.ZIP_STORED if name.endswith(".bin") else zipfile.ZIP_DEFLATED)
+            return path
+        return self.once("zip", build)
+
+    def tar_file(self):
+        def build():
+            path = self.path("package.tar.gz")
+            with tarfile.open(path, "w:gz", compresslevel=1) as tar:
+                for name, data in self.tree().items():
+                    info = tarfile.TarInfo(name)
+                    info.size = len(data)
+                    tar.addfile(info, io.BytesIO(data))
+            return path
+        return self.once("tar", build)
+
+    def nested_zip_file(self):
+        def build():
+            path = self.path("nested.zip")
+            with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zf:
+                for index in range(self.size(20000)):
+                    zf.writestr(f"root/pack/set_{index % 200}/group_{index % 7}/item_{index}.txt", b"x" * 64)
+            return path
+        return self.once("nested", build)
+
+    def config_file(self, name):
+        def build():
+            config = ui_config(2000) if name.startswith("ui-config") else webui_config(300)
+            path = self.path(name)
+            from exnavy.utils.config_utils import write_config
+            write_config(path, {"root": config} if name.endswith(".xml") else config)
+            return path
+        return self.once(("config", name), build)
+
+    def text_file(self):
+        def build():
+            path = self.path("launch.py")
+            with open(path, "w") as f:
+                for index in range(self.size(1_000_000)):
+                    f.write(f"    opts.option_{index % 997} = shared.cmd_opts.value_{index}  # line {index}\n")
+            return path
+        return self.once("text", build)
+
+@benchmark("hash.sha256", repeat=3)
+def bench_sha256(fx):
+    from exnavy.sd_models.validator import Validator
+    path = fx.random_file("model.bin", fx.size(512 * MiB))
+    return lambda: Validator.sha256(path), os.path.getsize(path)
+
+@benchmark("validator.validate_lora", repeat=20)
+def bench_validate_lora(fx):
+    from exnavy.sd_models.validator import Validator
+    path = fx.safetensors_file()
+    return lambda: Validator.validate_lora(path), None
+
+@benchmark("extract.zip", repeat=3)
+def bench_extract_zip(fx):
+    from exnavy.utils.package_utils import extract_package
+    path = fx.zip_file()
+    return lambda: extract_package(path, fx.fresh_dir("zip"), quiet=True), sum(map(len, fx.tree().values()))
+
+@benchmark("extract.tar_gz", repeat=3)
+def bench_extract_tar(fx):
+    from exnavy.utils.package_utils import extract_package
+    path = fx.tar_file()
+    return lambda: extract_package(path, fx.fresh_dir("tar"), quiet=True), sum(map(len, fx.tree().values()))
+
+@benchmark("extract.nested_zip", repeat=3)
+def bench_nested_zip(fx):
+    from exnavy.utils.package_utils import nested_zip_extractor
+    path = fx.nested_zip_file()
+    return lambda: nested_zip_extractor(path, fx.fresh_dir("nested")), None
+
+def _config_benchmarks():
+    for name in ("config.json", "ui-config.json", "config.yaml", "config.toml", "config.xml"):
+        def read_uncached(fx, name=name):
+            from exnavy.utils.config_utils import read_config
+            path = fx.config_file(name)
+            return lambda: [read_config(path, use_cache=False) for _ in range(20)], os.path.getsize(path) * 20
+
+        def read_cached(fx, name=name):
+            from exnavy.utils.config_utils import read_config
+            path = fx.config_file(name)
+            read_config(path)
+            return lambda: [read_config(path) for _ in range(20)], os.path.getsize(path) * 20
+
+        def write(fx, name=name):
+            from exnavy.utils.config_utils import read_config, write_config
+            path = fx.config_file(name)
+            config = read_config(path)
+            target = fx.path(f"write-{name}")
+            return lambda: [write_config(target, config) for _ in range(5)], os.path.getsize(path) * 5
+
+        benchmark(f"config.read.{name}")(read_uncached)
+        benchmark(f"config.read_cached.{name}")(read_cached)
+        benchmark(f"config.write.{name}")(write)
+
+_config_benchmarks()
+
+@benchmark("config.change_line", repeat=3)
+def bench_change_line(fx):
+    from exnavy.utils.config_utils import change_line
+    path = fx.text_file()
+    state = {"value": 0}
+
+    def run():
+        old, state["value"] = state["value"], state["value"] + 1
+        change_line(path, f"value_{old}  ", f"value_{state['value']}  ")
+    return run, os.path.getsize(path)
+
+@benchmark("config.edit_file_10_rules", repeat=3)
+def bench_edit_file(fx):
+    from exnavy.utils.config_utils import edit_file
+    path = fx.text_file()
+    forward = [(f"option_{index} =", f"option_{index}  =") for index in range(10)]
+    backward = [(new, old) for old, new in forward]
+    state = {"rules": forward}
+
+    def run():
+        edit_file(path, state["rules"])
+        state["rules"] = backward if state["rules"] is forward else forward
+    return run, os.path.getsize(path)
+
+@benchmark("downloader.parse_args", repeat=5)
+def bench_parse_args(fx):
+    from exnavy.sd_models.downloader import parse_args
+    config = {
+        "console-log-level": "error", "summary-interval": 10, "header": None, "continue": True,
+        "max-connection-per-server": 16, "min-split-size": "1M", "split": 16, "dir": "/content/models",
+        "out": "model.safetensors", "_url": "https://example.com/model.safetensors",
+    }
+    return lambda: [parse_args(config) for _ in range(10000)], None
+
+@benchmark("colortes.cprint", repeat=5)
+def bench_cprint(fx):
+    from exnavy.colortes import cprint, flush_output
+    sink = open(os.devnull, "w")
+
+    def run():
+        with redirect_stdout(sink):
+            for index in range(10000):
+                cprint("Unduhan", index, "selesai", color="green")
+            flush_output()
+    return run, None
+
+def run_benchmark(fx, name, func, repeat):
+    try:
+        call, size = func(fx)
+    except ImportError as e:
+        return {"skipped": f"{type(e).__name__}: {e}"}
+
+    call()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+
+    result = {"min": min(times), "median": statistics.median(times), "mean": statistics.mean(times), "repeat": repeat}
+    if size:
+        result["bytes"] = size
+        result["mib_per_s"] = size / MiB / result["median"]
+    return result
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def print_results(results, baseline=None):
+    width = max(len(name) for name in results)
+    header = f"{'benchmark':<{width}}  {'median':>10}  {'min':>10}  {'MiB/s':>8}"
+    if baseline:
+        header += f"  {'baseline':>10}  {'speedup':>8}"
+    print(header)
+    for name, result in results.items():
+        if "skipped" in result:
+            print(f"{name:<{width}}  skipped ({result['skipped']})")
+            continue
+        line = f"{name:<{width}}  {result['median'] * 1e3:>8.2f}ms  {result['min'] * 1e3:>8.2f}ms  {result.get('mib_per_s', 0):>8.1f}"
+        base = (baseline or {}).get(name)
+        if base and "median" in base:
+            line += f"  {base['median'] * 1e3:>8.2f}ms  {base['median'] / result['median']:>7.2f}x"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", help="Jalankan benchmark yang namanya mengandung salah satu kata ini (dipisah koma).")
+    parser.add_argument("--scale", type=float, default=1.0, help="Pengali ukuran fixture.")
+    parser.add_argument("--output", help="File JSON hasil. Defaultnya benchmarks/results/<revisi git>.json.")
+    parser.add_argument("--compare", help="File JSON hasil sebelumnya untuk dibandingkan.")
+    parser.add_argument("--list", action="store_true", help="Tampilkan daftar benchmark.")
+    args = parser.parse_args()
+
+    selected = BENCHMARKS
+    if args.only:
+        words = args.only.split(",")
+        selected = [item for item in BENCHMARKS if any(word in item[0] for word in words)]
+    if args.list:
+        for name, _, repeat in selected:
+            print(f"{name} (x{repeat})")
+        return
+
+    workdir = tempfile.mkdtemp(prefix="exnavy-suite-")
+    results = {}
+    try:
+        fx = Fixtures(workdir, args.scale)
+        for name, func, repeat in selected:
+            print(f"running {name}...", file=sys.stderr)
+            results[name] = run_benchmark(fx, name, func, repeat)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+
+    revision = git_revision()
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{revision}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "revision": revision,
+            "created" : time.time(),
+            "python"  : sys.version,
+            "platform": platform.platform(),
+            "cpus"    : os.cpu_count(),
+            "scale"   : args.scale,
+            "results" : results,
+        }, f, indent=4)
+    print(f"hasil disimpan ke {output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
+import atexit
 import datetime
-import pytz
+import os
+import queue
+import sys
+import threading
 
 COLORS = {
     "default"      : "\033[0m",
@@ -41,10 +45,150 @@ style_codes = {
     "strikethrough": "\033[9m",
 }
 
-def cprint(*args, color="default", style="normal", bg_color=None, reset=True, timestamp=False, line=None, tqdm_desc=False, timestamp_format='%Y-%m-%d %H:%M:%S', prefix=None, suffix=None, timezone=None):
+ERROR = 0
+INFO = 1
+DEBUG = 2
+
+_ERROR_COLORS = ("red", "light_red", "flat_red")
+
+def _env_verbosity():
+    try:
+        return int(os.environ.get("EXNAVY_VERBOSITY", INFO))
+    except ValueError:
+        return INFO
+
+_ESCAPES = {}
+_STATE = {"color": None, "verbosity": _env_verbosity()}
+_QUEUE = queue.Queue()
+_WRITER = None
+_WRITER_LOCK = threading.Lock()
+
+def _escapes(color, style, bg_color, reset):
+    key = (color, style, bg_color, reset)
+    escapes = _ESCAPES.get(key)
+    if escapes is not None:
+        return escapes
+
+    if color not in COLORS:
+        raise ValueError(f"Invalid color value '{color}'. Available options are: {', '.join(COLORS.keys())}")
+    
+    if style not in style_codes:
+        raise ValueError(f"Invalid style value '{style}'. Available options are: {', '.join(style_codes.keys())}")
+    
+    if bg_color is not None and bg_color not in COLORS:
+        raise ValueError(f"Invalid bg_color value '{bg_color}'. Available options are: {', '.join(COLORS.keys())}")
+    
+    color_start = style_codes[style] + COLORS[color]
+    if bg_color:
+        bg_color_code = "\033[4" + COLORS[bg_color][3:]
+        color_start += bg_color_code
+    color_end = COLORS["default"] if reset else ""
+
+    escapes = _ESCAPES[key] = (color_start, color_end)
+    return escapes
+
+def color_enabled():
+    """
+    Memeriksa apakah kode warna ANSI dipakai.
+
+    Warna mati jika `NO_COLOR` disetel, selalu nyala jika `FORCE_COLOR` disetel, dan nyala di
+    notebook Jupyter/Colab. Selain itu warna hanya dipakai jika stdout adalah terminal.
+
+    Returns:
+        bool: Benar jika warna dipakai.
+    """
+    if _STATE["color"] is None:
+        if os.environ.get("NO_COLOR"):
+            _STATE["color"] = False
+        elif os.environ.get("FORCE_COLOR") or "ipykernel" in sys.modules:
+            _STATE["color"] = True
+        else:
+            isatty = getattr(sys.stdout, "isatty", None)
+            _STATE["color"] = bool(isatty and isatty())
+    return _STATE["color"]
+
+def set_color(enabled):
+    """
+    Memaksa warna nyala atau mati. Tidak Ada mengembalikan deteksi otomatis.
+
+    Args:
+        enabled (bool): Status warna.
+    """
+    _STATE["color"] = enabled
+
+def set_verbosity(level):
+    """
+    Mengatur tingkat pesan yang dicetak: ERROR (0), INFO (1), atau DEBUG (2).
+    Defaultnya diambil dari variabel lingkungan `EXNAVY_VERBOSITY`, atau INFO.
+
+    Args:
+        level (int): Tingkat verbositas.
+    """
+    _STATE["verbosity"] = level
+
+def get_verbosity():
+    """
+    Returns:
+        int: Tingkat verbositas saat ini.
+    """
+    return _STATE["verbosity"]
+
+def _write(text):
+    tqdm = sys.modules.get("tqdm")
+    if tqdm is not None and getattr(tqdm.tqdm, "_instances", None):
+        tqdm.tqdm.write(text, file=sys.stdout)
+    else:
+        sys.stdout.write(text + "\n")
+
+def _drain():
+    while True:
+        text = _QUEUE.get()
+        try:
+            _write(text)
+            while True:
+                try:
+                    text = _QUEUE.get_nowait()
+                except queue.Empty:
+                    break
+                _QUEUE.task_done()
+                _write(text)
+            sys.stdout.flush()
+        except Exception:
+            pass
+        finally:
+            _QUEUE.task_done()
+
+def flush_output():
+    """
+    Menunggu sampai semua pesan dari thread lain selesai ditulis.
+    """
+    if _WRITER is not None:
+        _QUEUE.join()
+
+def _emit(text):
+    global _WRITER
+    if threading.current_thread() is threading.main_thread():
+        flush_output()
+        _write(text)
+        return
+
+    if _WRITER is None:
+        with _WRITER_LOCK:
+            if _WRITER is None:
+                _WRITER = threading.Thread(target=_drain, name="exnavy-cprint", daemon=True)
+                _WRITER.start()
+                atexit.register(flush_output)
+    _QUEUE.put(text)
+
+def cprint(*args, color="default", style="normal", bg_color=None, reset=True, timestamp=False, line=None, tqdm_desc=False, timestamp_format='%Y-%m-%d %H:%M:%S', prefix=None, suffix=None, timezone=None, level=None):
     """
     Mencetak teks berwarna di konsol.
 
+    Pesan dari thread selain thread utama dimasukkan ke antrean dan ditulis oleh satu thread penulis,
+    sehingga worker tidak tertahan oleh stdout yang lambat. Pesan dari thread utama ditulis langsung
+    setelah antrean kosong. Jika ada bilah tqdm yang aktif, pesan ditulis dengan `tqdm.write` agar
+    bilah tidak rusak. Kode warna dihilangkan jika `color_enabled()` Salah.
+
     Args:
         *args            : Teks yang akan dicetak.
         color            : Warna teks. Standarnya adalah "default".
@@ -58,25 +202,20 @@ def cprint(*args, color="default", style="normal", bg_color=None, reset=True, ti
         prefix           : Awalan opsional untuk teks. Standarnya adalah Tidak Ada.
         suffix           : Akhiran opsional untuk teks. Standarnya adalah Tidak Ada.
         timezone         : Zona waktu yang digunakan untuk stempel waktu. Jika Tidak Ada, zona waktu lokal akan digunakan.
+        level            : Tingkat pesan (ERROR, INFO, DEBUG). Jika Tidak Ada, warna merah berarti ERROR dan lainnya INFO.
 
     Returns:
         None
     """
 
-    if color not in COLORS:
-        raise ValueError(f"Invalid color value '{color}'. Available options are: {', '.join(COLORS.keys())}")
-    
-    if style not in style_codes:
-        raise ValueError(f"Invalid style value '{style}'. Available options are: {', '.join(style_codes.keys())}")
-    
-    if bg_color is not None and bg_color not in COLORS:
-        raise ValueError(f"Invalid bg_color value '{bg_color}'. Available options are: {', '.join(COLORS.keys())}")
-    
-    color_start = style_codes[style] + COLORS[color]
-    if bg_color:
-        bg_color_code = "\033[4" + COLORS[bg_color][3:]
-        color_start += bg_color_code
-    color_end = COLORS["default"] if reset else ""
+    if level is None:
+        level = ERROR if color in _ERROR_COLORS else INFO
+    if level > _STATE["verbosity"] and not tqdm_desc:
+        return
+
+    color_start, color_end = _escapes(color, style, bg_color, reset)
+    if not color_enabled():
+        color_start = color_end = ""
     formatted_text = " ".join(str(arg) for arg in args)
 
     if prefix:
@@ -86,7 +225,11 @@ def cprint(*args, color="default", style="normal", bg_color=None, reset=True, ti
         formatted_text += suffix
 
     if timestamp:
-        now = datetime.datetime.now(pytz.timezone(timezone)) if timezone else datetime.datetime.now()
+        if timezone:
+            import pytz
+            now = datetime.datetime.now(pytz.timezone(timezone))
+        else:
+            now = datetime.datetime.now()
         formatted_text = now.strftime(timestamp_format) + " " + formatted_text
 
     if line:
@@ -96,7 +239,7 @@ def cprint(*args, color="default", style="normal", bg_color=None, reset=True, ti
         return color_start + formatted_text
 
     else:
-        print(color_start + formatted_text + color_end)
+        _emit(color_start + formatted_text + color_end)
 
 def print_line(length, color="default", style="normal", bg_color=None, reset=True):
     """
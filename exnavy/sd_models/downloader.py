@@ -1,17 +1,29 @@
+import fnmatch
+import json
 import os
+import re
 import subprocess
 import glob
+import shutil
+import tarfile
 import gdown
 import time
 # from mega import Mega
 from tqdm import tqdm
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from ..utils.py_utils import get_filename, calculate_elapsed_time
+from .piece_download import UnsupportedSource, piece_download, sidecar_path
+from ..utils.http_cache import cached_fetch, get_session
+from ..utils.trace_utils import traced
+from ..utils.py_utils import get_cache_dir, get_filename, calculate_elapsed_time
 from ..colortes import cprint
 
 SUPPORTED_EXTENSIONS = (".ckpt", ".safetensors", ".pt", ".pth")
 
+GITHUB_RAW_URL = "https://raw.githubusercontent.com"
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_CODELOAD_URL = "https://codeload.github.com"
+
 def parse_args(config):
     """
     Menganalisis argumen yang diberikan.
@@ -35,6 +47,7 @@ def parse_args(config):
 
     return args
 
+@traced("download.aria2", category="download", record=lambda result, download_dir, filename, *args, **kwargs: {"filename": filename, "bytes": os.path.getsize(os.path.join(download_dir, filename))})
 def aria2_download(download_dir: str, filename: str , url: str, quiet: bool=False, user_header: str=None):
     """
     Mengunduh file menggunakan aria2.
@@ -69,6 +82,7 @@ def aria2_download(download_dir: str, filename: str , url: str, quiet: bool=Fals
         elapsed_time = calculate_elapsed_time(start_time)
         cprint(f"Unduhan {filename} selesai dalam {elapsed_time}.", color="green")
 
+@traced("download.gdown", category="download")
 def gdown(url: str, dst: str, quiet: bool=False):
     """
     Mengunduh file menggunakan google drive.
@@ -163,21 +177,90 @@ def get_modelname(url: str, quiet: bool=False, user_header: str=None) -> None:
 
     return None
 
-def download(url: str, dst: str, filename:str= None, user_header: str=None, quiet: bool=False):
+def _user_headers(user_header: str=None):
+    if not user_header:
+        return {}
+    name, sep, value = user_header.partition(":")
+    if sep and name.strip() and " " not in name.strip():
+        return {name.strip(): value.strip()}
+    return {"Authorization": user_header}
+
+def _download_sources(urls: list, dst: str, filename: str=None, user_header: str=None, quiet: bool=False, sha256: str=None, strategy: str="multi"):
+    sources, fallbacks = [], []
+    for url in urls:
+        if "drive/MyDrive" in url and os.path.exists(url):
+            return download(url, dst, filename, user_header=user_header, quiet=quiet)
+        if "huggingface.co" in url:
+            url = url.replace("/blob/", "/resolve/")
+        if url.startswith(("http://", "https://")) and "drive.google.com" not in url:
+            sources.append((url, _user_headers(user_header) if "huggingface.co" in url else None))
+        else:
+            fallbacks.append(url)
+
+    if not filename:
+        filename = next(filter(None, (get_modelname(url, quiet=True) for url in urls)), None)
+        if not filename:
+            raise ValueError(f"Gagal mendapatkan nama model dari sumber: {', '.join(urls)}")
+
+    if sources:
+        target = os.path.join(dst, filename)
+        try:
+            if not quiet:
+                start_time = time.time()
+                cprint(f"Unduhan {filename} dari {len(sources)} sumber dimulai...", color="green")
+            summary = piece_download(sources, target, sha256=sha256, quiet=quiet, strategy=strategy)
+            if not quiet:
+                elapsed_time = calculate_elapsed_time(start_time)
+                cprint(f"Unduhan {filename} selesai dalam {elapsed_time} ({summary['fetched']} potongan dari {summary['sources']} sumber, {summary['refetched']} diperbaiki).", color="green")
+            return
+        except (IOError, ValueError) as e:
+            if not fallbacks:
+                raise
+            if not quiet:
+                cprint(f"Unduhan {filename} dari sumber HTTP gagal, mencoba sumber lain. Kesalahan: {str(e)}", color="yellow")
+
+    for index, url in enumerate(fallbacks):
+        try:
+            return download(url, dst, filename, user_header=user_header, quiet=quiet)
+        except Exception as e:
+            if index == len(fallbacks) - 1:
+                raise
+            if not quiet:
+                cprint(f"Unduhan {filename} dari {url} gagal, mencoba sumber lain. Kesalahan: {str(e)}", color="yellow")
+
+@traced("download", category="download", record=lambda result, url, *args, **kwargs: {"url": url if isinstance(url, str) else ", ".join(url)})
+def download(url, dst: str, filename:str= None, user_header: str=None, quiet: bool=False, sha256: str=None, strategy: str="multi"):
     """
     Mengunduh file.
+
+    Unduhan langsung memakai `piece_download`: potongan 16 MB dicatat di `<nama>.pieces.json` dan
+    diverifikasi dengan hash saat dilanjutkan sehingga hanya potongan yang rusak yang diunduh ulang.
+    aria2 hanya dipakai jika nama file tidak diketahui, server tidak mendukung Range request, atau
+    untuk menyelesaikan unduhan aria2 yang terputus.
+
+    Jika `url` berupa daftar sumber untuk file yang sama (misalnya HuggingFace, salinan Drive, dan
+    mirror), salinan di drive/MyDrive yang ada langsung disalin. Sumber HTTP lainnya diperiksa dengan
+    Range request kecil lalu diunduh dengan `piece_download` sesuai `strategy`: "multi" mengambil
+    potongan dari semua sumber sekaligus, "fastest" hanya dari sumber tercepat. Sumber yang gagal di
+    tengah unduhan dilepas dan potongannya diambil dari sumber lain. Link Google Drive hanya dipakai
+    jika semua sumber HTTP gagal.
     
     Args:
-        url (str): URL unduhan.
+        url (str | list): URL unduhan, atau daftar URL untuk file yang sama.
         dst (str): Direktori tujuan.
         filename (str, optional): Nama file. Defaultnya adalah Tidak Ada.
         user_header (str, optional): Header pengguna. Defaultnya adalah Tidak Ada.
         quiet (bool, optional): Jika Benar, tidak akan mencetak apa pun. Defaultnya adalah False.
+        sha256 (str, optional): Hash sha256 yang diharapkan. Defaultnya adalah Tidak Ada.
+        strategy (str, optional): "multi" atau "fastest" untuk daftar sumber. Defaultnya adalah "multi".
         
     Returns:
         str: Nama file.
     """
 
+    if not isinstance(url, str):
+        return _download_sources(list(url), dst, filename, user_header=user_header, quiet=quiet, sha256=sha256, strategy=strategy)
+
     if not filename:
         filename = get_modelname(url, quiet=quiet)
 
@@ -196,6 +279,24 @@ def download(url: str, dst: str, filename:str= None, user_header: str=None, quie
     else:
         if "huggingface.co" in url:
             url = url.replace("/blob/", "/resolve/")
+        target = os.path.join(dst, filename) if filename else None
+        has_aria2 = shutil.which("aria2c") is not None
+        # Unduhan aria2 yang terputus (ada file kontrol .aria2) diselesaikan oleh aria2 sendiri.
+        if target and not (has_aria2 and os.path.exists(target + ".aria2") and not os.path.exists(sidecar_path(target))):
+            try:
+                if not quiet:
+                    start_time = time.time()
+                    cprint(f"Unduhan {filename} dimulai...", color="green")
+                summary = piece_download(url, target, sha256=sha256, headers=_user_headers(user_header) if "huggingface.co" in url else None, quiet=quiet)
+                if not quiet:
+                    elapsed_time = calculate_elapsed_time(start_time)
+                    cprint(f"Unduhan {filename} selesai dalam {elapsed_time} ({summary['fetched']} potongan diunduh, {summary['refetched']} diperbaiki).", color="green")
+                return
+            except UnsupportedSource as e:
+                if not has_aria2:
+                    raise
+                if not quiet:
+                    cprint(f"Unduhan per potongan tidak bisa dipakai, memakai aria2. Kesalahan: {str(e)}", color="yellow")
         aria2_download(dst, filename, url, user_header=user_header, quiet=quiet)
 
 def batch_download(urls: list, dst: str, desc: str = None, user_header: str = None, quiet: bool = False) -> None:
@@ -222,28 +323,163 @@ def batch_download(urls: list, dst: str, desc: str = None, user_header: str = No
                 except Exception as e:
                     cprint(f"Unduhan gagal: {e}", color="flat_red")
 
-def download_from_github(repo: str, dst: str, filename: str, quiet: bool=False):
+def download_from_github(repo: str, dst: str, filename: str, quiet: bool=False, ttl: float=0, ref: str="master"):
     """
     Mengunduh file dari github.
+
+    File disimpan di cache HTTP exnavy dan hanya diunduh ulang jika berubah di server (ETag/Last-Modified).
+    Jika GitHub tidak bisa dihubungi, salinan terakhir dari cache dipakai.
     
     Args:
         repo (str): Nama repositori.
         dst (str): Direktori tujuan.
         filename (str): Nama file.
         quiet (bool, optional): Jika Benar, tidak akan mencetak apa pun. Defaultnya adalah False.
+        ttl (float, optional): Lama salinan cache dipakai tanpa validasi ulang, dalam detik. Defaultnya adalah 0.
+        ref (str, optional): Cabang, tag, atau komit. Defaultnya adalah "master".
     """
-    url      = f"https://raw.githubusercontent.com/{repo}/master/{filename}"
-    response = requests.get(url, stream=True)
+    url = f"{GITHUB_RAW_URL}/{repo}/{ref}/{filename}"
 
-    if response.status_code == 200:
-        with open(os.path.join(dst, filename), "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+    try:
+        cache_path = cached_fetch(url, ttl=ttl, quiet=quiet)
+    except Exception as e:
         if not quiet:
-            cprint(f"Repo {filename} from {repo} to {dst}", color="green")
+            cprint(f"Repo {filename} from {repo} to {dst} telah gagal. Kesalahan: {str(e)}", color="flat_red")
+        return
 
+    target = os.path.join(dst, filename)
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    shutil.copyfile(cache_path, target)
+    if not quiet:
+        cprint(f"Repo {filename} from {repo} to {dst}", color="green")
+
+class _TeeReader:
+    def __init__(self, raw, sink):
+        self.raw = raw
+        self.sink = sink
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        if data:
+            self.sink.write(data)
+        return data
+
+def _resolve_github_ref(repo: str, ref: str, cache_dir: str, quiet: bool=False):
+    if re.fullmatch(r"[0-9a-f]{40}", ref):
+        return ref
+
+    refs_path = os.path.join(cache_dir, "refs.json")
+    refs = {}
+    if os.path.exists(refs_path):
+        with open(refs_path, "r") as f:
+            refs = json.load(f)
+
+    try:
+        response = get_session().get(f"{GITHUB_API_URL}/repos/{repo}/commits/{ref}",
+                                     headers={"Accept": "application/vnd.github.sha"}, timeout=30)
+        response.raise_for_status()
+        sha = response.text.strip()
+    except Exception as e:
+        if ref in refs:
+            if not quiet:
+                cprint(f"Gagal memeriksa '{ref}' di {repo}, memakai komit {refs[ref][:7]} dari cache. Kesalahan: {str(e)}", color="yellow")
+            return refs[ref]
+        raise
+
+    if refs.get(ref) != sha:
+        refs[ref] = sha
+        with open(refs_path, "w") as f:
+            json.dump(refs, f)
+    return sha
+
+def _match_github_path(path: str, patterns: list):
+    for pattern in patterns:
+        if path == pattern or path.startswith(pattern.rstrip("/") + "/") or fnmatch.fnmatchcase(path, pattern):
+            return pattern
+    return None
+
+@traced("download.github_bulk", category="download", record=lambda result, repo, *args, **kwargs: {"repo": repo, "files": len(result)})
+def download_from_github_bulk(repo: str, paths: list, dst: str, ref: str="master", quiet: bool=False):
+    """
+    Mengunduh banyak file dari satu repositori github dengan satu arsip.
+
+    Ref diubah menjadi komit, lalu tarball repositori untuk komit itu diunduh sekali dan disimpan di
+    cache exnavy; pemanggilan berikutnya untuk komit yang sama tidak mengunduh apa pun. Arsip dibaca
+    secara streaming dan hanya anggota yang cocok dengan `paths` yang diekstrak, dengan struktur
+    direktori yang sama seperti di repositori.
+
+    Contoh:
+        download_from_github_bulk("user/repo", ["configs/*.yaml", "scripts/setup.py", "styles"], "/content")
+
+    Args:
+        repo (str): Nama repositori, misalnya "user/repo".
+        paths (list): Path file, direktori, atau pola glob relatif terhadap akar repositori.
+        dst (str): Direktori tujuan.
+        ref (str, optional): Cabang, tag, atau komit. Defaultnya adalah "master".
+        quiet (bool, optional): Jika Benar, tidak akan mencetak apa pun. Defaultnya adalah False.
+
+    Returns:
+        list: Path file yang ditulis.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    patterns = [path.strip("/") for path in paths]
+    cache_dir = get_cache_dir("github", repo.replace("/", "@"))
+    start_time = time.time()
+
+    commit = _resolve_github_ref(repo, ref, cache_dir, quiet=quiet)
+    archive = os.path.join(cache_dir, f"{commit}.tar.gz")
+
+    response = None
+    tmp_path = None
+    if os.path.exists(archive):
+        source = open(archive, "rb")
+    else:
+        response = get_session().get(f"{GITHUB_CODELOAD_URL}/{repo}/tar.gz/{commit}", stream=True, timeout=30)
+        response.raise_for_status()
+        tmp_path = f"{archive}.{os.getpid()}.tmp"
+        source = _TeeReader(response.raw, open(tmp_path, "wb"))
+
+    written = []
+    matched = set()
+    try:
+        with tarfile.open(fileobj=source, mode="r|gz") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                _, _, path = member.name.partition("/")
+                pattern = _match_github_path(path, patterns)
+                if pattern is None or ".." in path.split("/"):
+                    continue
+                matched.add(pattern)
+
+                target = os.path.join(dst, *path.split("/"))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with tar.extractfile(member) as src, open(target, "wb") as f:
+                    shutil.copyfileobj(src, f)
+                written.append(target)
+
+        if response is not None:
+            while source.read(1 << 20):
+                pass
+            source.sink.close()
+            os.replace(tmp_path, archive)
+    finally:
+        if response is not None:
+            source.sink.close()
+            response.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
         else:
-            cprint(f"Repo {filename} from {repo} to {dst} telah gagal.", color="flat_red")
+            source.close()
+
+    if not quiet:
+        for pattern in patterns:
+            if pattern not in matched:
+                cprint(f"'{pattern}' tidak ditemukan di {repo}@{ref}", color="yellow")
+        cprint(f"{len(written)} file dari {repo}@{commit[:7]} ke {dst} dalam {time.time() - start_time:.1f} detik", color="green")
+
+    return written
 
 def get_most_recent_file(directory: str, quiet: bool=False):
     """
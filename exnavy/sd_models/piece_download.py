@@ -0,0 +1,483 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import requests
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tqdm import tqdm
+from ..utils.http_cache import get_session
+from ..utils.trace_utils import span
+from ..colortes import cprint
+
+PIECE_SIZE = 16 * 1024 * 1024
+READ_SIZE = 1024 * 1024
+SIDECAR_SUFFIX = ".pieces.json"
+PROBE_SIZE = 256 * 1024
+SOURCE_MAX_ERRORS = 3
+MIN_SPLIT = 4 * 1024 * 1024
+STALL_TIMEOUT = 5.0
+STALL_POLL = 0.5
+
+class UnsupportedSource(IOError):
+    """Sumber tidak bisa diunduh per potongan (tanpa Range, ukuran tidak diketahui, atau gagal diperiksa). Dilempar sebelum file tujuan disentuh."""
+
+def sidecar_path(path):
+    """
+    Returns:
+        str: Path file peta potongan untuk `path`.
+    """
+    return path + SIDECAR_SUFFIX
+
+def _load_sidecar(path):
+    try:
+        with open(sidecar_path(path), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_sidecar(path, piece_map):
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+    with os.fdopen(fd, "w") as f:
+        json.dump(piece_map, f)
+    os.replace(tmp_path, sidecar_path(path))
+
+def _piece_range(piece_map, index):
+    start = index * piece_map["piece_size"]
+    return start, min(start + piece_map["piece_size"], piece_map["size"]) - 1
+
+def _hash_piece(path, piece_map, index):
+    start, end = _piece_range(piece_map, index)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining:
+            data = f.read(min(READ_SIZE, remaining))
+            if not data:
+                return None
+            digest.update(data)
+            remaining -= len(data)
+    return digest.hexdigest()
+
+def file_sha256(path, chunk_size=4 * READ_SIZE):
+    """
+    Menghitung sha256 seluruh file per potongan.
+
+    Returns:
+        str: Hash sha256 heksadesimal.
+    """
+    digest = hashlib.sha256()
+    with span("hash.sha256", category="hash", file=os.path.basename(path)) as current, open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+            current.add("bytes", len(chunk))
+    return digest.hexdigest()
+
+def probe(url, headers=None, timeout=30):
+    """
+    Mengambil ukuran, dukungan Range, dan ETag sebuah URL dengan HEAD.
+
+    Returns:
+        dict: Kunci "url" (setelah redirect), "size", "ranges", dan "etag".
+    """
+    response = get_session().head(url, headers=headers, allow_redirects=True, timeout=timeout)
+    response.raise_for_status()
+    size = response.headers.get("Content-Length")
+    return {
+        "url"   : response.url,
+        "size"  : int(size) if size and size.isdigit() else None,
+        "ranges": response.headers.get("Accept-Ranges", "").lower() == "bytes",
+        "etag"  : response.headers.get("ETag"),
+    }
+
+def probe_source(url, headers=None, probe_size=PROBE_SIZE, timeout=10):
+    """
+    Mengukur latensi dan throughput sebuah sumber dengan Range request kecil.
+
+    Returns:
+        dict: Kunci "url", "headers", "size", "ranges", "etag", "latency" (detik sampai header
+            diterima), "throughput" (byte/detik), dan "error" (None jika berhasil).
+    """
+    result = {"url": url, "headers": headers, "size": None, "ranges": False, "etag": None,
+              "latency": None, "throughput": 0.0, "error": None}
+    start = time.perf_counter()
+    try:
+        with get_session().get(url, headers=dict(headers or {}, Range=f"bytes=0-{probe_size - 1}"), stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            result["latency"] = time.perf_counter() - start
+            result["etag"] = response.headers.get("ETag")
+            if response.status_code != 206:
+                size = response.headers.get("Content-Length")
+                result["size"] = int(size) if size and size.isdigit() else None
+                return result
+            received = sum(len(chunk) for chunk in response.iter_content(chunk_size=READ_SIZE))
+            elapsed = time.perf_counter() - start - result["latency"]
+    except Exception as e:
+        result["error"] = str(e)
+        return result
+
+    size = response.headers.get("Content-Range", "").rpartition("/")[2]
+    result["size"] = int(size) if size.isdigit() else None
+    result["ranges"] = True
+    result["throughput"] = received / elapsed if elapsed > 0 else float("inf")
+    return result
+
+def _estimated_time(result, piece_size):
+    if result["error"] or not result["ranges"] or not result["throughput"]:
+        return float("inf")
+    return result["latency"] + piece_size / result["throughput"]
+
+def rank_sources(sources, probe_size=PROBE_SIZE, piece_size=PIECE_SIZE):
+    """
+    Memeriksa semua sumber secara paralel dan mengurutkannya dari perkiraan waktu unduh satu
+    potongan tercepat (latensi + ukuran potongan / throughput).
+
+    Args:
+        sources (list): URL atau pasangan `(url, headers)`.
+        probe_size (int, optional): Ukuran Range request pemeriksaan. Defaultnya adalah 256 KB.
+        piece_size (int, optional): Ukuran potongan untuk perkiraan waktu. Defaultnya adalah 16 MB.
+
+    Returns:
+        list: Hasil `probe_source` per sumber; sumber yang gagal atau tanpa Range ada di akhir.
+    """
+    sources = [source if isinstance(source, tuple) else (source, None) for source in sources]
+    with span("download.probe", category="download", sources=len(sources)):
+        with ThreadPoolExecutor(max_workers=len(sources) or 1) as executor:
+            results = list(executor.map(lambda source: probe_source(*source, probe_size=probe_size), sources))
+    return sorted(results, key=lambda result: _estimated_time(result, piece_size))
+
+class _Segment:
+    """Rentang byte `[pos, end]` dari potongan `index` yang belum ditulis; `end` bisa dikecilkan saat dibagi."""
+    __slots__ = ("index", "pos", "end", "source", "updated", "abandoned", "writing")
+
+    def __init__(self, index, pos, end):
+        self.index = index
+        self.pos = pos
+        self.end = end
+        self.source = None
+        self.updated = time.monotonic()
+        self.abandoned = False
+        self.writing = False
+
+def fetch_segment(url, path, segment, lock, headers=None, progress=None, timeout=60):
+    """
+    Mengunduh `segment` dengan Range request dan menulisnya ke posisinya di `path`.
+
+    File dibuka tanpa buffer dan `segment.pos` baru dimajukan (di bawah `lock`) setelah chunk selesai
+    ditulis, sehingga semua byte sebelum `segment.pos` sudah ada di file: segmen yang gagal atau diambil
+    alih dilanjutkan dari byte terakhir yang benar-benar tertulis. `segment.writing` bernilai True selama
+    chunk ditulis. `segment.end` boleh dikecilkan oleh pekerja lain selama unduhan berjalan, lalu unduhan
+    berhenti di batas yang baru.
+
+    Raises:
+        IOError: Jika server tidak mengembalikan 206 atau respons berakhir sebelum segmen lengkap.
+    """
+    request_headers = dict(headers or {}, Range=f"bytes={segment.pos}-{segment.end}")
+    with get_session().get(url, headers=request_headers, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise IOError(f"Server tidak mendukung Range request: {url}")
+        with open(path, "r+b", buffering=0) as f:
+            f.seek(segment.pos)
+            for chunk in response.iter_content(chunk_size=READ_SIZE):
+                with lock:
+                    chunk = memoryview(chunk)[:max(segment.end - segment.pos + 1, 0)]
+                    if not chunk:
+                        break
+                    segment.writing = True
+                size = len(chunk)
+                try:
+                    while chunk:
+                        chunk = chunk[f.write(chunk):]
+                except BaseException:
+                    with lock:
+                        segment.writing = False
+                    raise
+                with lock:
+                    segment.writing = False
+                    segment.pos += size
+                    segment.updated = time.monotonic()
+                    done = segment.pos > segment.end
+                if progress is not None:
+                    progress.update(size)
+                if done:
+                    return
+
+    if segment.pos <= segment.end:
+        raise IOError(f"Potongan {segment.index} tidak lengkap ({segment.end - segment.pos + 1} byte tersisa): {url}")
+
+def _verify_pieces(path, piece_map, workers):
+    indexes = [index for index, value in enumerate(piece_map["pieces"]) if value]
+    bad = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_hash_piece, path, piece_map, index): index for index in indexes}
+        for future in as_completed(futures):
+            index = futures[future]
+            if future.result() != piece_map["pieces"][index]:
+                piece_map["pieces"][index] = None
+                bad.append(index)
+    return len(indexes), sorted(bad)
+
+def _new_piece_map(url, info, piece_size, sha256):
+    pieces = (info["size"] + piece_size - 1) // piece_size
+    return {
+        "version"   : 1,
+        "url"       : url,
+        "size"      : info["size"],
+        "etag"      : info["etag"],
+        "piece_size": piece_size,
+        "sha256"    : sha256,
+        "pieces"    : [None] * pieces,
+        "complete"  : False,
+    }
+
+def _fetch_pending(path, piece_map, pending, sources, workers, retries, desc, quiet, spread=True):
+    lock = threading.Lock()
+    changed = threading.Condition(lock)
+    queue = deque(_Segment(index, *_piece_range(piece_map, index)) for index in pending)
+    running = set()
+    abandoned = []
+    segments = Counter({index: 1 for index in pending})
+    attempts = Counter()
+    errors = Counter()
+    alive = list(sources)
+    failed = {}
+    total = sum(segment.end - segment.pos + 1 for segment in queue)
+
+    def claim(source):
+        if queue:
+            segment = queue.popleft()
+        else:
+            others = [item for item in running if item.source != source]
+            now = time.monotonic()
+            stalled = [item for item in others if now - item.updated >= STALL_TIMEOUT]
+            candidates = [item for item in others if item.end - item.pos + 1 >= 2 * MIN_SPLIT]
+            if stalled:
+                # Sumber lain tidak mengirim data selama STALL_TIMEOUT: ambil alih seluruh sisa segmennya.
+                # Pekerjanya dibiarkan sampai timeout soketnya; segmen lamanya tidak ditulis lagi, kecuali
+                # chunk yang sedang ditulis, yang ditunggu sebelum potongannya di-hash.
+                stale = stalled[0]
+                segment = _Segment(stale.index, stale.pos, stale.end)
+                stale.end = stale.pos - 1
+                stale.abandoned = True
+                running.discard(stale)
+                abandoned.append(stale)
+            elif candidates:
+                # Antrean kosong: ambil separuh akhir segmen terbesar yang sedang diunduh sumber lain, agar
+                # sumber yang lambat tidak menahan potongan terakhir sendirian.
+                largest = max(candidates, key=lambda item: item.end - item.pos)
+                middle = largest.pos + (largest.end - largest.pos + 1) // 2
+                segment = _Segment(largest.index, middle, largest.end)
+                largest.end = middle - 1
+                segments[segment.index] += 1
+            else:
+                return None
+        segment.source = source
+        segment.updated = time.monotonic()
+        running.add(segment)
+        return segment
+
+    def run(source):
+        url, headers = source
+        while True:
+            with lock:
+                if source not in alive:
+                    return
+                segment = claim(source)
+                if segment is None:
+                    if not any(item.source != source for item in running):
+                        return
+                    changed.wait(STALL_POLL)
+                    continue
+            try:
+                fetch_segment(url, path, segment, lock, headers=headers, progress=progress)
+            except Exception as e:
+                with lock:
+                    errors[url] += 1
+                    if not segment.abandoned:
+                        running.discard(segment)
+                        attempts[segment.index] += 1
+                        if attempts[segment.index] > retries:
+                            failed[segment.index] = e
+                        else:
+                            queue.append(segment)
+                    if errors[url] >= SOURCE_MAX_ERRORS and source in alive:
+                        alive.remove(source)
+                        if not quiet and alive:
+                            cprint(f"Sumber {url} gagal ({str(e)}), potongan dialihkan ke sumber lain.", color="yellow")
+                    changed.notify_all()
+                continue
+
+            with lock:
+                if segment.abandoned:
+                    continue
+                running.discard(segment)
+                errors[url] = 0
+                segments[segment.index] -= 1
+                finished = not segments[segment.index]
+                while finished and any(item.writing for item in abandoned if item.index == segment.index):
+                    changed.wait(STALL_POLL)
+            if finished:
+                digest = _hash_piece(path, piece_map, segment.index)
+                with lock:
+                    piece_map["pieces"][segment.index] = digest
+                    _save_sidecar(path, piece_map)
+            with lock:
+                changed.notify_all()
+
+    with tqdm(total=total, unit="B", unit_scale=True, unit_divisor=1024, disable=quiet, desc=desc) as progress:
+        # Segmen yang gagal dikembalikan ke antrean setelah pekerja lain mungkin sudah berhenti,
+        # jadi putaran diulang sampai antrean kosong atau tidak ada sumber yang tersisa. Pekerja
+        # berupa thread daemon agar pekerja yang segmennya sudah diambil alih tidak perlu ditunggu.
+        while True:
+            with lock:
+                if not queue or not alive:
+                    break
+                active = list(alive) if spread else alive[:1]
+            threads = [threading.Thread(target=run, args=(source,), daemon=True) for source in active for _ in range(workers)]
+            for thread in threads:
+                thread.start()
+            with lock:
+                while (queue or running) and any(thread.is_alive() for thread in threads):
+                    changed.wait(STALL_POLL)
+
+    for segment in queue:
+        failed.setdefault(segment.index, IOError("Tidak ada sumber yang tersisa"))
+    return failed
+
+def _select_sources(url, headers, piece_size, quiet):
+    if isinstance(url, str):
+        try:
+            info = probe(url, headers=headers)
+        except requests.RequestException as e:
+            raise UnsupportedSource(f"Gagal memeriksa {url}: {str(e)}") from e
+        if not info["size"] or not info["ranges"]:
+            raise UnsupportedSource(f"Server tidak mendukung Range request atau ukuran tidak diketahui: {url}")
+        return [(url, headers)], info
+
+    ranked = rank_sources([source if isinstance(source, tuple) else (source, headers) for source in url], piece_size=piece_size)
+    usable = [result for result in ranked if result["ranges"] and result["size"]]
+    if not usable:
+        raise UnsupportedSource(f"Tidak ada sumber yang mendukung Range request: {', '.join(result['url'] for result in ranked)}")
+
+    # Ukuran yang disepakati sumber terbanyak dianggap benar; jika seri, sumber yang lebih cepat menang.
+    sizes = Counter(result["size"] for result in usable)
+    size = max(sizes, key=lambda value: (sizes[value], -next(rank for rank, result in enumerate(usable) if result["size"] == value)))
+
+    sources = []
+    for result in ranked:
+        if result["ranges"] and result["size"] == size:
+            sources.append((result["url"], result["headers"]))
+        elif not quiet:
+            reason = result["error"] or (f"ukuran {result['size']} != {size}" if result["ranges"] else "tidak mendukung Range request")
+            cprint(f"Sumber {result['url']} dilewati: {reason}", color="yellow")
+    # ETag berbeda antar host, jadi hanya dipakai untuk mendeteksi perubahan jika sumbernya satu.
+    etag = next(result["etag"] for result in usable if result["size"] == size) if len(sources) == 1 else None
+    return sources, {"size": size, "etag": etag}
+
+def piece_download(url, path, sha256=None, headers=None, piece_size=PIECE_SIZE, workers=8, retries=3, quiet=False, strategy="multi"):
+    """
+    Mengunduh file dengan Range request per potongan dan peta hash potongan di file sidecar.
+
+    File ditulis langsung ke `path` dan setiap potongan (default 16 MB) yang selesai dicatat
+    beserta sha256-nya di `<path>.pieces.json`. Saat dilanjutkan (atau dipanggil lagi), potongan
+    yang sudah ada diverifikasi paralel dan hanya potongan yang rusak atau belum ada yang diunduh
+    ulang. Jika `sha256` diberikan, seluruh file juga dicocokkan dengan hash tersebut.
+
+    Jika `url` berupa daftar sumber untuk file yang sama, setiap sumber diperiksa dengan Range
+    request kecil dan diurutkan dari yang tercepat. Dengan `strategy="multi"` potongan diambil dari
+    semua sumber sekaligus (`workers` koneksi per sumber) dari satu antrean bersama, sehingga sumber
+    yang lebih cepat mengambil lebih banyak potongan, dan saat antrean habis sisa segmen yang masih
+    diunduh sumber lain dibagi dua. Dengan `strategy="fastest"` hanya sumber tercepat yang dipakai.
+    Pada kedua strategi, sumber yang gagal berturut-turut dilepas dan segmennya dilanjutkan dari
+    sumber lain mulai dari byte terakhir yang tertulis. Dengan "multi", segmen yang tidak menerima
+    data selama `STALL_TIMEOUT` detik diambil alih oleh sumber lain yang menganggur.
+
+    Args:
+        url (str | list): URL unduhan, atau daftar URL/pasangan `(url, headers)` untuk file yang sama.
+        path (str): Path file tujuan.
+        sha256 (str, optional): Hash sha256 yang diharapkan untuk seluruh file. Defaultnya adalah Tidak Ada.
+        headers (dict, optional): Header HTTP tambahan. Defaultnya adalah Tidak Ada.
+        piece_size (int, optional): Ukuran potongan dalam byte. Defaultnya adalah 16 MB.
+        workers (int, optional): Jumlah koneksi paralel per sumber. Defaultnya adalah 8.
+        retries (int, optional): Jumlah percobaan ulang per potongan. Defaultnya adalah 3.
+        quiet (bool, optional): Sembunyikan pesan dan bilah kemajuan. Defaultnya adalah Salah.
+        strategy (str, optional): "multi" atau "fastest" untuk banyak sumber. Defaultnya adalah "multi".
+
+    Returns:
+        dict: Ringkasan dengan kunci "verified", "refetched", "fetched", "bytes", dan "sources".
+
+    Raises:
+        UnsupportedSource: Jika tidak ada sumber yang bisa dipakai.
+        IOError: Jika ada potongan yang tetap gagal diunduh.
+        ValueError: Jika sha256 seluruh file tidak cocok atau strategi tidak dikenal.
+    """
+    if strategy not in ("multi", "fastest"):
+        raise ValueError(f"Strategi tidak dikenal: {strategy}")
+    sha256 = sha256.lower() if sha256 else None
+    sources, info = _select_sources(url, headers, piece_size, quiet)
+    url = sources[0][0]
+
+    with span("download.pieces", category="download", file=os.path.basename(path)) as current:
+        piece_map = _load_sidecar(path) if os.path.exists(path) else None
+        if piece_map is not None and (piece_map.get("size") != info["size"] or piece_map.get("piece_size") != piece_size
+                                      or (piece_map.get("etag") and info["etag"] and piece_map["etag"] != info["etag"])
+                                      or (sha256 and piece_map.get("sha256") not in (None, sha256))):
+            if not quiet:
+                cprint(f"File sumber untuk {os.path.basename(path)} berubah, unduhan dimulai ulang.", color="yellow")
+            piece_map = None
+
+        # File lengkap tanpa peta (misalnya hasil aria2 yang sudah selesai, tanpa file kontrol .aria2)
+        # diadopsi: hash potongannya dicatat agar pemeriksaan berikutnya per potongan.
+        if (piece_map is None and os.path.exists(path) and not os.path.exists(path + ".aria2")
+                and os.path.getsize(path) == info["size"] and (not sha256 or file_sha256(path) == sha256)):
+            piece_map = _new_piece_map(url, info, piece_size, sha256)
+            piece_map["pieces"] = [_hash_piece(path, piece_map, index) for index in range(len(piece_map["pieces"]))]
+            piece_map["complete"] = True
+            _save_sidecar(path, piece_map)
+            summary = {"verified": len(piece_map["pieces"]), "refetched": 0, "fetched": 0, "bytes": 0, "sources": len(sources)}
+            current.set(**summary)
+            return summary
+
+        if piece_map is None:
+            piece_map = _new_piece_map(url, info, piece_size, sha256)
+            with open(path, "wb") as f:
+                f.truncate(info["size"])
+            verified, bad, was_complete = 0, [], False
+        else:
+            was_complete = piece_map.get("complete")
+            piece_map["url"] = url
+            piece_map["sha256"] = sha256 or piece_map.get("sha256")
+            if os.path.getsize(path) != info["size"]:
+                with open(path, "r+b") as f:
+                    f.truncate(info["size"])
+            verified, bad = _verify_pieces(path, piece_map, workers)
+            if bad and not quiet:
+                cprint(f"{len(bad)} dari {verified} potongan {os.path.basename(path)} rusak dan akan diunduh ulang.", color="yellow")
+
+        piece_map["complete"] = False
+        _save_sidecar(path, piece_map)
+
+        pending = [index for index, value in enumerate(piece_map["pieces"]) if not value]
+        failed = _fetch_pending(path, piece_map, pending, sources, workers, retries, os.path.basename(path),
+                                quiet or not pending, spread=strategy == "multi")
+        if failed:
+            index, error = next(iter(failed.items()))
+            raise IOError(f"{len(failed)} potongan gagal diunduh, misalnya potongan {index}: {error}")
+
+        if piece_map["sha256"] and (pending or not was_complete):
+            actual = file_sha256(path)
+            if actual != piece_map["sha256"]:
+                os.remove(sidecar_path(path))
+                raise ValueError(f"sha256 {os.path.basename(path)} tidak cocok: {actual} != {piece_map['sha256']}")
+
+        piece_map["complete"] = True
+        _save_sidecar(path, piece_map)
+
+        fetched = sum(_piece_range(piece_map, index)[1] - _piece_range(piece_map, index)[0] + 1 for index in pending)
+        summary = {"verified": verified, "refetched": len(bad), "fetched": len(pending), "bytes": fetched, "sources": len(sources)}
+        current.set(**summary)
+        return summary
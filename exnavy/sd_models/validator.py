@@ -7,8 +7,11 @@ import json
 from typing import Optional
 from pydantic import BaseModel, ValidationError
 from safetensors.torch import load_file, safe_open
+from ..utils.trace_utils import span
 from ..colortes import cprint
 
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
 class LoraArgs(BaseModel):
     conv_dim: Optional[int]
     conv_alpha: Optional[float]
@@ -45,6 +48,24 @@ class Validator:
         """
         return os.path.splitext(path)[1].lower() == '.ckpt'
     
+    @staticmethod
+    def sha256(path, chunk_size=HASH_CHUNK_SIZE):
+        """
+        Menghitung hash sha256 file per potongan, tanpa memuat seluruh file ke memori.
+        """
+        digest = hashlib.sha256()
+        with span("hash.sha256", category="hash", file=os.path.basename(path)) as current:
+            with open(path, 'rb') as file:
+                buffer = bytearray(chunk_size)
+                view = memoryview(buffer)
+                while True:
+                    size = file.readinto(buffer)
+                    if not size:
+                        break
+                    digest.update(view[:size])
+                    current.add("bytes", size)
+        return digest.hexdigest()
+
     @staticmethod
     def validate_vae(vae_path):
         """
@@ -68,9 +89,7 @@ class Validator:
             'SD15NewVAEpruned'                        : '27a4ac756c5c4fb25bfb7bd32a700a89fe77a66926338b1d78b97e25e1e85f75'
         }
 
-        with open(vae_path, 'rb') as file:
-            contents = file.read()
-        sha256_hash = hashlib.sha256(contents).hexdigest()
+        sha256_hash = Validator.sha256(vae_path)
 
         for vae_name, hash_value in expected_hash.items():
             if hash_value == sha256_hash:
@@ -87,12 +106,14 @@ class Validator:
                 with safe_open(lora_path, framework="pt") as f:
                     raw_metadata = f.metadata()
 
-                if raw_metadata:
-                    try:
-                        metadata = Metadata(**raw_metadata)
-                    except ValidationError as e:
-                        cprint(f"Metadata tidak valid: {e}", color="flat_red")
-                        return False, "Invalid metadata"
+                if not raw_metadata:
+                    return True, "Info LoRA: Tidak ada metadata yang disimpan"
+
+                try:
+                    metadata = Metadata(**raw_metadata)
+                except ValidationError as e:
+                    cprint(f"Metadata tidak valid: {e}", color="flat_red")
+                    return False, "Invalid metadata"
                     
                 lora_args_dict = json.loads(metadata.ss_network_args) if metadata.ss_network_args else {}
 
@@ -127,7 +148,7 @@ class Validator:
                 elif metadata.lora_key_encoding is not None:
                     return False, "Info LoRA: LoRA tidak dilatih menggunakan 'kohya-ss/sd-scripts' tapi menggunakan 'd8ahazard/sd_dreambooth_extension'"
                 else:
-                    return True, "Info LoRA: Tidak ada metadata yang disimpan'"
+                    return True, "Info LoRA: Tidak ada metadata yang disimpan"
             else:
                 return True, "Info LoRA: Tidak ada metadata yang disimpan, model Anda tidak dalam format safetensor"
         except Exception as e:
@@ -153,8 +174,8 @@ class Validator:
                 elif "dylora" in lora_algo:
                     lora_type = "DyLoRA_LyCORIS"
 
-            elif 'networks.lora' in lora_module:
-                if lora_conv_dim is not None or lora_conv_alpha is not None:
+        elif 'networks.lora' in lora_module:
+            if lora_conv_dim is not None or lora_conv_alpha is not None:
                 lora_type = "LoRA_C3Lier"
             else:
                 lora_type = "LoRA_LierLa"
@@ -1,12 +1,71 @@
 import json
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import threading
 import yaml
 import xmltodict
 import toml
-import requests
-import fileinput
+from contextlib import contextmanager
+from .http_cache import cached_get
+from .trace_utils import traced
 from ..colortes import cprint
 
-def determine_file_format():
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_CONFIG_CACHE = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+
+_BATCH = threading.local()
+_MISSING = object()
+
+@contextmanager
+def _atomic_open(filename, mode="w", encoding="utf-8", newline=None):
+    """
+    Membuka file sementara di direktori yang sama dan menggantikan `filename` dengan `os.replace`
+    saat blok selesai tanpa error, sehingga file tidak pernah tertulis setengah jalan.
+    Panggil `discard()` pada objek yang dikembalikan untuk membatalkan penulisan.
+    """
+    filename = os.path.abspath(filename)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(filename)}.", suffix=".tmp", dir=os.path.dirname(filename))
+    kwargs = {} if "b" in mode else {"encoding": encoding, "newline": newline}
+    state = {"discard": False}
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            f.discard = lambda: state.update(discard=True)
+            yield f
+        if state["discard"]:
+            os.remove(tmp_path)
+            return
+        if os.path.exists(filename):
+            shutil.copymode(filename, tmp_path)
+        else:
+            # mkstemp membuat file 0600; file baru mengikuti umask seperti open() biasa.
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _trace_config(result, filename, *args, **kwargs):
+    return {"file": os.path.basename(filename), "bytes": os.path.getsize(filename)}
+
+def determine_file_format(filename):
     """
     Tentukan format file berdasarkan ekstensi nama file.
 
@@ -23,47 +82,105 @@ def determine_file_format():
     else:
         return "txt"
     
-def read_config(filename):
+def _parse_config(filename, file_format):
+    if file_format == 'json':
+        with open(filename, "rb") as f:
+            data = f.read()
+        if orjson is not None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+        return json.loads(data)
+
+    elif file_format in ("yaml", "yml"):
+        with open(filename, "r") as f:
+            return yaml.load(f, Loader=_YAML_LOADER)
+
+    elif file_format == "xml":
+        with open(filename, "r") as f:
+            return xmltodict.parse(f.read())
+
+    elif file_format == "toml":
+        if tomllib is not None:
+            with open(filename, "rb") as f:
+                return tomllib.load(f)
+        with open(filename, "r") as f:
+            return toml.load(f)
+
+    else:
+        with open(filename, 'r') as f:
+            return f.read()
+
+def clear_config_cache(filename=None):
+    """
+    Menghapus cache konfigurasi untuk satu file, atau semua file jika `filename` Tidak Ada.
+
+    Args:
+        filename (str, optional): Jalur ke file konfigurasi. Defaultnya adalah Tidak Ada.
+    """
+    with _CONFIG_CACHE_LOCK:
+        if filename is None:
+            _CONFIG_CACHE.clear()
+        else:
+            _CONFIG_CACHE.pop(os.path.abspath(filename), None)
+
+@traced("config.read", category="config", record=_trace_config)
+def read_config(filename, use_cache=True):
     """
     Membaca isi file.
 
+    Hasil parsing disimpan di cache proses dengan kunci (path, mtime_ns, size), sehingga file yang
+    tidak berubah tidak di-parse ulang. Cache menyimpan hasil dalam bentuk pickle dan setiap pemanggilan
+    mengembalikan salinan baru, jadi hasilnya aman diubah.
+    Parser C (`yaml.CSafeLoader`, `tomllib`, `orjson`) dipakai jika tersedia.
+
     Args:
         filename (str): Jalur ke file konfigurasi. Bisa berupa JSON, YAML, XML, TOML, atau TXT.
+        use_cache (bool, optional): Gunakan cache konfigurasi. Defaultnya adalah Benar.
 
     Returns:
         dict or str: Konfigurasi dibaca dari file. Untuk file TXT, string dikembalikan.
     """
     file_format = determine_file_format(filename)
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
 
-    if file_format == 'json':
-        with open(filename, "r") as f:
-            config = json.load(f)
-
-    elif file_format in ("yaml", "yml"):
-        with open(filename, "r") as f:
-            config = yaml.safe_load(f)
+    if use_cache:
+        cached = _CONFIG_CACHE.get(path)
+        if cached is not None and cached[0] == key:
+            return pickle.loads(cached[1])
 
-    elif file_format == "xml":
-        with open(filename, "r") as f:
-            config = xmltodict.parse(f.read())
+    config = _parse_config(path, file_format)
 
-    elif file_format == "toml":
-        with open(filename, "r") as f:
-            config = toml.load(f)
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE[path] = (key, pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL))
 
-    elif file_format == "txt":
-        with open(filename, "r") as f:
-            config = f.read()
+    return config
 
+def _dump_config(config, file_format, indent=4, ensure_ascii=True, sort_keys=True, trailing_newline=False):
+    if file_format == "json":
+        data = json.dumps(config, indent=indent, ensure_ascii=ensure_ascii)
+    elif file_format in ("yaml", "yml"):
+        data = yaml.dump(config, sort_keys=sort_keys, allow_unicode=not ensure_ascii)
+    elif file_format == "xml":
+        data = xmltodict.unparse(config, pretty=True)
+    elif file_format == "toml":
+        data = toml.dumps(config)
     else:
-        with open(filename, 'r') as f:
-            config = f.read()
+        data = config
 
-    return config
+    if trailing_newline and not data.endswith("\n"):
+        data += "\n"
+    return data
 
+@traced("config.write", category="config", record=_trace_config)
 def write_config(filename, config):
     """
     Tulis konfigurasi ke file.
+
+    File ditulis melalui file sementara dan `os.replace`, jadi tidak pernah tertinggal setengah tertulis.
     
     args:
         filename (str): Jalur ke file konfigurasi. Bisa berupa JSON, YAML, XML, TOML, atau TXT.
@@ -73,22 +190,336 @@ def write_config(filename, config):
 
     file_format = determine_file_format(filename)
 
-    if file_format == "json":
-        with open(filename, "w") as f:
-            json.dump(config, f, indent=4)
-    elif file_format == "yaml" or file_format == "yml":
-        with open(filename, "w") as f:
-            yaml.dump(config, f)
-    elif file_format == "xml":
-        with open(filename, "w") as f:
-            xml = xmltodict.unparse(config, pretty=True)
-            f.write(xml)
-    elif file_format == "toml":
-        with open(filename, "w") as f:
-            toml.dump(config, f)
+    with _atomic_open(filename, "w", encoding="utf-8") as f:
+        f.write(_dump_config(config, file_format))
+
+    clear_config_cache(filename)
+
+def _resolve_key(tree, key):
+    if isinstance(key, (list, tuple)):
+        parts = list(key)
+    else:
+        parts = None
+        rest = key
+
+    node = tree
+    while True:
+        if not isinstance(node, (dict, list)):
+            raise TypeError(f"Kunci '{key}' melewati nilai {type(node).__name__}, bukan dict atau list.")
+        if parts is not None:
+            name, last = parts.pop(0), not parts
+        elif isinstance(node, dict) and rest in node:
+            name, last = rest, True
+        else:
+            name, sep, rest = rest.partition(".")
+            last = not sep
+
+        if isinstance(node, list):
+            name = int(name)
+        if last:
+            return node, name
+
+        if isinstance(node, list):
+            child = node[name]
+        else:
+            child = node.get(name, _MISSING)
+            if child is _MISSING or child is None:
+                child = node[name] = {}
+        node = child
+
+def _json_style(filename):
+    with open(filename, "rb") as f:
+        raw = f.read()
+    match = re.search(rb"\n([ \t]+)\S", raw)
+    if match is None:
+        indent = None
+    elif match.group(1).startswith(b"\t"):
+        indent = "\t"
+    else:
+        indent = len(match.group(1))
+    return {
+        "indent"          : indent,
+        "ensure_ascii"    : not any(byte > 0x7f for byte in raw),
+        "trailing_newline": raw.endswith(b"\n"),
+    }
+
+def _loads_config(text, file_format):
+    if file_format in ("yaml", "yml"):
+        return yaml.load(text, Loader=_YAML_LOADER)
+    if tomllib is not None:
+        return tomllib.loads(text)
+    return toml.loads(text)
+
+def _changed_leaves(old, new, prefix=()):
+    # Hanya nilai skalar yang sudah ada yang bisa diedit di tempat; perubahan struktur mengembalikan None.
+    if not isinstance(old, dict) or not isinstance(new, dict) or old.keys() != new.keys():
+        return None
+    leaves = []
+    for name, value in new.items():
+        current = old[name]
+        if isinstance(value, dict) or isinstance(current, dict):
+            nested = _changed_leaves(current, value, prefix + (name,))
+            if nested is None:
+                return None
+            leaves.extend(nested)
+        elif isinstance(value, list) or isinstance(current, list):
+            if type(current) is not type(value) or current != value:
+                return None
+        elif type(current) is not type(value) or current != value:
+            leaves.append((prefix + (name,), value))
+    return leaves
+
+def _split_comment(rest, file_format):
+    # Memisahkan teks nilai dari komentar di belakangnya, dengan melewati '#' di dalam string.
+    quote = None
+    index = 0
+    while index < len(rest):
+        char = rest[index]
+        if quote is not None:
+            if char == "\\" and quote == '"':
+                index += 1
+            elif char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "#" and (file_format == "toml" or index == 0 or rest[index - 1] in " \t"):
+            break
+        index += 1
+    return len(rest[:index].rstrip())
+
+_YAML_KEY = re.compile(r"""^([ ]*)("(?:[^"\\]|\\.)*"|'(?:[^']|'')*'|[^\s#'"\-?][^#]*?|-[^\s#][^#]*?)[ \t]*:(?:[ \t]+|$)""")
+_TOML_PART = r"""(?:[A-Za-z0-9_\-]+|"(?:[^"\\]|\\.)*"|'[^']*')"""
+_TOML_KEY = re.compile(rf"^[ \t]*({_TOML_PART}(?:[ \t]*\.[ \t]*{_TOML_PART})*)[ \t]*=[ \t]*")
+_TOML_TABLE = re.compile(rf"^[ \t]*\[[ \t]*({_TOML_PART}(?:[ \t]*\.[ \t]*{_TOML_PART})*)[ \t]*\][ \t]*(?:#.*)?$")
+
+def _unquote_key(part):
+    if part[:1] == '"':
+        return json.loads(part)
+    if part[:1] == "'":
+        return part[1:-1].replace("''", "'") if len(part) > 1 else part
+    return part
+
+def _toml_key(text):
+    return tuple(_unquote_key(part) for part in re.findall(_TOML_PART, text))
+
+def _value_spans(lines, file_format):
+    # Memetakan path kunci ke (baris, awal, akhir) teks nilai skalar yang ditulis di baris yang sama.
+    spans = {}
+    stack = []
+    table = ()
+    skip_indent = None
+    fence = None
+    for number, raw in enumerate(lines):
+        line = raw.rstrip("\r\n")
+        if fence is not None:
+            if fence in line:
+                fence = None
+            continue
+
+        if file_format == "toml":
+            header = _TOML_TABLE.match(line)
+            if header:
+                table = _toml_key(header.group(1))
+                continue
+            if line.lstrip().startswith("["):
+                table = None
+                continue
+            match = _TOML_KEY.match(line)
+            if not match or table is None:
+                continue
+            path = table + _toml_key(match.group(1))
+            rest = line[match.end():]
+            for marker in ('"""', "'''"):
+                if rest.startswith(marker) and rest.count(marker) == 1:
+                    fence = marker
+            if fence is not None:
+                continue
+        else:
+            stripped = line.lstrip(" ")
+            indent = len(line) - len(stripped)
+            if skip_indent is not None:
+                if not stripped or indent > skip_indent:
+                    continue
+                skip_indent = None
+            if not stripped or stripped.startswith("#") or stripped.startswith("---") or stripped.startswith("- "):
+                continue
+            match = _YAML_KEY.match(line)
+            if not match:
+                continue
+            while stack and stack[-1][0] >= indent:
+                stack.pop()
+            name = _unquote_key(match.group(2)) if match.group(2)[:1] in "'\"" else match.group(2)
+            path = tuple(key for _, key in stack) + (name,)
+            rest = line[match.end():]
+            end = _split_comment(rest, file_format)
+            if end == 0:
+                stack.append((indent, name))
+                continue
+            if rest[:1] in "|>":
+                skip_indent = indent
+                continue
+            if rest[:1] in "&*!":
+                continue
+
+        spans[path] = (number, len(line) - len(rest), len(line) - len(rest) + _split_comment(rest, file_format))
+    return spans
+
+def _render_scalar(value, file_format):
+    if file_format == "toml":
+        text = toml.dumps({"value": value})
+        prefix = "value = "
+        if not text.startswith(prefix) or text.count("\n") != 1:
+            return None
+        return text[len(prefix):].rstrip("\n")
+    text = yaml.safe_dump([value], default_flow_style=True, allow_unicode=True, width=float("inf"))
+    if not text.startswith("[") or not text.endswith("]\n") or text.count("\n") != 1:
+        return None
+    return text[1:-2]
+
+def _patch_text(text, config, file_format):
+    """
+    Menulis ulang hanya teks nilai skalar yang berubah, sehingga komentar, urutan, dan format YAML/TOML
+    tetap utuh. Mengembalikan None jika perubahan tidak bisa diterapkan dengan aman (kunci baru atau
+    terhapus, list, blok multi-baris, anchor), lalu hasilnya diperiksa ulang dengan mem-parse teks baru.
+    """
+    try:
+        leaves = _changed_leaves(_loads_config(text, file_format), config)
+    except Exception:
+        return None
+    if leaves is None:
+        return None
+
+    lines = text.splitlines(keepends=True)
+    spans = _value_spans(lines, file_format)
+    for path, value in leaves:
+        span = spans.get(tuple(str(key) for key in path))
+        rendered = _render_scalar(value, file_format)
+        if span is None or rendered is None:
+            return None
+        number, start, end = span
+        line = lines[number]
+        lines[number] = line[:start] + rendered + line[end:]
+
+    patched = "".join(lines)
+    try:
+        if _loads_config(patched, file_format) != config:
+            return None
+    except Exception:
+        return None
+    return patched
+
+@traced("config.patch", category="config", record=_trace_config)
+def _flush_config(filename, config):
+    file_format = determine_file_format(filename)
+    style = {"sort_keys": False}
+    if file_format == "json" and os.path.exists(filename):
+        style.update(_json_style(filename))
+    elif file_format in ("yaml", "yml", "toml") and os.path.exists(filename):
+        with open(filename, "r", encoding="utf-8", newline="") as f:
+            text = f.read()
+        patched = _patch_text(text, config, file_format)
+        if patched is not None:
+            with _atomic_open(filename, "w", encoding="utf-8", newline="") as f:
+                f.write(patched)
+            clear_config_cache(filename)
+            return
+        if text.strip():
+            cprint(f"{os.path.basename(filename)} ditulis ulang seluruhnya; komentar dan format aslinya tidak dipertahankan.", color="yellow")
+
+    if file_format in ("yaml", "yml"):
+        style["ensure_ascii"] = False
+
+    with _atomic_open(filename, "w", encoding="utf-8") as f:
+        f.write(_dump_config(config, file_format, **style))
+
+    clear_config_cache(filename)
+
+def patch_config(filename, updates):
+    """
+    Ubah beberapa nilai dalam file konfigurasi JSON, YAML, XML, atau TOML dengan path bertitik.
+
+    Nilai dibandingkan dengan pohon konfigurasi dari cache `read_config`; file hanya ditulis
+    (secara atomik) jika ada nilai yang benar-benar berbeda. Kunci yang mengandung titik tetap bisa
+    dipakai: jika seluruh sisa path ada sebagai kunci literal, kunci itu yang dipilih. Path juga
+    boleh berupa tuple kunci. Untuk JSON, indentasi dan akhir baris file asli dipertahankan. Untuk YAML
+    dan TOML, hanya teks nilai skalar yang berubah yang ditulis ulang sehingga komentar dan format tetap
+    utuh; menambah atau menghapus kunci, mengubah list, atau nilai multi-baris membuat file ditulis ulang
+    seluruhnya (dengan peringatan) dan komentarnya hilang.
+    Di dalam `config_batch()`, perubahan ditahan dan ditulis sekali di akhir blok.
+
+    Contoh:
+        patch_config("config.json", {"sd_model_checkpoint": "model.safetensors", "images.format": "png"})
+
+    Args:
+        filename (str): Jalur ke file konfigurasi.
+        updates (dict): Pemetaan path bertitik (atau tuple kunci) ke nilai baru.
+
+    Returns:
+        list: Path yang nilainya berubah.
+    """
+    path = os.path.abspath(filename)
+    if determine_file_format(path) == "txt":
+        raise ValueError(f"patch_config tidak mendukung file teks: {filename}")
+
+    pending = getattr(_BATCH, "pending", None)
+    if pending is not None and path in pending:
+        tree = pending[path]
+    elif os.path.exists(path):
+        tree = read_config(path) or {}
     else:
-        with open(filename, 'w', encoding="utf-8") as f:
-            f.write(config)
+        tree = {}
+
+    changed = []
+    for key, value in updates.items():
+        parent, name = _resolve_key(tree, key)
+        if isinstance(parent, list):
+            current = parent[name] if -len(parent) <= name < len(parent) else _MISSING
+        else:
+            current = parent.get(name, _MISSING)
+
+        if current is not _MISSING and type(current) is type(value) and current == value:
+            continue
+
+        if isinstance(parent, list) and name == len(parent):
+            parent.append(value)
+        else:
+            parent[name] = value
+        changed.append(key)
+
+    if changed:
+        if pending is not None:
+            pending[path] = tree
+        else:
+            _flush_config(path, tree)
+
+    return changed
+
+@contextmanager
+def config_batch():
+    """
+    Gabungkan semua `patch_config` di dalam blok menjadi satu penulisan per file di akhir blok.
+
+    Batch bersifat per thread dan boleh bersarang; hanya blok terluar yang menulis. Jika blok
+    keluar karena exception, perubahan yang tertunda dibuang dan file tidak diubah.
+
+    Contoh:
+        with config_batch():
+            patch_config("config.json", {"CLIP_stop_at_last_layers": 2})
+            patch_config("config.json", {"sd_vae": "vae.safetensors"})
+    """
+    if getattr(_BATCH, "pending", None) is not None:
+        yield
+        return
+
+    _BATCH.pending = {}
+    try:
+        yield
+        pending = _BATCH.pending
+    finally:
+        _BATCH.pending = None
+
+    for path, tree in pending.items():
+        _flush_config(path, tree)
 
 def get_config(filename):
     """
@@ -103,27 +534,96 @@ def get_config(filename):
     config = read_config(filename)
     return config
 
+@traced("config.edit", category="config", record=_trace_config)
+def edit_file(filename, rules, encoding="utf-8"):
+    """
+    Terapkan banyak aturan penggantian ke file dalam satu kali baca per baris.
+
+    Setiap aturan berupa pasangan (pola, pengganti). Pola string diganti secara literal, sedangkan
+    pola regex yang sudah dikompilasi (`re.compile`) memakai `Pattern.subn`, jadi pengganti boleh
+    berisi referensi grup. Aturan diterapkan berurutan pada setiap baris. Hasil ditulis ke file
+    sementara lalu dipindahkan dengan `os.replace`; jika tidak ada yang berubah, file asli tidak
+    disentuh sehingga mtime dan cache `read_config` tetap berlaku. Akhir baris asli dipertahankan.
+
+    Args:
+        filename (str): Jalur ke file.
+        rules (dict or list): Pemetaan pola ke pengganti, atau daftar pasangan (pola, pengganti).
+        encoding (str, optional): Encoding file. Defaultnya adalah "utf-8".
+
+    Returns:
+        dict: Jumlah penggantian untuk setiap pola. Pola dengan nilai 0 tidak cocok di mana pun.
+    """
+    rules = list(rules.items()) if isinstance(rules, dict) else list(rules)
+    for pattern, _ in rules:
+        if not isinstance(pattern, re.Pattern) and not pattern:
+            raise ValueError("Pola penggantian tidak boleh kosong")
+
+    counts = [0] * len(rules)
+    changed = False
+
+    with _atomic_open(filename, "w", encoding=encoding, newline="") as dst, \
+         open(filename, "r", encoding=encoding, newline="") as src:
+        for line in src:
+            new_line = line
+            for index, (pattern, replacement) in enumerate(rules):
+                if isinstance(pattern, re.Pattern):
+                    new_line, count = pattern.subn(replacement, new_line)
+                else:
+                    count = new_line.count(pattern)
+                    if count:
+                        new_line = new_line.replace(pattern, replacement)
+                counts[index] += count
+            if new_line != line:
+                changed = True
+            dst.write(new_line)
+
+        if not changed:
+            dst.discard()
+
+    if changed:
+        clear_config_cache(filename)
+
+    result = {}
+    for (pattern, _), count in zip(rules, counts):
+        result[pattern] = result.get(pattern, 0) + count
+    return result
+
 def change_line(filename, old_string, new_string):
     """
     Ganti string dalam file dengan string lain.
 
+    Untuk banyak penggantian pada file yang sama, gunakan `edit_file` agar file hanya dibaca dan ditulis sekali.
+
     Args:
         filename (str): Jalur ke file.
         old_string (str): String lama yang akan diganti.
         new_string (str): String yang akan diganti.
+
+    Returns:
+        int: Jumlah penggantian.
     """
-    with fileinput.input(files=(filename,), inplace=True) as file:
-        for line in file:
-            print(line.replace(old_string, new_string), end='')
+    return edit_file(filename, [(old_string, new_string)])[old_string]
 
-def pastebin_reader(id):
+def pastebin_reader(id, ttl=0):
+    """
+    Membaca paste mentah dari Pastebin.
+
+    Isi paste disimpan di cache HTTP exnavy dan divalidasi ulang dengan ETag/Last-Modified. Jika
+    Pastebin tidak bisa dihubungi, salinan terakhir dari cache dipakai.
+
+    Args:
+        id (str): ID paste atau URL Pastebin.
+        ttl (float, optional): Lama salinan cache dipakai tanpa validasi ulang, dalam detik. Defaultnya adalah 0.
+
+    Returns:
+        list: Baris-baris isi paste.
+    """
     if "pastebin.com" in id:
         url = id 
         if 'raw' not in url:
                 url = url.replace('pastebin.com', 'pastebin.com/raw')
     else:
         url = "https://pastebin.com/raw/" + id
-    response = requests.get(url)
-    response.raise_for_status() 
-    lines = response.text.split('\n')
+    text = cached_get(url, ttl=ttl).decode("utf-8")
+    lines = text.split('\n')
     return lines
@@ -1,9 +1,16 @@
 import subprocess
 import os
+import random
+import shutil
+import threading
+import time
 import concurrent.futures
-import requests
+from dataclasses import dataclass
 from tqdm import tqdm
 from urllib.parse import urlparse
+from .http_cache import cached_fetch
+from .py_utils import get_cache_dir
+from .trace_utils import traced
 from ..colortes import cprint
 
 def clone_repos(url, cwd=None, directory=None, branch=None, commit_hash=None, recursive=False, quiet=False, batch=False):
@@ -104,23 +111,48 @@ def checkout_repo(directory, reference, create=False, args="", quiet=False, batc
 
     return message
 
+def _fetch_patch(url, directory, quiet=False):
+    """
+    Mengambil file patch dari cache lokal, divalidasi ulang dengan ETag/Last-Modified.
+
+    Returns:
+        str: Path file patch, atau None jika gagal dan belum ada di cache.
+    """
+    try:
+        return cached_fetch(url, cache_dir=directory, quiet=quiet)
+    except Exception as e:
+        if not quiet:
+            cprint(f"Kesalahan mengunduh dari {url}. Kesalahan: {str(e)}", color="flat_red")
+        return None
+
 def patch_repo(url, dir, cwd, path=None, args=None, whitespace_fix=False, quiet=False):
     """
-    Fungsi untuk menambal repo dengan argumen tertentu
+    Fungsi untuk menambal repo dengan argumen tertentu.
+
+    Patch dari URL disimpan di cache `dir` dan hanya diunduh ulang jika berubah di server.
+    Patch yang sudah diterapkan dilewati (dicek dengan `git apply --reverse --check`), dan
+    sisanya diterapkan dalam satu perintah `git apply`.
     
     Args:
-        url (str): URL untuk file patch.
-        dir (str): Tempat untuk menyimpan repositori yang dikloning.
+        url (str or list): URL file patch, atau daftar URL.
+        dir (str): Tempat untuk menyimpan cache file patch. Jika Tidak Ada, memakai cache exnavy.
         cwd (str): Direktori kerja untuk perintah subproses.
+        path (str or list, optional): Path file patch lokal, atau daftar path.
         args (list, optional): Argumen tambahan untuk perintah patch.
         whitespace_fix (bool, optional): Apakah akan menerapkan '--whitespace=fix' argument.
+        quiet (bool, optional): Apakah akan menyembunyikan pesan. Defaultnya adalah Salah.
         
     Returns:
-        CompletedProcess: Proses selesai.
+        CompletedProcess: Proses selesai, atau None jika tidak ada patch yang perlu diterapkan atau terjadi kesalahan.
     """
+    urls = [url] if isinstance(url, str) else list(url or [])
+    paths = [path] if isinstance(path, str) else list(path or [])
 
-    if not isinstance(url, str) or not isinstance(dir, str) or not isinstance(cwd, str):
-        raise ValueError("'url', 'dir' and 'cwd' harus berupa string.")
+    if not all(isinstance(item, str) for item in urls + paths) or not isinstance(cwd, str):
+        raise ValueError("'url', 'path' dan 'cwd' harus berupa string atau list string.")
+
+    if dir is not None and not isinstance(dir, str):
+        raise ValueError("'dir' harus berupa string.")
     
     if args is not None and not isinstance(args, list):
         raise ValueError("'args' harus berupa list.")
@@ -128,40 +160,50 @@ def patch_repo(url, dir, cwd, path=None, args=None, whitespace_fix=False, quiet=
     if not isinstance(whitespace_fix, bool):
         raise ValueError("'whitespace_fix' harus berupa boolean.")
     
+    if dir is None:
+        dir = get_cache_dir("patches")
     os.makedirs(dir, exist_ok=True)
 
-    filename=""
-
-    if url:
-        filename = urlparse(url).path.split('/')[-1].replace('.git', '')
-        try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            
-            with open(os.path.join(dir, filename), 'wb') as file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    file.write(chunk)
-        except Exception as e:
-            if not quiet:
-                print(f"Kesalahan mengunduh dari {url}. Kesalahan: {str(e)}")
+    for patch_url in urls:
+        if not patch_url:
+            continue
+        patch_path = _fetch_patch(patch_url, dir, quiet=quiet)
+        if patch_path is None:
             return
-        
-    elif path:
-        filename = os.path.basename(url)
-    
-    if not path:
-        path = os.path.join(dir, filename)
-
-        cmd = ['git', 'apply']
+        paths.append(patch_path)
 
+    cmd = ['git', 'apply']
     if whitespace_fix:
         cmd.append('--whitespace=fix')
     if args:
         cmd.extend(args)
-    cmd.append(path)
+
+    def check(patches, reverse=False):
+        probe = cmd + (['--reverse'] if reverse else []) + ['--check'] + patches
+        return subprocess.run(probe, cwd=cwd, capture_output=True).returncode == 0
+
+    pending = []
+    for patch_path in paths:
+        if not check([patch_path]) and check([patch_path], reverse=True):
+            if not quiet:
+                cprint(f"Patch '{os.path.basename(patch_path)}' sudah diterapkan, dilewati.", color="yellow")
+            continue
+        pending.append(patch_path)
+
+    if not pending:
+        return
+
+    if not check(pending):
+        applicable = [patch_path for patch_path in pending if check([patch_path])]
+        for patch_path in pending:
+            if patch_path not in applicable and not quiet:
+                cprint(f"Patch '{os.path.basename(patch_path)}' tidak dapat diterapkan, dilewati.", color="flat_red")
+        pending = applicable
+        if not pending:
+            return
 
     try:
-        return subprocess.run(cmd, cwd=cwd, check=True)
+        return subprocess.run(cmd + pending, cwd=cwd, check=True)
     except subprocess.CalledProcessError as e:
         if not quiet:
             cprint(f"Terjadi kesalahan saat menerapkan tambalan. Kesalahan: {str(e)}", color="flat_red")
@@ -253,96 +295,337 @@ def update_repo(fetch=False, pull=True, origin=None, cwd=None, args="", quiet=Fa
 
     return message
 
-def batch_clone(urls, cwd=None, directory=None, branch=None, commit_hash=None, recursive=False, quiet=False):
+TRANSIENT_GIT_ERRORS = (
+    "could not resolve host",
+    "connection timed out",
+    "connection reset",
+    "operation timed out",
+    "failed to connect",
+    "early eof",
+    "the remote end hung up unexpectedly",
+    "rpc failed",
+    "gnutls_handshake",
+    "ssl_read",
+    "tls connection",
+    "returned error: 429",
+    "returned error: 500",
+    "returned error: 502",
+    "returned error: 503",
+    "returned error: 504",
+    "too many requests",
+)
+
+@dataclass
+class GitResult:
     """
-    Mengkloning beberapa repositori Git secara paralel.
+    Hasil terstruktur dari satu operasi git di dalam batch.
+
+    Attributes:
+        repo       (str)   : Nama atau path repositori.
+        operation  (str)   : Jenis operasi ("clone", "update").
+        status     (str)   : "success", "updated", "skipped", atau "failed".
+        returncode (int)   : Kode keluar perintah git terakhir.
+        duration   (float) : Lama operasi dalam detik, termasuk retry.
+        bytes      (int)   : Pertambahan ukuran direktori .git dalam bytes.
+        attempts   (int)   : Jumlah percobaan yang dijalankan.
+        stderr     (str)   : Stderr dari percobaan terakhir.
+        message    (str)   : Pesan ringkas untuk ditampilkan.
+    """
+    repo: str
+    operation: str
+    status: str
+    returncode: int = 0
+    duration: float = 0.0
+    bytes: int = 0
+    attempts: int = 0
+    stderr: str = ""
+    message: str = ""
+
+    @property
+    def ok(self):
+        return self.status != "failed"
+
+def _trace_git_result(result, *args, **kwargs):
+    return {"repo": result.repo, "outcome": result.status, "bytes": result.bytes, "attempts": result.attempts}
+
+def _dir_size(directory):
+    total = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+def _is_transient(stderr):
+    stderr = stderr.lower()
+    return any(pattern in stderr for pattern in TRANSIENT_GIT_ERRORS)
+
+class GitScheduler:
+    """
+    Penjadwal operasi git dengan batas worker, batas koneksi per host, dan retry
+    dengan exponential backoff untuk error jaringan sementara.
 
     Args:
-        urls        (list)              : URL list of Git repositories.
-        desc        (str, optional)     : Deskripsi untuk ditampilkan di bilah kemajuan. Defaultnya adalah "Kloning...".
-        cwd         (str, optional)     : Direktori kerja untuk perintah subproses. Defaultnya adalah Tidak Ada.
-        directory   (str, optional)     : Direktori tempat repositori harus dikloning. Defaultnya adalah Tidak Ada.
-        branch      (str, optional)     : Cabang untuk checkout. Defaultnya adalah Tidak Ada.
-        commit_hash (str, optional)     : Hash komit untuk checkout. Defaultnya adalah Tidak Ada.
-        recursive   (bool, optional)    : Tandai untuk mengkloning submodul secara rekursif. Defaultnya adalah Salah.
+        max_workers (int, optional)   : Jumlah maksimal operasi paralel. Defaultnya adalah 8.
+        per_host    (int, optional)   : Jumlah maksimal operasi paralel ke satu host. Defaultnya adalah 4.
+        retries     (int, optional)   : Jumlah retry untuk error sementara. Defaultnya adalah 3.
+        backoff     (float, optional) : Jeda awal retry dalam detik, dikali dua tiap percobaan. Defaultnya adalah 1.0.
+        max_backoff (float, optional) : Jeda maksimal retry dalam detik. Defaultnya adalah 30.0.
     """
 
+    def __init__(self, max_workers=8, per_host=4, retries=3, backoff=1.0, max_backoff=30.0):
+        if max_workers < 1 or per_host < 1:
+            raise ValueError("'max_workers' dan 'per_host' harus lebih besar dari 0.")
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host_slot(self, url):
+        host = urlparse(url).netloc if url and "://" in url else (url or "").split(":")[0].split("@")[-1]
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return self._hosts[host]
+
+    def run(self, cmd, cwd=None, url=None, cleanup=None):
+        """
+        Menjalankan perintah git dengan batas host dan retry.
+
+        Args:
+            cmd     (list)          : Perintah git.
+            cwd     (str, optional) : Direktori kerja. Defaultnya adalah Tidak Ada.
+            url     (str, optional) : URL remote untuk menentukan host. Defaultnya adalah Tidak Ada.
+            cleanup (str, optional) : Direktori yang dihapus sebelum retry (sisa clone gagal). Defaultnya adalah Tidak Ada.
+
+        Returns:
+            tuple: CompletedProcess terakhir dan jumlah percobaan.
+        """
+        slot = self._host_slot(url)
+        attempt = 0
+        while True:
+            attempt += 1
+            with slot:
+                result = subprocess.run(cmd, text=True, cwd=cwd, capture_output=True)
+            if result.returncode == 0 or attempt > self.retries or not _is_transient(result.stderr):
+                return result, attempt
+            if cleanup and os.path.isdir(cleanup):
+                shutil.rmtree(cleanup, ignore_errors=True)
+            delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+            time.sleep(delay + random.uniform(0, delay / 2))
+
+    @traced("git.clone", category="git", record=_trace_git_result)
+    def clone(self, url, cwd=None, directory=None, branch=None, commit_hash=None, recursive=False):
+        """
+        Mengkloning satu repositori dan mengembalikan GitResult.
+
+        Args:
+            url         (str)            : URL Git.
+            cwd         (str, optional)  : Direktori kerja. Defaultnya adalah Tidak Ada.
+            directory   (str, optional)  : Direktori tujuan clone. Defaultnya adalah nama repositori.
+            branch      (str, optional)  : Cabang untuk checkout. Defaultnya adalah Tidak Ada.
+            commit_hash (str, optional)  : Hash komit untuk checkout. Defaultnya adalah Tidak Ada.
+            recursive   (bool, optional) : Kloning submodul secara rekursif. Defaultnya adalah Salah.
+
+        Returns:
+            GitResult: Hasil operasi.
+        """
+        name = urlparse(url).path.rstrip('/').split('/')[-1].replace('.git', '')
+        directory = directory or name
+        target = os.path.join(cwd, directory) if cwd else directory
+        start = time.time()
+
+        if os.path.exists(target):
+            return GitResult(name, "clone", "skipped", message=f"Directory '{name}' sudah ada.")
+
+        cmd = ["git", "clone", "--quiet"]
+        if branch:
+            cmd.extend(["-b", branch])
+        if recursive:
+            cmd.append("--recursive")
+        cmd.extend([url, directory])
+
+        result, attempts = self.run(cmd, cwd=cwd, url=url, cleanup=target)
+        if result.returncode == 0 and commit_hash:
+            result = subprocess.run(["git", "-c", "advice.detachedHead=false", "checkout", commit_hash], text=True, cwd=target, capture_output=True)
+
+        if result.returncode == 0:
+            status, message = "success", f"Mengcloning '{name}' telah berhasil."
+        else:
+            status, message = "failed", f"Mengcloning '{name}' telah gagal: {result.stderr.strip()}"
+
+        return GitResult(
+            name, "clone", status,
+            returncode=result.returncode,
+            duration=time.time() - start,
+            bytes=_dir_size(os.path.join(target, ".git")) if status == "success" else 0,
+            attempts=attempts,
+            stderr=result.stderr,
+            message=message,
+        )
+
+    @traced("git.update", category="git", record=_trace_git_result)
+    def update(self, directory, fetch=False, pull=True, origin=None, args=""):
+        """
+        Memperbarui satu repositori dan mengembalikan GitResult.
+
+        Args:
+            directory (str)            : Direktori repositori.
+            fetch     (bool, optional) : Lakukan fetch. Defaultnya adalah Salah.
+            pull      (bool, optional) : Lakukan pull. Defaultnya adalah Benar.
+            origin    (str, optional)  : Remote untuk fetch. Defaultnya adalah Tidak Ada.
+            args      (str, optional)  : Argumen tambahan untuk perintah pull.
+
+        Returns:
+            GitResult: Hasil operasi.
+        """
+        name = os.path.basename(os.path.normpath(directory))
+        start = time.time()
+        remote = subprocess.run(["git", "config", "--get", f"remote.{origin or 'origin'}.url"], text=True, cwd=directory, capture_output=True)
+        url = remote.stdout.strip()
+        git_dir = os.path.join(directory, ".git")
+        size_before = _dir_size(git_dir)
+
+        status, message, attempts = "skipped", f"'{name}' sudah diperbarui ke versi terbaru", 0
+        result = None
+
+        if fetch:
+            cmd = ["git", "fetch"]
+            if origin:
+                cmd.append(origin)
+            result, tries = self.run(cmd, cwd=directory, url=url)
+            attempts += tries
+            if result.returncode != 0:
+                status, message = "failed", f"Terjadi kesalahan saat mengambil repositori di {directory}: {result.stderr.strip()}"
+
+        if pull and status != "failed":
+            cmd = ["git", "pull"]
+            if args:
+                cmd.extend(args.split())
+            result, tries = self.run(cmd, cwd=directory, url=url)
+            attempts += tries
+            if result.returncode != 0:
+                status, message = "failed", f"Terjadi kesalahan saat pull di {directory}: {result.stderr.strip()}"
+            elif "Already up to date." not in result.stdout:
+                status, message = "updated", f"'{name}' telah diperbarui ke versi terbaru"
+
+        return GitResult(
+            name, "update", status,
+            returncode=result.returncode if result else 0,
+            duration=time.time() - start,
+            bytes=max(0, _dir_size(git_dir) - size_before),
+            attempts=attempts,
+            stderr=result.stderr if result else "",
+            message=message,
+        )
+
+    def map(self, func, items, desc=None, quiet=False):
+        """
+        Menjalankan `func` untuk setiap item secara paralel dengan batas `max_workers`.
+
+        Exception dari satu item dicatat sebagai GitResult gagal dan tidak menghentikan batch.
+
+        Args:
+            func  (callable)       : Fungsi yang menerima satu item dan mengembalikan GitResult.
+            items (list)           : Daftar item.
+            desc  (str, optional)  : Deskripsi untuk tqdm. Defaultnya adalah Tidak Ada.
+            quiet (bool, optional) : Sembunyikan bilah kemajuan. Defaultnya adalah Salah.
+
+        Returns:
+            list: Daftar GitResult dengan urutan yang sama seperti `items`.
+        """
+        results = [None] * len(items)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(func, item): index for index, item in enumerate(items)}
+            for future in tqdm(concurrent.futures.as_completed(futures), total=len(items), desc=desc, disable=quiet):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    results[index] = GitResult(str(items[index]), "unknown", "failed", returncode=-1, stderr=str(e), message=f"Terjadi kesalahan tak terduga: {e}")
+        return results
+
+def _print_results(results):
+    colors = {"success": "green", "updated": "green", "skipped": "yellow", "failed": "red"}
+    for result in results:
+        if result.status == "skipped" and result.operation == "update":
+            continue
+        cprint(" [-]", result.message, color=colors.get(result.status, "default"))
+    cprint()
+
+def batch_clone(urls, cwd=None, directory=None, branch=None, commit_hash=None, recursive=False, quiet=False, desc=None, scheduler=None):
+    """
+    Mengkloning beberapa repositori Git secara paralel.
+
+    Args:
+        urls        (list)                   : URL list of Git repositories.
+        cwd         (str, optional)          : Direktori kerja untuk perintah subproses. Defaultnya adalah Tidak Ada.
+        directory   (str, optional)          : Direktori induk tempat repositori harus dikloning. Defaultnya adalah Tidak Ada.
+        branch      (str, optional)          : Cabang untuk checkout. Defaultnya adalah Tidak Ada.
+        commit_hash (str, optional)          : Hash komit untuk checkout. Defaultnya adalah Tidak Ada.
+        recursive   (bool, optional)         : Tandai untuk mengkloning submodul secara rekursif. Defaultnya adalah Salah.
+        quiet       (bool, optional)         : Sembunyikan pesan status. Defaultnya adalah Salah.
+        desc        (str, optional)          : Deskripsi untuk ditampilkan di bilah kemajuan. Defaultnya adalah "Cloning...".
+        scheduler   (GitScheduler, optional) : Penjadwal yang digunakan. Defaultnya adalah GitScheduler().
+
+    Returns:
+        list: Daftar GitResult untuk setiap URL.
+    """
     if desc is None:
         desc = cprint("Cloning...", color="green", tqdm_desc=True)
 
-    results = {}  # Simpan pesan status clone
+    scheduler = scheduler or GitScheduler()
 
-    # Menggunakan ThreadPoolExecutor buat clone repositori secara paralel coyyy
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        futures = {executor.submit(clone_repos, url, cwd=cwd, directory=directory, branch=branch, commit_hash=commit_hash, recursive=recursive, quiet=quiet, batch=True): url for url in urls}
+    def clone(url):
+        name = urlparse(url).path.rstrip('/').split('/')[-1].replace('.git', '')
+        target = os.path.join(directory, name) if directory else None
+        return scheduler.clone(url, cwd=cwd, directory=target, branch=branch, commit_hash=commit_hash, recursive=recursive)
+
+    results = scheduler.map(clone, list(urls), desc=desc, quiet=quiet)
 
-        for future in tqdm(concurrent.futures.as_completed(futures), total=len(urls), desc=desc):
-            try:
-                results[future] = future.result()
-            except Exception as e:
-                cprint(f"Gagal kloning karena : {e}", color="flat_red")
-                return None
-            
     if not quiet:
-        if not any(message for message in results.values()):
-                cprint()
-        for future, message in results.items():
-            if message:
-                if "already exists" in message.lower():
-                    color = "yellow"
-                elif not any(item.lower() in message.lower() for item in ["failed", "error"]):
-                    color = "green"
-                else:
-                    color = "red"
-                cprint(" [-]", message, color=color)
-        cprint()
-
-def batch_update(repos, fetch=False, pull=True, origin=None, cwd=None, args="", quiet=False):
+        _print_results(results)
+
+    return results
+
+def batch_update(repos, fetch=False, pull=True, origin=None, cwd=None, args="", quiet=False, desc=None, scheduler=None):
     """
     Update Pararel Git repository.
     
     Args:
-        fetch       (bool, optional)        : Tandai untuk melakukan pengambilan. Defaultnya adalah Salah.
-        pull        (bool, optional)        : Tandai untuk melakukan tarikan. Defaultnya adalah Benar.
-        origin      (str, optional)         : Remote untuk memperbarui. Defaultnya adalah Tidak Ada.
-        directory   (str or list, optional) : Direktori atau direktori tempat repositori berada. Defaultnya adalah Tidak Ada.
-        args        (str, optional)         : Argumen tambahan untuk perintah git. Defaultnya adalah "".
-        quiet       (bool, optional)        : Tandai untuk menyembunyikan status pembaruan pencetakan. Defaultnya adalah Benar.
-        desc        (str, optional)         : Deskripsi untuk ditampilkan di bilah kemajuan. Defaultnya adalah "Memperbarui...".
+        repos       (str or list)            : Direktori induk berisi repositori, atau daftar direktori repositori.
+        fetch       (bool, optional)         : Tandai untuk melakukan pengambilan. Defaultnya adalah Salah.
+        pull        (bool, optional)         : Tandai untuk melakukan tarikan. Defaultnya adalah Benar.
+        origin      (str, optional)          : Remote untuk memperbarui. Defaultnya adalah Tidak Ada.
+        cwd         (str, optional)          : Direktori dasar untuk path relatif di `repos`. Defaultnya adalah Tidak Ada.
+        args        (str, optional)          : Argumen tambahan untuk perintah git. Defaultnya adalah "".
+        quiet       (bool, optional)         : Tandai untuk menyembunyikan status pembaruan pencetakan. Defaultnya adalah Salah.
+        desc        (str, optional)          : Deskripsi untuk ditampilkan di bilah kemajuan. Defaultnya adalah "Updating...".
+        scheduler   (GitScheduler, optional) : Penjadwal yang digunakan. Defaultnya adalah GitScheduler().
     
     Returns:
-        dict: Sebuah file yang berisi nama repositori dan status pembaruan.
+        list: Daftar GitResult untuk setiap repositori.
     """
-    if not isinstance(directory, list):
-        directory = [os.path.join(directory, name) for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name))]
+    if not isinstance(repos, list):
+        repos = [os.path.join(repos, name) for name in sorted(os.listdir(repos)) if os.path.isdir(os.path.join(repos, name, ".git"))]
+    if cwd:
+        repos = [os.path.join(cwd, repo) for repo in repos]
 
     if desc is None:
         desc = cprint("Updating...", color="green", tqdm_desc=True)
 
-    results = {}  # Simpan pesan status update
+    scheduler = scheduler or GitScheduler()
+    results = scheduler.map(lambda repo: scheduler.update(repo, fetch=fetch, pull=pull, origin=origin, args=args), repos, desc=desc, quiet=quiet)
 
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        futures = {executor.submit(update_repo, fetch=fetch, pull=pull, origin=origin, cwd=cwd, args=args, quiet=quiet, batch=True): cwd for cwd in directory}
-        for future in tqdm(concurrent.futures.as_completed(futures), total=len(directory), desc=desc):
-            try:
-                results[future] = future.result()  # Simpan pesan status pembaruan
-            except Exception as e:
-                cprint(f"Kesalahan saat memperbarui repositori: {e}", color="flat_red")
-                return None
-            
     if not quiet:
-        if not any(message for message in results.values()):
-                cprint()
-        for future, message in results.items():
-            if message:
-                if not any(item.lower() in message.lower() for item in ["gagal", "kesalahan"]):
-                    color = "green"
-                else:
-                    if "sudah ada" in message.lower():
-                        color = "yellow"
-                    else:
-                        color = "red"
-                cprint(f" [-]", message, color=color)
+        _print_results(results)
+
+    return results
     
 
 # ========================================================================================================
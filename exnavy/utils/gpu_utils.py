@@ -0,0 +1,327 @@
+import ctypes
+import subprocess
+import threading
+import time
+from collections import deque
+
+FIELDS = (
+    "index",
+    "name",
+    "uuid",
+    "utilization.gpu",
+    "utilization.memory",
+    "memory.total",
+    "memory.used",
+    "memory.free",
+    "temperature.gpu",
+    "power.draw",
+    "clocks.sm",
+)
+
+_TEXT_FIELDS = ("name", "uuid", "pci.bus_id", "driver_version")
+
+_QUERY_CACHE = {"time": 0.0, "fields": None, "samples": None}
+_QUERY_LOCK = threading.Lock()
+_TELEMETRY = None
+
+def _parse_value(field, value):
+    value = value.strip()
+    if field in _TEXT_FIELDS:
+        return value
+    if not value or value.startswith("[") or value == "N/A":
+        return None
+    try:
+        return int(value) if field == "index" else float(value)
+    except ValueError:
+        return value
+
+def _parse_line(line, fields, timestamp):
+    values = line.rstrip("\n").split(",")
+    if len(values) != len(fields):
+        return None
+    sample = {field: _parse_value(field, value) for field, value in zip(fields, values)}
+    sample["timestamp"] = timestamp
+    return sample
+
+def _nvidia_smi(fields, interval_ms=None):
+    cmd = ["nvidia-smi", f"--query-gpu={','.join(fields)}", "--format=csv,noheader,nounits"]
+    if interval_ms:
+        cmd.append(f"--loop-ms={int(interval_ms)}")
+    return cmd
+
+def query_gpus(fields=FIELDS, max_age=1.0):
+    """
+    Mengambil satu sampel untuk semua GPU dengan satu pemanggilan `nvidia-smi`.
+
+    Jika `GPUTelemetry` bersama sedang berjalan, sampel terakhirnya dipakai tanpa membuat proses
+    baru. Jika tidak, hasil query disimpan selama `max_age` detik.
+
+    Args:
+        fields (tuple, optional): Field `nvidia-smi --query-gpu`. Defaultnya adalah FIELDS.
+        max_age (float, optional): Umur maksimum hasil cache dalam detik. Defaultnya adalah 1.0.
+
+    Returns:
+        list: Satu dict per GPU, berurutan sesuai indeks.
+
+    Raises:
+        RuntimeError: Jika `nvidia-smi` tidak ada atau gagal.
+    """
+    fields = tuple(fields)
+    if _TELEMETRY is not None and _TELEMETRY.running and set(fields) <= set(_TELEMETRY.fields):
+        samples = _TELEMETRY.snapshot()
+        if samples:
+            return samples
+
+    with _QUERY_LOCK:
+        cached = _QUERY_CACHE["samples"]
+        if cached is not None and _QUERY_CACHE["fields"] == fields and time.time() - _QUERY_CACHE["time"] < max_age:
+            return [dict(sample) for sample in cached]
+
+        try:
+            result = subprocess.run(_nvidia_smi(fields), capture_output=True, text=True)
+        except FileNotFoundError:
+            raise RuntimeError("nvidia-smi tidak ditemukan.")
+        if result.returncode != 0:
+            raise RuntimeError((result.stderr or result.stdout).strip())
+
+        now = time.time()
+        samples = [sample for sample in (_parse_line(line, fields, now) for line in result.stdout.splitlines()) if sample]
+        _QUERY_CACHE.update(time=now, fields=fields, samples=samples)
+        return [dict(sample) for sample in samples]
+
+class _NVMLMemory(ctypes.Structure):
+    _fields_ = [("total", ctypes.c_ulonglong), ("free", ctypes.c_ulonglong), ("used", ctypes.c_ulonglong)]
+
+class _NVMLUtilization(ctypes.Structure):
+    _fields_ = [("gpu", ctypes.c_uint), ("memory", ctypes.c_uint)]
+
+class _NVML:
+    def __init__(self):
+        self.lib = ctypes.CDLL("libnvidia-ml.so.1")
+        self._check(self.lib.nvmlInit_v2())
+        count = ctypes.c_uint()
+        self._check(self.lib.nvmlDeviceGetCount_v2(ctypes.byref(count)))
+        self.handles = []
+        for index in range(count.value):
+            handle = ctypes.c_void_p()
+            self._check(self.lib.nvmlDeviceGetHandleByIndex_v2(index, ctypes.byref(handle)))
+            self.handles.append(handle)
+        self.static = [{"name": self._string(self.lib.nvmlDeviceGetName, handle),
+                        "uuid": self._string(self.lib.nvmlDeviceGetUUID, handle)} for handle in self.handles]
+
+    def _check(self, code):
+        if code != 0:
+            raise RuntimeError(f"NVML gagal dengan kode {code}")
+
+    def _string(self, func, handle):
+        buffer = ctypes.create_string_buffer(96)
+        return buffer.value.decode() if func(handle, buffer, len(buffer)) == 0 else None
+
+    def _uint(self, func, handle, *args):
+        value = ctypes.c_uint()
+        return value.value if func(handle, *args, ctypes.byref(value)) == 0 else None
+
+    def sample(self):
+        now = time.time()
+        samples = []
+        for index, handle in enumerate(self.handles):
+            memory = _NVMLMemory()
+            utilization = _NVMLUtilization()
+            has_memory = self.lib.nvmlDeviceGetMemoryInfo(handle, ctypes.byref(memory)) == 0
+            has_utilization = self.lib.nvmlDeviceGetUtilizationRates(handle, ctypes.byref(utilization)) == 0
+            power = self._uint(self.lib.nvmlDeviceGetPowerUsage, handle)
+            samples.append({
+                "index"             : index,
+                "name"              : self.static[index]["name"],
+                "uuid"              : self.static[index]["uuid"],
+                "utilization.gpu"   : float(utilization.gpu) if has_utilization else None,
+                "utilization.memory": float(utilization.memory) if has_utilization else None,
+                "memory.total"      : memory.total / 2**20 if has_memory else None,
+                "memory.used"       : memory.used / 2**20 if has_memory else None,
+                "memory.free"       : memory.free / 2**20 if has_memory else None,
+                "temperature.gpu"   : self._uint(self.lib.nvmlDeviceGetTemperature, handle, 0),
+                "power.draw"        : power / 1000 if power is not None else None,
+                "clocks.sm"         : self._uint(self.lib.nvmlDeviceGetClockInfo, handle, 1),
+                "timestamp"         : now,
+            })
+        return samples
+
+    def close(self):
+        self.lib.nvmlShutdown()
+
+class GPUTelemetry:
+    """
+    Sampler telemetri GPU di latar belakang.
+
+    Satu proses `nvidia-smi --query-gpu=... -lms <interval>` (atau NVML lewat ctypes jika tersedia)
+    dibaca oleh satu thread, dan sampelnya disimpan di ring buffer per GPU. `snapshot()` dan
+    `window()` hanya membaca buffer, jadi aman dipanggil sesering apa pun.
+
+    Contoh:
+        with GPUTelemetry(interval_ms=500) as telemetry:
+            ...
+            print(telemetry.window("memory.used", seconds=10))
+
+    Args:
+        interval_ms (int, optional): Interval sampling dalam milidetik. Defaultnya adalah 1000.
+        history (int, optional): Jumlah sampel yang disimpan per GPU. Defaultnya adalah 600.
+        backend (str, optional): "nvml", "nvidia-smi", atau Tidak Ada untuk memilih otomatis.
+    """
+    def __init__(self, interval_ms=1000, history=600, backend=None):
+        self.interval_ms = interval_ms
+        self.history = history
+        self.backend = backend
+        self.fields = FIELDS
+        self._buffers = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._process = None
+        self._nvml = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return self
+
+        self._stop.clear()
+        if self.backend in (None, "nvml"):
+            try:
+                self._nvml = _NVML()
+                self.backend = "nvml"
+            except (OSError, AttributeError, RuntimeError):
+                if self.backend == "nvml":
+                    raise
+                self._nvml = None
+
+        if self._nvml is not None:
+            target = self._poll_nvml
+        else:
+            self.backend = "nvidia-smi"
+            try:
+                self._process = subprocess.Popen(_nvidia_smi(self.fields, self.interval_ms), stdout=subprocess.PIPE,
+                                                 stderr=subprocess.DEVNULL, text=True, bufsize=1)
+            except FileNotFoundError:
+                raise RuntimeError("nvidia-smi tidak ditemukan.")
+            target = self._read_stream
+
+        self._thread = threading.Thread(target=target, name="exnavy-gpu-telemetry", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._nvml is not None:
+            self._nvml.close()
+            self._nvml = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _add(self, sample):
+        with self._lock:
+            buffer = self._buffers.get(sample["index"])
+            if buffer is None:
+                buffer = self._buffers[sample["index"]] = deque(maxlen=self.history)
+            buffer.append(sample)
+
+    def _poll_nvml(self):
+        while not self._stop.is_set():
+            for sample in self._nvml.sample():
+                self._add(sample)
+            self._stop.wait(self.interval_ms / 1000)
+
+    def _read_stream(self):
+        for line in self._process.stdout:
+            sample = _parse_line(line, self.fields, time.time())
+            if sample is not None and sample["index"] is not None:
+                self._add(sample)
+            if self._stop.is_set():
+                break
+
+    def wait(self, timeout=None):
+        """
+        Menunggu sampel pertama.
+
+        Returns:
+            bool: Benar jika sudah ada sampel.
+        """
+        deadline = time.time() + (timeout if timeout is not None else self.interval_ms / 1000 * 5 + 5)
+        while not self._buffers and time.time() < deadline and self.running:
+            time.sleep(0.01)
+        return bool(self._buffers)
+
+    def snapshot(self):
+        """
+        Mengambil sampel terakhir setiap GPU.
+
+        Returns:
+            list: Satu dict per GPU, berurutan sesuai indeks.
+        """
+        with self._lock:
+            return [dict(self._buffers[index][-1]) for index in sorted(self._buffers) if self._buffers[index]]
+
+    def samples(self, index=0, seconds=None):
+        """
+        Mengambil sampel satu GPU dari ring buffer.
+
+        Args:
+            index (int, optional): Indeks GPU. Defaultnya adalah 0.
+            seconds (float, optional): Hanya sampel dalam beberapa detik terakhir. Defaultnya adalah semua.
+
+        Returns:
+            list: Daftar sampel, dari yang terlama.
+        """
+        with self._lock:
+            samples = list(self._buffers.get(index, ()))
+        if seconds is not None:
+            since = time.time() - seconds
+            samples = [sample for sample in samples if sample["timestamp"] >= since]
+        return samples
+
+    def window(self, field, index=0, seconds=None):
+        """
+        Menghitung min/max/rata-rata satu field dalam jendela waktu.
+
+        Args:
+            field (str): Nama field, misalnya "memory.used" atau "utilization.gpu".
+            index (int, optional): Indeks GPU. Defaultnya adalah 0.
+            seconds (float, optional): Panjang jendela dalam detik. Defaultnya adalah semua sampel.
+
+        Returns:
+            dict: Kunci "min", "max", "avg", "last", dan "count". Nilainya Tidak Ada jika tidak ada sampel.
+        """
+        values = [sample[field] for sample in self.samples(index, seconds) if isinstance(sample.get(field), (int, float))]
+        if not values:
+            return {"min": None, "max": None, "avg": None, "last": None, "count": 0}
+        return {"min": min(values), "max": max(values), "avg": sum(values) / len(values), "last": values[-1], "count": len(values)}
+
+def get_telemetry(interval_ms=1000, history=600):
+    """
+    Mengambil `GPUTelemetry` bersama untuk proses ini dan memulainya jika belum berjalan.
+
+    Returns:
+        GPUTelemetry: Sampler yang sedang berjalan.
+    """
+    global _TELEMETRY
+    if _TELEMETRY is None:
+        _TELEMETRY = GPUTelemetry(interval_ms=interval_ms, history=history)
+    if not _TELEMETRY.running:
+        _TELEMETRY.start()
+    return _TELEMETRY
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+from .py_utils import get_cache_dir
+from .trace_utils import traced
+from ..colortes import cprint
+
+POOL_SIZE = 16
+CHUNK_SIZE = 1 << 16
+_CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+def get_session():
+    """
+    Mengambil `requests.Session` bersama dengan connection pool, agar koneksi TLS ke host yang sama dipakai ulang.
+
+    Returns:
+        requests.Session: Session bersama untuk proses ini.
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _SESSION = session
+    return _SESSION
+
+def _cache_paths(url, cache_dir):
+    name = os.path.basename(urlparse(url).path) or "index"
+    body_path = os.path.join(cache_dir, f"{hashlib.sha256(url.encode()).hexdigest()[:16]}-{name}")
+    return body_path, body_path + ".json"
+
+def _write_atomic(path, chunks):
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+@traced("http.cached_fetch", category="http", record=lambda result, url, *args, **kwargs: {"url": url, "bytes": os.path.getsize(result)})
+def cached_fetch(url, headers=None, ttl=0, cache_dir=None, stale_if_error=True, timeout=30, quiet=False):
+    """
+    Mengunduh objek kecil (config, skrip, patch) ke cache lokal dengan validasi ulang ETag/Last-Modified.
+
+    Jika salinan di cache lebih muda dari `ttl` detik, tidak ada request sama sekali. Jika tidak,
+    request kondisional dikirim dan respons 304 hanya memperbarui waktu validasi. Jika server tidak
+    bisa dihubungi dan `stale_if_error` aktif, salinan lama di cache tetap dikembalikan.
+
+    Args:
+        url (str): URL yang diunduh.
+        headers (dict, optional): Header tambahan; If-None-Match/If-Modified-Since diatur oleh cache. Defaultnya adalah Tidak Ada.
+        ttl (float, optional): Lama salinan cache dianggap segar, dalam detik. Defaultnya adalah 0.
+        cache_dir (str, optional): Direktori cache. Defaultnya adalah cache exnavy "http".
+        stale_if_error (bool, optional): Pakai salinan lama jika request gagal. Defaultnya adalah Benar.
+        timeout (float, optional): Timeout request dalam detik. Defaultnya adalah 30.
+        quiet (bool, optional): Sembunyikan peringatan. Defaultnya adalah Salah.
+
+    Returns:
+        str: Path file di cache.
+
+    Raises:
+        requests.RequestException: Jika request gagal dan tidak ada salinan di cache.
+    """
+    cache_dir = cache_dir or get_cache_dir("http")
+    os.makedirs(cache_dir, exist_ok=True)
+    body_path, meta_path = _cache_paths(url, cache_dir)
+
+    meta = {}
+    if os.path.exists(body_path) and os.path.exists(meta_path):
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+        except ValueError:
+            meta = {}
+
+    if meta and ttl and time.time() - meta.get("validated", 0) < ttl:
+        return body_path
+
+    request_headers = {key: value for key, value in (headers or {}).items() if key.lower() not in _CONDITIONAL_HEADERS}
+    conditional_headers = dict(request_headers)
+    if meta.get("etag"):
+        conditional_headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        conditional_headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = get_session().get(url, headers=conditional_headers, timeout=timeout, stream=True)
+        if response.status_code == 304 and not meta:
+            # 304 tanpa salinan di cache tidak punya isi; ulangi tanpa header kondisional.
+            response.close()
+            response = get_session().get(url, headers=request_headers, timeout=timeout, stream=True)
+        with response:
+            if response.status_code == 304 and meta:
+                meta["validated"] = time.time()
+            else:
+                response.raise_for_status()
+                if response.status_code == 304:
+                    raise requests.HTTPError(f"304 Not Modified tanpa salinan di cache: {url}", response=response)
+                _write_atomic(body_path, response.iter_content(chunk_size=CHUNK_SIZE))
+                meta = {
+                    "url"          : url,
+                    "etag"         : response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "validated"    : time.time(),
+                }
+    except requests.RequestException as e:
+        if meta and stale_if_error:
+            if not quiet:
+                cprint(f"Gagal memvalidasi {url}, memakai salinan dari cache. Kesalahan: {str(e)}", color="yellow")
+            return body_path
+        raise
+
+    _write_atomic(meta_path, [json.dumps(meta).encode()])
+    return body_path
+
+def cached_get(url, headers=None, ttl=0, cache_dir=None, stale_if_error=True, timeout=30, quiet=False):
+    """
+    Sama seperti `cached_fetch`, tetapi mengembalikan isi file.
+
+    Returns:
+        bytes: Isi respons dari cache.
+    """
+    path = cached_fetch(url, headers=headers, ttl=ttl, cache_dir=cache_dir, stale_if_error=stale_if_error, timeout=timeout, quiet=quiet)
+    with open(path, "rb") as f:
+        return f.read()
@@ -1,19 +1,325 @@
 import subprocess
 import os
+import io
+import hashlib
+import heapq
+import importlib.util
+import json
+import mmap
+import queue
+import struct
+import tarfile
+import tempfile
+import threading
 import zipfile
+import zlib
 import rarfile
 import shutil
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from tqdm import tqdm
+from urllib.parse import urlparse, unquote
+from .http_cache import get_session
+from .py_utils import get_cache_dir
+from .trace_utils import traced
 from ..colortes import cprint
 
-def extract_package(package_name, target_directory, overwrite=False):
+COPY_BUFFER_SIZE = 1024 * 1024
+PREALLOCATE_THRESHOLD = 16 * 1024 * 1024
+
+def _trace_archive(result, package_name, *args, **kwargs):
+    if isinstance(package_name, str):
+        return {"archive": os.path.basename(package_name), "bytes": os.path.getsize(package_name)}
+
+def _member_path(target_directory, name):
+    """
+    Mengubah nama member arsip menjadi path aman di dalam `target_directory`,
+    dengan aturan yang sama seperti `zipfile.ZipFile.extract`.
+    """
+    name = name.replace("\\", "/")
+    parts = [part for part in os.path.splitdrive(name)[1].split("/") if part not in ("", ".", "..")]
+    return os.path.join(target_directory, *parts) if parts else None
+
+def _zip_member_unchanged(info, target):
+    """
+    Memeriksa apakah file di disk sama dengan member zip (ukuran dan CRC32).
+    """
+    try:
+        if os.path.getsize(target) != info.file_size:
+            return False
+        crc = 0
+        with open(target, 'rb') as f:
+            for chunk in iter(lambda: f.read(COPY_BUFFER_SIZE), b""):
+                crc = zlib.crc32(chunk, crc)
+        return crc == info.CRC
+    except OSError:
+        return False
+
+def _write_zip_members(zip_path, members, workers=None, skip_unchanged=False):
+    """
+    Menulis member zip ke path tujuan secara paralel.
+
+    Member dibagi ke beberapa worker berdasarkan ukuran; setiap worker membuka `ZipFile` sendiri,
+    karena dekompresi zlib melepas GIL. Direktori dibuat sekali di awal dan file besar
+    dialokasikan terlebih dahulu.
+
+    Args:
+        zip_path (str, file, or callable): Path file zip, file object, atau fungsi yang membuka file object baru untuk setiap worker.
+        members (list): Daftar pasangan (ZipInfo, path tujuan).
+        workers (int, optional): Jumlah worker. Defaultnya adalah jumlah CPU.
+        skip_unchanged (bool, optional): Lewati file yang ukuran dan CRC32-nya sudah sama. Defaultnya adalah Salah.
+    """
+    for directory in sorted({os.path.dirname(target) for _, target in members}):
+        os.makedirs(directory, exist_ok=True)
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(members)))
+    batches = [[] for _ in range(workers)]
+    loads = [(0, index) for index in range(workers)]
+    for info, target in sorted(members, key=lambda member: member[0].file_size, reverse=True):
+        load, index = heapq.heappop(loads)
+        batches[index].append((info, target))
+        heapq.heappush(loads, (load + info.file_size + 4096, index))
+
+    def extract(batch):
+        fileobj = zip_path() if callable(zip_path) else zip_path
+        try:
+            with zipfile.ZipFile(fileobj, 'r') as zip_ref:
+                for info, target in batch:
+                    if skip_unchanged and _zip_member_unchanged(info, target):
+                        continue
+                    with zip_ref.open(info) as source, open(target, 'wb') as destination:
+                        if info.file_size >= PREALLOCATE_THRESHOLD:
+                            if hasattr(os, "posix_fallocate"):
+                                os.posix_fallocate(destination.fileno(), 0, info.file_size)
+                            else:
+                                destination.truncate(info.file_size)
+                        shutil.copyfileobj(source, destination, COPY_BUFFER_SIZE)
+        finally:
+            if callable(zip_path):
+                fileobj.close()
+
+    if workers == 1:
+        extract(batches[0])
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(extract, batch) for batch in batches if batch]:
+            future.result()
+
+@traced("extract.zip", category="extract", record=_trace_archive)
+def parallel_extract_zip(zip_path, target_directory, workers=None, skip_unchanged=False):
     """
-    Mengekstrak sebuah paket. Paketnya bisa dalam format tar, lz4, rar, atau zip.
+    Mengekstrak file zip dengan beberapa thread. Hasilnya sama dengan `ZipFile.extractall`.
+
+    Args:
+        zip_path (str, file, or callable): Path file zip, file object, atau fungsi pembuka file object.
+        target_directory (str): Direktori tujuan.
+        workers (int, optional): Jumlah worker. Defaultnya adalah jumlah CPU.
+        skip_unchanged (bool, optional): Lewati file yang ukuran dan CRC32-nya sudah sama. Defaultnya adalah Salah.
+    """
+    fileobj = zip_path() if callable(zip_path) else zip_path
+    try:
+        with zipfile.ZipFile(fileobj, 'r') as zip_ref:
+            infolist = zip_ref.infolist()
+    finally:
+        if callable(zip_path):
+            fileobj.close()
+
+    members = []
+    for info in infolist:
+        target = _member_path(target_directory, info.filename)
+        if target is None:
+            continue
+        if info.is_dir():
+            os.makedirs(target, exist_ok=True)
+        else:
+            members.append((info, target))
+
+    _write_zip_members(zip_path, members, workers=workers, skip_unchanged=skip_unchanged)
+
+class _ThreadedReader(io.RawIOBase):
+    """
+    Membaca stream di thread latar belakang ke antrian terbatas, sehingga dekompresi
+    berjalan bersamaan dengan parsing tar dan penulisan file di thread pemanggil.
+    """
+
+    def __init__(self, reader, chunk_size=COPY_BUFFER_SIZE, depth=8):
+        self._queue = queue.Queue(maxsize=depth)
+        self._chunk = memoryview(b"")
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._fill, args=(reader, chunk_size), daemon=True)
+        self._thread.start()
+
+    def _fill(self, reader, chunk_size):
+        try:
+            while not self._closed.is_set():
+                data = reader.read(chunk_size)
+                self._queue.put(data)
+                if not data:
+                    return
+        except Exception as e:
+            self._queue.put(e)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self._chunk:
+            data = self._queue.get()
+            if isinstance(data, Exception):
+                raise data
+            if not data:
+                self._queue.put(data)
+                return 0
+            self._chunk = memoryview(data)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+    def close(self):
+        self._closed.set()
+        while self._thread.is_alive():
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                self._thread.join(0.01)
+        super().close()
+
+def _has_decompressor(compression):
+    module = {"zst": "zstandard", "lz4": "lz4"}.get(compression)
+    return module is not None and importlib.util.find_spec(module) is not None
+
+@contextmanager
+def _decompressed(fileobj, compression):
+    """
+    Membungkus stream terkompresi zstd/lz4 menjadi stream tar mentah.
+
+    Memakai modul `zstandard`/`lz4` jika terpasang, dengan dekompresi di thread terpisah dari
+    penulisan member. Jika tidak, memakai CLI `zstd`/`lz4` dengan thread pengumpan.
+    """
+    if compression is None:
+        yield fileobj
+        return
+
+    if _has_decompressor(compression):
+        if compression == "zst":
+            import zstandard
+            reader = zstandard.ZstdDecompressor().stream_reader(fileobj, read_size=COPY_BUFFER_SIZE, closefd=False)
+        else:
+            import lz4.frame
+            reader = lz4.frame.LZ4FrameFile(fileobj, "rb")
+        with reader, _ThreadedReader(reader) as threaded:
+            yield threaded
+        return
+
+    process = subprocess.Popen(["zstd" if compression == "zst" else "lz4", "-dc"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def feed():
+        try:
+            shutil.copyfileobj(fileobj, process.stdin, COPY_BUFFER_SIZE)
+        except (BrokenPipeError, OSError):
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    try:
+        yield process.stdout
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+        feeder.join()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, process.args)
+
+def _tar_compression(name):
+    if name.endswith(".tar.zst"):
+        return "zst"
+    if name.endswith(".tar.lz4"):
+        return "lz4"
+    return None
+
+def _extract_tar_stream(fileobj, target_directory, overwrite=False, skip_unchanged=False):
+    """
+    Mengekstrak tar dari stream non-seekable, member demi member.
+
+    File yang sudah ada selalu ditimpa, seperti `tar -x`. Dengan `overwrite`, path yang sudah ada
+    dengan jenis berbeda (misalnya direktori di tempat file) juga dihapus dan diganti. Dengan
+    `skip_unchanged`, file yang ukuran dan mtime-nya sama dengan member dilewati.
+    """
+    with tarfile.open(fileobj=fileobj, mode="r|*") as tar:
+        for member in tar:
+            target = _member_path(target_directory, member.name)
+            if skip_unchanged and member.isfile() and target:
+                try:
+                    stat = os.stat(target)
+                    if stat.st_size == member.size and int(stat.st_mtime) == int(member.mtime):
+                        continue
+                except OSError:
+                    pass
+            if overwrite and target and os.path.lexists(target):
+                is_dir = os.path.isdir(target) and not os.path.islink(target)
+                if is_dir and not member.isdir():
+                    shutil.rmtree(target)
+                elif not is_dir and member.isdir():
+                    os.remove(target)
+            if hasattr(tarfile, "data_filter"):
+                tar.extract(member, target_directory, filter="data")
+            elif _member_path(target_directory, member.name) and not member.name.startswith("/") and ".." not in member.name.split("/"):
+                tar.extract(member, target_directory)
+
+def _extract_marker(package_name, target_directory):
+    key = hashlib.sha256(f"{os.path.abspath(package_name)}\0{os.path.abspath(target_directory)}".encode()).hexdigest()[:16]
+    return os.path.join(get_cache_dir("extract"), f"{key}-{os.path.basename(package_name)}.json")
+
+def _read_marker(marker):
+    try:
+        with open(marker, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_marker(marker, state):
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=os.path.dirname(marker))
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, marker)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _archive_state(package_name):
+    stat = os.stat(package_name)
+    return {"archive": os.path.abspath(package_name), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "complete": True}
+
+@traced("extract", category="extract", record=_trace_archive)
+def extract_package(package_name, target_directory, overwrite=False, workers=None, desc=None, quiet=False, incremental=False):
+    """
+    Mengekstrak sebuah paket. Paketnya bisa dalam format tar (gz, lz4, zst), rar, atau zip.
+
+    Tar diekstrak di dalam proses (lz4/zst memerlukan modul `lz4`/`zstandard`, jika tidak ada
+    memakai perintah `tar`). RAR memakai `unrar` atau `7z` jika terpasang, jika tidak memakai `rarfile`.
+
+    Setelah berhasil, file penanda ditulis di cache exnavy "extract", per paket dan direktori tujuan,
+    dan dihapus saat ekstraksi dimulai lagi. Dengan `incremental`, setiap member dicocokkan dengan
+    file di disk dan hanya member yang berubah atau belum ada yang ditulis: zip dengan ukuran dan
+    CRC32 dari central directory, tar dengan ukuran dan mtime.
 
     Args:
         package_name (str): Nama file paket.
         target_directory (str): Direktori dimana paket akan diekstraksi.
-        overwrite (bool, optional): Apakah akan menimpa direktori jika sudah ada. Defaultnya adalah Salah.
+        overwrite (bool, optional): Apakah akan mengganti path yang sudah ada dengan jenis berbeda (file/direktori). Defaultnya adalah Salah.
+        workers (int, optional): Jumlah thread untuk ekstraksi zip. Defaultnya adalah jumlah CPU.
+        desc (str, optional): Deskripsi untuk tqdm. Defaultnya adalah Tidak Ada.
+        quiet (bool, optional): Sembunyikan bilah kemajuan. Defaultnya adalah Salah.
+        incremental (bool, optional): Lewati member yang tidak berubah. Defaultnya adalah Salah.
 
     Raises:
         subprocess.CalledProcessError: Jika proses ekstraksi gagal.
@@ -25,8 +331,27 @@ def extract_package(package_name, target_directory, overwrite=False):
     if not os.path.exists(target_directory):
         os.makedirs(target_directory)
 
-    if package_name.endswith(".tar.lz4"):
-        tar_args = ["tar", "-xI", "lz4", "-f", package_name, "--directory", target_directory]
+    # Penanda hanya mencatat bahwa ekstraksi terakhir selesai; member tetap dicocokkan dengan isi
+    # disk karena file hasil ekstraksi bisa diubah atau dihapus setelahnya.
+    marker = _extract_marker(package_name, target_directory)
+    if incremental and not quiet and _read_marker(marker) == _archive_state(package_name):
+        cprint(f"Paket {os.path.basename(package_name)} pernah diekstrak lengkap, hanya member yang berubah atau hilang yang ditulis.", color="green")
+    if os.path.exists(marker):
+        os.remove(marker)
+
+    compression = _tar_compression(package_name)
+    is_tar = package_name.endswith((".tar.lz4", ".tar.zst", ".tar.gz", ".tgz", ".tar"))
+
+    if is_tar and (compression is None or _has_decompressor(compression)):
+        try:
+            with open(package_name, "rb") as f, tqdm.wrapattr(f, "read", total=os.path.getsize(package_name), desc=desc, disable=quiet) as progress:
+                with _decompressed(progress, compression) as stream:
+                    _extract_tar_stream(stream, target_directory, overwrite=overwrite, skip_unchanged=incremental)
+        except Exception as e:
+            cprint(f"Ekstraksi paket gagal karena kesalahan: {str(e)}", color="flat_red")
+            raise e
+    elif is_tar:
+        tar_args = ["tar", "-xI", "lz4" if package_name.endswith(".tar.lz4") else "zstd", "-f", package_name, "--directory", target_directory]
         if overwrite:
             tar_args.append("--overwrite-dir")
 
@@ -37,19 +362,329 @@ def extract_package(package_name, target_directory, overwrite=False):
             raise e
     elif package_name.endswith(".zip"):
         try:
-            with zipfile.ZipFile(package_name, 'r') as zip_ref:
-                zip_ref.extractall(target_directory)
+            parallel_extract_zip(package_name, target_directory, workers=workers, skip_unchanged=incremental)
         except Exception as e:
             cprint(f"Ekstraksi paket gagal karena kesalahan: {str(e)}", color="flat_red")
+            return
     elif package_name.endswith(".rar"):
         try:
-            with rarfile.RarFile(package_name, 'r') as rar_ref:
-                rar_ref.extractall(target_directory)
+            if shutil.which("unrar"):
+                subprocess.check_output(["unrar", "x", "-o+", "-idq", package_name, os.path.join(target_directory, "")], stderr=subprocess.STDOUT)
+            elif shutil.which("7z"):
+                subprocess.check_output(["7z", "x", "-y", "-mmt=on", f"-o{target_directory}", package_name], stderr=subprocess.STDOUT)
+            else:
+                with rarfile.RarFile(package_name, 'r') as rar_ref:
+                    rar_ref.extractall(target_directory)
         except Exception as e:
             cprint(f"Ekstraksi paket gagal karena kesalahan: {str(e)}", color="flat_red")
+            return
     else:
         cprint(f"Format paket tidak didukung.: {package_name}", color="flat_red")
+        return
+
+    _write_marker(marker, _archive_state(package_name))
+
+class _HTTPRangeFile(io.RawIOBase):
+    """
+    File object read-only di atas HTTP Range request.
+
+    Pembacaan berurutan memakai satu respons streaming; seek ke posisi lain membuka request baru.
+    """
+
+    def __init__(self, url, size, headers=None):
+        self.url = url
+        self.size = size
+        self.headers = headers or {}
+        self.session = get_session()
+        self._pos = 0
+        self._response = None
+        self._stream_pos = None
+
+    def readable(self):
+        return True
 
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def _close_stream(self):
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
+    def readinto(self, buffer):
+        if self._pos >= self.size:
+            return 0
+        if self._response is None or self._stream_pos != self._pos:
+            self._close_stream()
+            headers = dict(self.headers, Range=f"bytes={self._pos}-")
+            self._response = self.session.get(self.url, headers=headers, stream=True, timeout=60)
+            self._response.raise_for_status()
+            if self._response.status_code != 206:
+                raise IOError(f"Server tidak mendukung Range request: {self.url}")
+            self._stream_pos = self._pos
+        data = self._response.raw.read(min(len(buffer), self.size - self._pos))
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        self._stream_pos = self._pos
+        return len(data)
+
+    def close(self):
+        self._close_stream()
+        super().close()
+
+@traced("extract.stream", category="extract", record=lambda result, url, *args, **kwargs: {"url": url, "archive": result})
+def stream_extract(url, target_directory, filename=None, user_header=None, workers=None, spool_size=64 * 1024 * 1024):
+    """
+    Mengunduh dan mengekstrak paket sekaligus tanpa menyimpan arsipnya ke disk.
+
+    Arsip tar (gz, lz4, zst) didekompresi dan ditulis member demi member saat data tiba. Untuk zip,
+    central directory dan member dibaca dengan HTTP Range request (member diekstrak paralel);
+    jika server tidak mendukung Range, respons ditampung di SpooledTemporaryFile terlebih dahulu.
+    Format lain diunduh ke file sementara lalu diekstrak dengan `extract_package`.
+
+    Args:
+        url (str): URL paket.
+        target_directory (str): Direktori tujuan.
+        filename (str, optional): Nama file untuk menentukan format. Defaultnya dari header atau URL.
+        user_header (str, optional): Header Authorization. Defaultnya adalah Tidak Ada.
+        workers (int, optional): Jumlah thread untuk ekstraksi zip. Defaultnya adalah jumlah CPU.
+        spool_size (int, optional): Batas buffer memori sebelum zip tanpa Range ditulis ke disk sementara.
+
+    Returns:
+        str: Nama file paket.
+    """
+    headers = {"Authorization": user_header} if user_header else {}
+    os.makedirs(target_directory, exist_ok=True)
+
+    session = get_session()
+    head = session.head(url, headers=headers, allow_redirects=True, timeout=60)
+    head.raise_for_status()
+    final_url = head.url
+
+    if not filename:
+        disposition = head.headers.get("content-disposition", "")
+        if "filename=" in disposition:
+            filename = disposition.split("filename=")[-1].strip('"; ')
+        else:
+            filename = unquote(os.path.basename(urlparse(final_url).path))
+
+    size = int(head.headers.get("content-length") or 0)
+    accepts_ranges = head.headers.get("accept-ranges", "").lower() == "bytes" and size > 0
+
+    try:
+        if filename.endswith(".zip") and accepts_ranges:
+            opener = lambda: io.BufferedReader(_HTTPRangeFile(final_url, size, headers), COPY_BUFFER_SIZE)
+            parallel_extract_zip(opener, target_directory, workers=workers)
+            return filename
+
+        with session.get(final_url, headers=headers, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            response.raw.decode_content = False
+
+            if filename.endswith((".tar", ".tar.gz", ".tgz", ".tar.lz4", ".tar.zst")):
+                with _decompressed(response.raw, _tar_compression(filename)) as stream:
+                    _extract_tar_stream(stream, target_directory)
+
+            elif filename.endswith(".zip"):
+                with tempfile.SpooledTemporaryFile(max_size=spool_size) as spool:
+                    shutil.copyfileobj(response.raw, spool, COPY_BUFFER_SIZE)
+                    parallel_extract_zip(spool, target_directory, workers=1)
+
+            else:
+                with tempfile.TemporaryDirectory() as tmp:
+                    package_name = os.path.join(tmp, filename)
+                    with open(package_name, "wb") as f:
+                        shutil.copyfileobj(response.raw, f, COPY_BUFFER_SIZE)
+                    extract_package(package_name, target_directory, workers=workers)
+
+    except Exception as e:
+        cprint(f"Ekstraksi paket gagal karena kesalahan: {str(e)}", color="flat_red")
+        raise e
+
+    return filename
+
+class ZipMemberView(io.RawIOBase):
+    """
+    View read-only berbasis mmap atas member zip yang tidak dikompresi (`ZIP_STORED`).
+
+    Data member dibaca langsung dari arsip pada offset datanya tanpa diekstrak. `buffer()`
+    mengembalikan memoryview tanpa salinan, misalnya untuk header dan tensor safetensors.
+
+    Args:
+        zip_path (str): Path file zip.
+        member (str or ZipInfo): Nama member atau ZipInfo.
+
+    Raises:
+        ValueError: Jika member dikompresi atau dienkripsi.
+    """
+
+    def __init__(self, zip_path, member):
+        super().__init__()
+        self._mmap = None
+        self._pos = 0
+
+        with open(zip_path, 'rb') as f:
+            with zipfile.ZipFile(f, 'r') as zip_ref:
+                info = member if isinstance(member, zipfile.ZipInfo) else zip_ref.getinfo(member)
+
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Member '{info.filename}' dikompresi, gunakan extract_package.")
+            if info.flag_bits & 0x1:
+                raise ValueError(f"Member '{info.filename}' dienkripsi.")
+
+            f.seek(info.header_offset)
+            header = f.read(30)
+            if header[:4] != b"PK\x03\x04":
+                raise zipfile.BadZipFile(f"Local header tidak valid untuk '{info.filename}'.")
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+
+            self.info = info
+            self.offset = info.header_offset + 30 + name_length + extra_length
+            self.size = info.file_size
+
+            if self.size:
+                aligned = self.offset - self.offset % mmap.ALLOCATIONGRANULARITY
+                self._mmap = mmap.mmap(f.fileno(), self.offset - aligned + self.size, access=mmap.ACCESS_READ, offset=aligned)
+                self._view = memoryview(self._mmap)[self.offset - aligned:]
+            else:
+                self._view = memoryview(b"")
+
+    def buffer(self):
+        """
+        Returns:
+            memoryview: Data member tanpa salinan. Slice yang masih dipegang setelah `close()` tetap
+                valid; mmap-nya baru ditutup saat slice terakhir dilepas.
+        """
+        return self._view
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def readinto(self, buffer):
+        data = self._view[self._pos:self._pos + len(buffer)]
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            try:
+                self._view.release()
+                if self._mmap is not None:
+                    self._mmap.close()
+            except BufferError:
+                # Masih ada slice dari `buffer()` yang dipakai pemanggil; mmap ditutup oleh GC
+                # setelah referensi terakhir ke slice tersebut hilang.
+                pass
+            self._view = memoryview(b"")
+            self._mmap = None
+        super().close()
+
+def stored_members(zip_path):
+    """
+    Mengambil daftar member zip yang disimpan tanpa kompresi dan bisa dibuka dengan `open_stored_member`.
+
+    Args:
+        zip_path (str): Path file zip.
+
+    Returns:
+        list: Daftar nama member.
+    """
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        return [info.filename for info in zip_ref.infolist() if not info.is_dir() and info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1]
+
+def open_stored_member(zip_path, member):
+    """
+    Membuka member zip `ZIP_STORED` sebagai file read-only tanpa mengekstraknya.
+
+    Contoh:
+        >>> with open_stored_member("models.zip", "model.safetensors") as f:
+        ...     header_size = struct.unpack("<Q", f.read(8))[0]
+        ...     header = json.loads(f.read(header_size))
+
+    Args:
+        zip_path (str): Path file zip.
+        member (str or ZipInfo): Nama member atau ZipInfo.
+
+    Returns:
+        ZipMemberView: View read-only atas data member.
+    """
+    return ZipMemberView(zip_path, member)
+
+def _nested_zip_layout(infolist, extract_to):
+    """
+    Menentukan path tujuan setiap file untuk `nested_zip_extractor`.
+
+    Jumlah file disimpan per direktori (trie yang diratakan menjadi dict path -> jumlah), lalu
+    dijumlahkan ke leluhurnya sekali per direktori unik, bukan per file. Setiap file ditempatkan
+    mulai dari direktori leluhur terdalam yang berisi lebih dari satu file (atau direktori teratas),
+    dan file di root arsip dilewati. Hasil per direktori di-cache.
+
+    Args:
+        infolist (list): Daftar ZipInfo.
+        extract_to (str): Direktori tujuan.
+
+    Yields:
+        tuple: Pasangan (ZipInfo, path tujuan).
+    """
+    direct = {}
+    for info in infolist:
+        if not info.filename.endswith('/'):
+            directory = info.filename.rpartition('/')[0]
+            direct[directory] = direct.get(directory, 0) + 1
+    direct.pop('', None)
+
+    totals = {}
+    for directory, count in direct.items():
+        while directory:
+            totals[directory] = totals.get(directory, 0) + count
+            directory = directory.rpartition('/')[0]
+
+    if len(totals) == 1:
+        extract_to = os.path.join(extract_to, next(iter(totals)))
+
+    targets = {}
+    for info in infolist:
+        directory, _, base = info.filename.rpartition('/')
+        if not directory or base in ('', '.', '..'):
+            continue
+
+        target_directory = targets.get(directory)
+        if target_directory is None:
+            parts = directory.split('/')
+            anchor, prefix = len(parts), directory
+            while anchor > 1 and totals[prefix] <= 1:
+                anchor, prefix = anchor - 1, prefix.rpartition('/')[0]
+            target_directory = targets[directory] = os.path.join(extract_to, *[part for part in parts[anchor - 1:] if part not in ('', '.', '..')])
+
+        yield info, os.path.join(target_directory, base)
+
+@traced("extract.nested_zip", category="extract", record=_trace_archive)
 def nested_zip_extractor(zip_path, extract_to):
     """
     Fungsi ini mengekstrak file dari file zip, mempertahankan struktur direktori bersarang.
@@ -61,28 +696,16 @@ def nested_zip_extractor(zip_path, extract_to):
 
     try:
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            dir_map = defaultdict(list)
-            for name in zip_ref.namelist():
-                if not name.endswith('/'):
-                    parts = name.split('/')
-                    for i in range(1, len(parts)):
-                        dir_map['/'.join(parts[:i])].append(name)
-
-            subfolders = [folder for folder in dir_map.keys() if len(dir_map[folder]) > 0]
-            if len(subfolders) == 1:
-                extract_to = os.path.join(extract_to, subfolders[0])
-
-            for member in zip_ref.infolist():
-                if not member.is_dir():
-                    parts = member.filename.split('/')
-                    for i in range(len(parts) - 1, 0, -1):
-                        directory = '/'.join(parts[:i])
-                        if len(dir_map[directory]) > 1 or i == 1:
-                            target_path = os.path.join(extract_to, *parts[i-1:])
-                            os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                            with zip_ref.open(member) as source, open(target_path, 'wb') as target:
-                                shutil.copyfileobj(source, target)
-                            break
+            layout = _nested_zip_layout(zip_ref.infolist(), extract_to)
+
+            created = set()
+            for info, target in layout:
+                directory = os.path.dirname(target)
+                if directory not in created:
+                    os.makedirs(directory, exist_ok=True)
+                    created.add(directory)
+                with zip_ref.open(info) as source, open(target, 'wb') as destination:
+                    shutil.copyfileobj(source, destination, COPY_BUFFER_SIZE)
 
     except FileNotFoundError:
         cprint(f"File {zip_path} tidak ada.", color="flat_red")
@@ -90,4 +713,3 @@ def nested_zip_extractor(zip_path, extract_to):
         cprint(f"Izin ditolak untuk membuat direktori atau file.", color="flat_red")
     except Exception as e:
         cprint(f"Terjadi kesalahan: {str(e)}", color="flat_red")
-    
\ No newline at end of file
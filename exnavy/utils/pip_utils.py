@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+from .py_utils import get_cache_dir
+from ..colortes import cprint
+
+REQUIREMENT_FILES = ("requirements.txt",)
+
+_REQUIREMENT_RE = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)\s*(\[[^\]]*\])?\s*(.*)$")
+_OPTION_ARGS = ("--index-url", "-i", "--extra-index-url", "--find-links", "-f", "--trusted-host", "--constraint", "-c")
+
+def canonical_name(name):
+    """
+    Menormalkan nama paket sesuai PEP 503.
+
+    Args:
+        name (str): Nama paket.
+
+    Returns:
+        str: Nama paket yang dinormalkan.
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def find_requirement_files(repos):
+    """
+    Mencari file requirements di setiap repositori.
+
+    Args:
+        repos (str or list): Direktori induk berisi repositori, atau daftar direktori repositori.
+
+    Returns:
+        tuple: Daftar file requirements dan daftar file install.py yang ditemukan.
+    """
+    if not isinstance(repos, list):
+        repos = [os.path.join(repos, name) for name in sorted(os.listdir(repos)) if os.path.isdir(os.path.join(repos, name))]
+
+    requirement_files = []
+    install_scripts = []
+    for repo in repos:
+        for name in REQUIREMENT_FILES:
+            if os.path.isfile(os.path.join(repo, name)):
+                requirement_files.append(os.path.join(repo, name))
+        if os.path.isfile(os.path.join(repo, "install.py")):
+            install_scripts.append(os.path.join(repo, "install.py"))
+
+    return requirement_files, install_scripts
+
+def parse_requirements(filename, _seen=None):
+    """
+    Membaca file requirements, termasuk file yang disertakan dengan `-r`.
+
+    Path lokal (`-e ./pkg`, `-f ./wheels`, `-c constraints.txt`) dijadikan absolut terhadap lokasi file.
+
+    Args:
+        filename (str): Path file requirements.
+
+    Returns:
+        list: Daftar baris requirement atau opsi pip.
+    """
+    _seen = _seen if _seen is not None else set()
+    filename = os.path.abspath(filename)
+    if filename in _seen:
+        return []
+    _seen.add(filename)
+
+    base = os.path.dirname(filename)
+    lines = []
+    with open(filename, "r", encoding="utf-8") as f:
+        for raw in f:
+            line = re.sub(r"(^|\s)#.*$", "", raw).strip()
+            if not line:
+                continue
+
+            option, _, value = line.partition(" ") if line.startswith("-") else ("", "", line)
+            if "=" in option and option.startswith("--"):
+                option, _, value = option.partition("=")
+            value = value.strip()
+
+            if option in ("-r", "--requirement"):
+                lines.extend(parse_requirements(os.path.join(base, value), _seen))
+            elif option in ("-e", "--editable", "-f", "--find-links", "-c", "--constraint") and value.startswith("."):
+                lines.append(f"{option} {os.path.normpath(os.path.join(base, value))}")
+            elif option:
+                lines.append(f"{option} {value}".strip())
+            elif value.startswith("."):
+                lines.append(os.path.normpath(os.path.join(base, value)))
+            else:
+                lines.append(value)
+
+    return lines
+
+def merge_requirements(lines, quiet=False):
+    """
+    Menggabungkan dan menghapus duplikat requirement dari banyak sumber.
+
+    Specifier untuk paket yang sama digabung menjadi satu baris dan extras disatukan. Jika ada
+    beberapa pin `==` yang berbeda, pin terakhir yang dipakai, sama seperti urutan instalasi WebUI.
+
+    Args:
+        lines (list): Baris dari `parse_requirements`.
+        quiet (bool, optional): Sembunyikan peringatan konflik. Defaultnya adalah Salah.
+
+    Returns:
+        tuple: Daftar requirement dan daftar opsi pip.
+    """
+    merged = {}
+    direct = []
+    options = []
+
+    for line in lines:
+        if line.startswith("-"):
+            option = line.split(" ", 1)[0]
+            if option in _OPTION_ARGS or option in ("--pre", "--prefer-binary", "--no-binary", "--only-binary"):
+                if line not in options:
+                    options.append(line)
+            elif line not in direct:
+                direct.append(line)
+            continue
+
+        requirement, _, marker = line.partition(";")
+        match = _REQUIREMENT_RE.match(requirement.strip())
+        if not match or "://" in line or " @ " in requirement or os.path.isabs(requirement.strip()):
+            if line not in direct:
+                direct.append(line)
+            continue
+
+        name, extras, specs = match.groups()
+        key = (canonical_name(name), marker.strip())
+        entry = merged.setdefault(key, {"name": name, "extras": [], "specs": []})
+
+        for extra in (extras or "").strip("[]").split(","):
+            extra = extra.strip()
+            if extra and extra not in entry["extras"]:
+                entry["extras"].append(extra)
+
+        for spec in specs.split(","):
+            spec = spec.replace(" ", "")
+            if not spec:
+                continue
+            if spec.startswith("==") and not spec.startswith("==="):
+                pins = [item for item in entry["specs"] if item.startswith("==") and item != spec]
+                if pins and not quiet:
+                    cprint(f"Konflik versi untuk '{name}': {', '.join(pins)} diganti {spec}", color="yellow")
+                entry["specs"] = [item for item in entry["specs"] if item not in pins]
+            if spec not in entry["specs"]:
+                entry["specs"].append(spec)
+
+    requirements = []
+    for (_, marker), entry in merged.items():
+        line = entry["name"]
+        if entry["extras"]:
+            line += f"[{','.join(entry['extras'])}]"
+        line += ",".join(entry["specs"])
+        if marker:
+            line += f"; {marker}"
+        requirements.append(line)
+
+    return requirements + direct, options
+
+def install_requirements(repos, find_links=None, no_index=False, cache_dir=None, args=None, force=False, quiet=False):
+    """
+    Menginstal requirement gabungan dari semua repositori dalam satu perintah `pip install`.
+
+    Requirement dari setiap repositori digabung dan dihapus duplikatnya, lalu diinstal sekali
+    dengan cache wheel persisten. Fingerprint dari set requirement disimpan, sehingga set yang
+    tidak berubah dilewati pada sesi berikutnya. File `install.py` tidak dijalankan di sini.
+
+    Args:
+        repos (str or list): Direktori induk berisi repositori, atau daftar direktori repositori.
+        find_links (str or list, optional): Direktori wheel lokal untuk `--find-links`. Defaultnya adalah Tidak Ada.
+        no_index (bool, optional): Jangan memakai PyPI, hanya `find_links`. Defaultnya adalah Salah.
+        cache_dir (str, optional): Direktori cache wheel pip. Defaultnya adalah cache exnavy.
+        args (list, optional): Argumen tambahan untuk `pip install`. Defaultnya adalah Tidak Ada.
+        force (bool, optional): Instal walaupun fingerprint tidak berubah. Defaultnya adalah Salah.
+        quiet (bool, optional): Sembunyikan pesan. Defaultnya adalah Salah.
+
+    Returns:
+        CompletedProcess: Proses pip, atau None jika tidak ada yang perlu diinstal.
+    """
+    if isinstance(find_links, str):
+        find_links = [find_links]
+
+    requirement_files, install_scripts = find_requirement_files(repos)
+    lines = []
+    for filename in requirement_files:
+        lines.extend(parse_requirements(filename))
+    requirements, options = merge_requirements(lines, quiet=quiet)
+
+    if not requirements:
+        if not quiet:
+            cprint("Tidak ada requirement yang perlu diinstal.", color="yellow")
+        return None
+
+    state_dir = get_cache_dir("requirements")
+    fingerprint = hashlib.sha256(json.dumps({
+        "requirements": sorted(requirements),
+        "options"     : options,
+        "find_links"  : find_links or [],
+        "no_index"    : no_index,
+        "args"        : args or [],
+        "python"      : sys.version,
+        "prefix"      : sys.prefix,
+    }, sort_keys=True).encode()).hexdigest()
+    stamp = os.path.join(state_dir, f"{fingerprint}.done")
+
+    if os.path.exists(stamp) and not force:
+        if not quiet:
+            cprint(f"Requirement dari {len(requirement_files)} repositori tidak berubah, instalasi dilewati.", color="green")
+        return None
+
+    requirements_path = os.path.join(state_dir, f"{fingerprint}.txt")
+    with open(requirements_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(options + requirements) + "\n")
+
+    cmd = [sys.executable, "-m", "pip", "install", "--cache-dir", cache_dir or get_cache_dir("pip"), "-r", requirements_path]
+    for directory in find_links or []:
+        cmd.extend(["--find-links", directory])
+    if no_index:
+        cmd.append("--no-index")
+    if quiet:
+        cmd.append("--quiet")
+    if args:
+        cmd.extend(args)
+
+    if not quiet:
+        cprint(f"Menginstal {len(requirements)} requirement dari {len(requirement_files)} repositori...", color="green")
+
+    result = subprocess.run(cmd)
+
+    if result.returncode == 0:
+        open(stamp, "w").close()
+    elif not quiet:
+        cprint(f"Instalasi requirement gagal dengan kode {result.returncode}.", color="flat_red")
+
+    if install_scripts and not quiet:
+        cprint(f"{len(install_scripts)} repositori memiliki install.py yang tetap dijalankan oleh WebUI.", color="yellow")
+
+    return result
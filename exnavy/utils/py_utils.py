@@ -1,13 +1,55 @@
+import functools
+import importlib.util
 import os
 import math
 import re
 import requests
-import subprocess
 import sys
 import time 
 from urllib.parse import urlparse, unquote
+from .gpu_utils import query_gpus
+from .trace_utils import traced
 from ..colortes import cprint
 
+PLATFORMS = ("google_colab", "sagemaker_studio_lab", "vastai", "azure", "aws")
+
+def _has_module(name):
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def _has_env(*names):
+    return any(name in os.environ for name in names)
+
+@functools.lru_cache(maxsize=None)
+def _platform_flags():
+    return {
+        "google_colab"        : _has_env("COLAB_RELEASE_TAG", "COLAB_GPU", "COLAB_BACKEND_VERSION") or _has_module("google.colab"),
+        "sagemaker_studio_lab": "SageMakerNotebook" in os.environ.get("AWS_EXECUTION_ENV", ""),
+        "vastai"              : _has_env("VAST_CONTAINERLABEL", "VAST_TCP_PORT_22") or _has_module("vastai"),
+        "azure"               : _has_env("AZUREML_RUN_ID", "AZUREML_ARM_SUBSCRIPTION", "CI_RESOURCE_GROUP")
+                                or os.path.isdir("/mnt/batch/tasks/shared") or _has_module("azureml"),
+        "aws"                 : _has_env("AWS_EXECUTION_ENV", "SM_CURRENT_HOST") or os.path.isdir("/opt/ml") or _has_module("boto3"),
+    }
+
+@functools.lru_cache(maxsize=None)
+def detect_platform():
+    """
+    Mendeteksi platform tempat proses berjalan.
+
+    Deteksi hanya memakai variabel lingkungan, `importlib.util.find_spec`, dan penanda di filesystem,
+    tanpa mengimpor paket platform (misalnya `boto3`). Hasilnya disimpan selama proses berjalan.
+
+    Returns:
+        str: Salah satu dari `PLATFORMS`, atau "local" jika tidak ada yang cocok.
+    """
+    flags = _platform_flags()
+    for platform in PLATFORMS:
+        if flags[platform]:
+            return platform
+    return "local"
+
 def is_google_colab():
     """
     Memeriksa apakah lingkungan saat ini adalah Google Colab.
@@ -15,11 +57,7 @@ def is_google_colab():
     Returns:
         bool: Benar jika itu Google Colab, Salah jika sebaliknya.
     """
-    try:
-        import google.colab
-        return True
-    except ImportError:
-        return False
+    return _platform_flags()["google_colab"]
     
 def is_azure():
     """
@@ -28,11 +66,7 @@ def is_azure():
     Returns:
         bool: Benar jika itu Azure, Salah jika sebaliknya.
     """
-    try:
-        import azureml
-        return True
-    except ImportError:
-        return False
+    return _platform_flags()["azure"]
     
 def is_aws():
     """
@@ -41,11 +75,7 @@ def is_aws():
     Returns:
         bool: Benar jika itu AWS, Salah jika sebaliknya.
     """
-    try:
-        import boto3
-        return True
-    except ImportError:
-        return False
+    return _platform_flags()["aws"]
     
 def is_sagemaker_studio_lab():
     """
@@ -54,7 +84,7 @@ def is_sagemaker_studio_lab():
     Returns:
         bool: Benar jika itu SageMaker Studio Lab, Salah jika sebaliknya.
     """
-    return "SageMakerNotebook" in os.environ.get("AWS_EXECUTION_ENV", "")
+    return _platform_flags()["sagemaker_studio_lab"]
 
 def is_vastai():
     """
@@ -63,11 +93,7 @@ def is_vastai():
     Returns:
         bool: Benar jika itu Vast.ai, Salah jika sebaliknya.
     """
-    try:
-        import vastai
-        return True
-    except ImportError:
-        return False
+    return _platform_flags()["vastai"]
     
 def calculate_elapsed_time(start_time):
     """
@@ -94,6 +120,7 @@ def calculate_elapsed_time(start_time):
         mins, secs = divmod(elapsed_time, 60)
         return f"{mins} menit {secs} detik"
     
+@traced("http.head", category="http", record=lambda result, url, *args, **kwargs: {"url": url, "filename": result})
 def get_filename(url, user_header=None):
     """
     Ekstrak nama file dari URL yang diberikan.
@@ -124,6 +151,25 @@ def get_filename(url, user_header=None):
 
     return filename
 
+def get_cache_dir(*parts):
+    """
+    Mengambil direktori cache persisten exnavy dan membuatnya jika belum ada.
+
+    Lokasinya diambil dari `EXNAVY_CACHE_DIR`, lalu `XDG_CACHE_HOME/exnavy`, lalu `~/.cache/exnavy`.
+
+    Args:
+        *parts (str): Subdirektori di dalam direktori cache.
+
+    Returns:
+        str: Path direktori cache.
+    """
+    root = os.environ.get("EXNAVY_CACHE_DIR")
+    if not root:
+        root = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "exnavy")
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
 def get_python_version():
     """
     Mengambil versi Python saat ini.
@@ -151,43 +197,40 @@ def get_gpu_info(get_gpu_name=False):
     """
     Mengambil informasi GPU.
 
+    Memakai satu query `nvidia-smi` yang di-cache (lihat `gpu_utils.query_gpus`), atau sampel dari
+    `GPUTelemetry` yang sedang berjalan.
+
     Args (Argumen):
-        ambil_nama_gpu (bool, opsional): Apakah mengambil nama GPU. Default adalah False.
+        get_gpu_name (bool, opsional): Apakah mengambil nama GPU saja. Default adalah False.
 
     Returns (Mengembalikan):
         str: Informasi GPU.
     """
-    command = ["nvidia-smi", "--query-gpu=gpu_name", "--format=csv"]
-    result = subprocess.run(command, capture_output=True, text=True)
-
-    if result.returncode == 0:
-        info_gpu = result.stdout.strip()
-        if ambil_nama_gpu:
-            if 'name' in info_gpu:
-                return info_gpu[5:]
-        return info_gpu
-    else:
-        pesan_error = result.stderr.strip()
-        if "NVIDIA-SMI has failed" in error_message and "No devices were found" in pesan_error:
+    try:
+        gpus = query_gpus()
+    except RuntimeError as e:
+        error_message = str(e)
+        if "NVIDIA-SMI has failed" in error_message or "No devices were found" in error_message:
             if is_google_colab():
                 from google.colab import runtime
                 runtime.unassign()
             raise RuntimeError("Tidak ada GPU yang ditemukan. GPU tidak ditugaskan di Google Colab.")
         else:
             raise RuntimeError(f"Pelaksanaan perintah gagal dengan kesalahan: {error_message}")
+
+    names = "\n".join(gpu["name"] for gpu in gpus)
+    if get_gpu_name:
+        return names
+    return f"name\n{names}"
         
 def get_gpu_memory():
     """
     Mengambil jumlah memori GPU yang tersedia.
     
     Returns:
-        str: Jumlah memori GPU yang tersedia.
+        str: Jumlah memori GPU yang tersedia dalam MiB, satu baris per GPU.
     """
-
-    command    = ["nvidia-smi", "--query-gpu=memory.free", "--format=csv,noheader,nounits"]
-    result     = subprocess.run(command.split(" "), stdout=subprocess.PIPE)
-    gpu_memory = result.stdout.strip().decode("utf-8")
-    return gpu_memory
+    return "\n".join(f"{gpu['memory.free']:.0f}" for gpu in query_gpus() if gpu["memory.free"] is not None)
 
 def convert_size(size_bytes: int) -> str:
     """
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import re
+import subprocess
+import time
+from .git_utils import GitResult, GitScheduler
+from .package_utils import extract_package
+from .trace_utils import traced
+from ..colortes import cprint
+
+COMPRESSORS = {
+    ".tar.zst": "zstd -T0 -3",
+    ".tar.lz4": "lz4",
+}
+
+def _manifest_path(archive):
+    return archive + ".json"
+
+def _git(args, cwd):
+    result = subprocess.run(["git", *args], text=True, cwd=cwd, capture_output=True)
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+@traced("hash.sha256", category="hash", record=lambda result, filename, *args, **kwargs: {"file": filename, "bytes": os.path.getsize(filename)})
+def _sha256(filename, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def index_directories(directories, root):
+    """
+    Membuat indeks isi direktori: jumlah file, ukuran, dan repositori Git beserta komitnya.
+
+    Args:
+        directories (list): Daftar direktori relatif terhadap `root`.
+        root (str): Direktori dasar.
+
+    Returns:
+        dict: Indeks dengan kunci "directories" dan "repos".
+    """
+    index = {"directories": {}, "repos": {}}
+
+    for directory in directories:
+        files = 0
+        size = 0
+        for current, dirnames, filenames in os.walk(os.path.join(root, directory)):
+            if ".git" in dirnames or ".git" in filenames:
+                rel = os.path.relpath(current, root)
+                index["repos"][rel] = {
+                    "url"   : _git(["config", "--get", "remote.origin.url"], current),
+                    "commit": _git(["rev-parse", "HEAD"], current),
+                    "branch": _git(["rev-parse", "--abbrev-ref", "HEAD"], current),
+                }
+            for name in filenames:
+                files += 1
+                try:
+                    size += os.lstat(os.path.join(current, name)).st_size
+                except OSError:
+                    pass
+            if ".git" in dirnames:
+                for _, _, git_files in os.walk(os.path.join(current, ".git")):
+                    files += len(git_files)
+                dirnames.remove(".git")
+        index["directories"][directory] = {"files": files, "bytes": size}
+
+    return index
+
+def snapshot_environment(archive, directories, root=None, checksum=True, quiet=False):
+    """
+    Mengemas direktori (repositori, ekstensi, dependensi) menjadi satu arsip untuk warm start.
+
+    Arsip ditulis sebagai tar terkompresi (`.tar.zst`, `.tar.lz4`, atau `.tar.gz`), ditemani
+    manifest `<archive>.json` berisi indeks direktori, komit setiap repositori Git, dan sha256 arsip.
+
+    Args:
+        archive (str): Path arsip yang akan dibuat.
+        directories (list): Daftar direktori yang dikemas, relatif terhadap `root`.
+        root (str, optional): Direktori dasar. Defaultnya adalah direktori kerja saat ini.
+        checksum (bool, optional): Hitung sha256 arsip untuk manifest. Defaultnya adalah Benar.
+        quiet (bool, optional): Sembunyikan pesan. Defaultnya adalah Salah.
+
+    Returns:
+        dict: Manifest snapshot.
+    """
+    root = os.path.abspath(root or os.getcwd())
+    directories = [os.path.relpath(os.path.join(root, directory), root) for directory in directories]
+    start_time = time.time()
+
+    tar_args = ["tar", "-cf", archive, "--directory", root]
+    for extension, compressor in COMPRESSORS.items():
+        if archive.endswith(extension):
+            tar_args[1:1] = ["-I", compressor]
+            break
+    else:
+        if archive.endswith((".tar.gz", ".tgz")):
+            tar_args[1:1] = ["-z"]
+        elif not archive.endswith(".tar"):
+            raise ValueError(f"Format arsip tidak didukung: {archive}")
+
+    index = index_directories(directories, root)
+
+    try:
+        subprocess.check_output(tar_args + ["--"] + directories, stderr=subprocess.STDOUT)
+    except subprocess.CalledProcessError as e:
+        cprint(f"Pembuatan snapshot gagal karena kesalahan: {e.output.decode()}", color="flat_red")
+        raise e
+
+    manifest = {
+        "version"    : 1,
+        "created"    : time.time(),
+        "root"       : root,
+        "archive"    : os.path.basename(archive),
+        "size"       : os.path.getsize(archive),
+        "sha256"     : _sha256(archive) if checksum else None,
+        "directories": index["directories"],
+        "repos"      : index["repos"],
+    }
+    with open(_manifest_path(archive), "w") as f:
+        json.dump(manifest, f, indent=4)
+
+    if not quiet:
+        cprint(f"Snapshot {len(directories)} direktori dan {len(index['repos'])} repositori dibuat dalam {time.time() - start_time:.1f} detik.", color="green")
+
+    return manifest
+
+def _sync_repo(scheduler, directory, pinned, ref):
+    start = time.time()
+    name = os.path.basename(directory)
+    attempts = 0
+
+    if not _git(["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"], directory) or not re.fullmatch(r"[0-9a-f]{7,40}", ref):
+        url = _git(["config", "--get", "remote.origin.url"], directory)
+        result, attempts = scheduler.run(["git", "fetch", "--quiet", "origin", ref], cwd=directory, url=url)
+        if result.returncode != 0:
+            return GitResult(name, "restore", "failed", returncode=result.returncode, duration=time.time() - start,
+                             attempts=attempts, stderr=result.stderr, message=f"Gagal mengambil '{ref}' untuk '{name}': {result.stderr.strip()}")
+        target = ["-B", ref, "FETCH_HEAD"] if not re.fullmatch(r"[0-9a-f]{7,40}", ref) else ["FETCH_HEAD"]
+    else:
+        target = [ref]
+
+    result = subprocess.run(["git", "-c", "advice.detachedHead=false", "checkout", "--quiet", *target], text=True, cwd=directory, capture_output=True)
+    if result.returncode != 0:
+        return GitResult(name, "restore", "failed", returncode=result.returncode, duration=time.time() - start,
+                         attempts=attempts, stderr=result.stderr, message=f"Gagal checkout '{ref}' untuk '{name}': {result.stderr.strip()}")
+
+    return GitResult(name, "restore", "updated", duration=time.time() - start, attempts=attempts,
+                     message=f"'{name}' dipindahkan dari {pinned[:7]} ke {ref}")
+
+def restore_environment(archive, root=None, pins=None, verify=True, quiet=False, scheduler=None):
+    """
+    Memulihkan snapshot dari `snapshot_environment` dan hanya mengambil delta repositori yang berubah.
+
+    Arsip diekstrak dengan `extract_package`. Setelah itu, setiap repositori di `pins` yang komitnya
+    berbeda dari manifest di-checkout ke ref yang diminta; fetch hanya dilakukan jika ref tersebut
+    belum ada di repositori lokal.
+
+    Args:
+        archive (str): Path arsip snapshot.
+        root (str, optional): Direktori tujuan. Defaultnya adalah `root` di manifest.
+        pins (dict, optional): Pemetaan path repositori (relatif terhadap `root`) ke komit atau cabang. Defaultnya adalah Tidak Ada.
+        verify (bool, optional): Cocokkan sha256 arsip dengan manifest sebelum ekstraksi. Defaultnya adalah Benar.
+        quiet (bool, optional): Sembunyikan pesan. Defaultnya adalah Salah.
+        scheduler (GitScheduler, optional): Penjadwal untuk fetch. Defaultnya adalah GitScheduler().
+
+    Returns:
+        tuple: Manifest snapshot dan daftar GitResult untuk repositori yang diperbarui.
+    """
+    with open(_manifest_path(archive), "r") as f:
+        manifest = json.load(f)
+
+    root = os.path.abspath(root or manifest["root"])
+    start_time = time.time()
+
+    if verify and manifest.get("sha256") and _sha256(archive) != manifest["sha256"]:
+        raise ValueError(f"Checksum snapshot tidak cocok: {archive}")
+
+    extract_package(archive, root, overwrite=True, quiet=quiet)
+
+    changed = []
+    for repo, ref in (pins or {}).items():
+        repo = os.path.normpath(repo)
+        info = manifest["repos"].get(repo)
+        if info is None:
+            if not quiet:
+                cprint(f"Repositori '{repo}' tidak ada di snapshot, dilewati.", color="yellow")
+            continue
+        if ref and not info["commit"].startswith(ref) and ref != info["branch"]:
+            changed.append((os.path.join(root, repo), info["commit"], ref))
+
+    scheduler = scheduler or GitScheduler()
+    results = scheduler.map(lambda item: _sync_repo(scheduler, *item), changed, desc="Syncing...", quiet=quiet or not changed)
+
+    if not quiet:
+        for result in results:
+            cprint(" [-]", result.message, color="green" if result.ok else "red")
+        cprint(f"Snapshot dipulihkan dalam {time.time() - start_time:.1f} detik, {len(changed)} repositori diperbarui.", color="green")
+
+    return manifest, results
@@ -0,0 +1,220 @@
+import functools
+import json
+import os
+import threading
+import time
+from ..colortes import cprint
+
+_ENABLED = os.environ.get("EXNAVY_TRACE", "").lower() not in ("", "0", "false", "no")
+_EVENTS = []
+_EPOCH = time.perf_counter()
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+    def add(self, key, amount):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Span:
+    """
+    Satu rentang waktu yang diukur. Dibuat oleh `span()`; jangan dibuat langsung.
+    """
+    __slots__ = ("name", "category", "args", "start", "duration", "thread")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0.0
+        self.duration = 0.0
+        self.thread = None
+
+    def set(self, **args):
+        """Menambahkan atau mengganti atribut span, misalnya `bytes` atau `outcome`."""
+        self.args.update(args)
+
+    def add(self, key, amount):
+        """Menambahkan `amount` ke atribut numerik, misalnya byte yang ditulis per chunk."""
+        self.args[key] = self.args.get(key, 0) + amount
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.args["outcome"] = "error"
+            self.args["error"] = exc_type.__name__
+        else:
+            self.args.setdefault("outcome", "ok")
+        self.thread = threading.current_thread()
+        _EVENTS.append(self)
+        return False
+
+def tracing_enabled():
+    """
+    Returns:
+        bool: Benar jika tracing aktif.
+    """
+    return _ENABLED
+
+def enable_tracing(enabled=True):
+    """
+    Mengaktifkan atau menonaktifkan tracing. Defaultnya diambil dari variabel lingkungan `EXNAVY_TRACE`.
+
+    Args:
+        enabled (bool, optional): Status tracing. Defaultnya adalah Benar.
+    """
+    global _ENABLED
+    _ENABLED = bool(enabled)
+
+def span(name, category="exnavy", **args):
+    """
+    Mengukur satu blok kode.
+
+    Jika tracing tidak aktif, objek kosong yang sama selalu dikembalikan sehingga biayanya hanya satu
+    pemeriksaan flag.
+
+    Contoh:
+        with span("download", category="download", url=url) as s:
+            ...
+            s.set(bytes=os.path.getsize(path))
+
+    Args:
+        name (str): Nama span.
+        category (str, optional): Kategori span. Defaultnya adalah "exnavy".
+        **args: Atribut awal span.
+
+    Returns:
+        Span: Context manager span.
+    """
+    if not _ENABLED:
+        return _NULL_SPAN
+    return Span(name, category, args)
+
+def traced(name=None, category="exnavy", record=None):
+    """
+    Dekorator yang membungkus fungsi dalam `span`.
+
+    Args:
+        name (str, optional): Nama span. Defaultnya adalah nama fungsi.
+        category (str, optional): Kategori span. Defaultnya adalah "exnavy".
+        record (callable, optional): Fungsi `record(result, *args, **kwargs)` yang mengembalikan
+            dict atribut tambahan dari hasil dan argumen fungsi. Defaultnya adalah Tidak Ada.
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return func(*args, **kwargs)
+            with Span(span_name, category, {}) as current:
+                result = func(*args, **kwargs)
+                if record is not None:
+                    try:
+                        current.set(**(record(result, *args, **kwargs) or {}))
+                    except Exception:
+                        pass
+                return result
+        return wrapper
+    return decorator
+
+def trace_events():
+    """
+    Returns:
+        list: Semua span yang sudah selesai, berurutan sesuai waktu selesai.
+    """
+    return list(_EVENTS)
+
+def clear_trace():
+    """Menghapus semua span yang tercatat."""
+    del _EVENTS[:]
+
+def export_chrome_trace(filename):
+    """
+    Menulis span ke file JSON format Chrome trace (buka di `chrome://tracing` atau Perfetto).
+
+    Args:
+        filename (str): Path file JSON.
+
+    Returns:
+        int: Jumlah span yang ditulis.
+    """
+    pid = os.getpid()
+    events = []
+    threads = {}
+    for item in trace_events():
+        tid = item.thread.ident if item.thread else 0
+        threads.setdefault(tid, item.thread.name if item.thread else "main")
+        events.append({
+            "name": item.name,
+            "cat" : item.category,
+            "ph"  : "X",
+            "ts"  : round((item.start - _EPOCH) * 1e6, 3),
+            "dur" : round(item.duration * 1e6, 3),
+            "pid" : pid,
+            "tid" : tid,
+            "args": {key: value if isinstance(value, (int, float, bool, type(None))) else str(value) for key, value in item.args.items()},
+        })
+    for tid, thread_name in threads.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+
+    with open(filename, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return len(events) - len(threads)
+
+def trace_summary():
+    """
+    Meringkas span per nama. Durasi bersifat inklusif (termasuk span di dalamnya).
+
+    Returns:
+        list: Dict dengan kunci name, category, count, total, mean, max, bytes, dan errors, diurutkan dari total terbesar.
+    """
+    rows = {}
+    for item in trace_events():
+        row = rows.get(item.name)
+        if row is None:
+            row = rows[item.name] = {"name": item.name, "category": item.category, "count": 0, "total": 0.0,
+                                     "max": 0.0, "bytes": 0, "errors": 0}
+        row["count"] += 1
+        row["total"] += item.duration
+        row["max"] = max(row["max"], item.duration)
+        if isinstance(item.args.get("bytes"), (int, float)):
+            row["bytes"] += item.args["bytes"]
+        if item.args.get("outcome") in ("error", "failed"):
+            row["errors"] += 1
+
+    for row in rows.values():
+        row["mean"] = row["total"] / row["count"]
+    return sorted(rows.values(), key=lambda row: row["total"], reverse=True)
+
+def print_trace_summary(top=20):
+    """
+    Mencetak tabel ringkasan span, dari fase yang paling lama.
+
+    Args:
+        top (int, optional): Jumlah baris maksimum. Defaultnya adalah 20.
+    """
+    rows = trace_summary()[:top]
+    if not rows:
+        cprint("Tidak ada span yang tercatat. Aktifkan dengan EXNAVY_TRACE=1 atau enable_tracing().", color="yellow")
+        return
+
+    width = max(len(row["name"]) for row in rows)
+    cprint(f"{'span':<{width}}  {'count':>6}  {'total s':>9}  {'mean s':>8}  {'max s':>8}  {'MiB':>9}  {'err':>4}", color="green")
+    for row in rows:
+        cprint(f"{row['name']:<{width}}  {row['count']:>6}  {row['total']:>9.3f}  {row['mean']:>8.3f}  {row['max']:>8.3f}  "
+               f"{row['bytes'] / 2**20:>9.1f}  {row['errors']:>4}", color="flat_red" if row["errors"] else "default")
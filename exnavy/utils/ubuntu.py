@@ -1,55 +1,266 @@
 import os
-import zipfile
+import hashlib
+import json
 import requests
 import shutil
-from .py_utils import get_filename
-from tqdm import tqdm
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from .package_utils import stream_extract
+from .py_utils import get_cache_dir, get_filename
 from ..colortes import cprint
 
-def ubuntu_deps(url, dst, desc=None):
+def _deb_fields(deb_files, index):
     """
-    Mengunduh dan mengekstrak paket dependensi Ubuntu.
+    Membaca (Package, Version, Architecture) setiap file .deb, memakai `index` sebagai cache.
+    """
+    missing = [deb for deb in deb_files if os.path.basename(deb) not in index]
+
+    def read_fields(deb):
+        result = subprocess.run(["dpkg-deb", "-f", deb, "Package", "Version", "Architecture"], capture_output=True, text=True)
+        fields = dict(line.split(": ", 1) for line in result.stdout.splitlines() if ": " in line)
+        return os.path.basename(deb), [fields.get("Package"), fields.get("Version"), fields.get("Architecture")]
+
+    with ThreadPoolExecutor() as executor:
+        index.update(executor.map(read_fields, missing))
+
+    return {deb: index[os.path.basename(deb)] for deb in deb_files}
+
+def _pending_debs(deb_files, index):
+    """
+    Menyaring file .deb yang paketnya sudah terpasang dengan versi yang sama, dengan satu `dpkg-query`.
+    """
+    fields = _deb_fields(deb_files, index)
+    packages = sorted({package for package, _, _ in fields.values() if package})
+    if not packages:
+        return deb_files
+
+    result = subprocess.run(
+        ["dpkg-query", "-W", "-f", "${Package}\t${Architecture}\t${Version}\t${db:Status-Abbrev}\n", *packages],
+        capture_output=True, text=True,
+    )
+    installed = set()
+    for line in result.stdout.splitlines():
+        parts = line.split("\t")
+        if len(parts) == 4 and parts[3].startswith("ii"):
+            installed.add(tuple(parts[:3]))
+
+    return [deb for deb, (package, version, arch) in fields.items() if (package, arch, version) not in installed]
+
+def ubuntu_deps(url, dst, desc=None, cache=True):
+    """
+    Mengunduh dan mengekstrak paket dependensi Ubuntu, lalu menginstalnya dalam satu transaksi `dpkg -i`.
+
+    Dengan `cache`, file .deb disimpan di cache exnavy dengan kunci hash URL sehingga sesi berikutnya
+    tidak mengunduh ulang. Paket yang sudah terpasang dengan versi yang sama dilewati.
     
     Args:
         url (str): URL untuk mengekstrak nama file.
-        dst (str): Direktori tujuan.
-        desc (str, optional): Deskripsi untuk tqdm. Defaultnya adalah Tidak Ada.
+        dst (str): Direktori tujuan jika `cache` tidak dipakai.
+        desc (str, optional): Pesan yang ditampilkan saat menginstal. Defaultnya adalah Tidak Ada.
+        cache (bool, optional): Simpan file .deb di cache persisten. Defaultnya adalah Benar.
     """
-    os.makedirs(dst, exist_ok=True)
-    filename = get_filename(url)
-    
-    response = requests.get(url, stream=True)
-    response.raise_for_status()
+    directory = get_cache_dir("debs", hashlib.sha256(url.encode()).hexdigest()[:16]) if cache else dst
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, ".exnavy_debs.json")
 
-    with open(filename, "wb") as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
+    manifest = {}
+    if cache and os.path.exists(manifest_path):
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
 
-    if filename.endswith(".zip"):
-        with zipfile.ZipFile(filename, "r") as deps:
-            deps.extractall(dst)
+    if not manifest:
+        filename = get_filename(url)
+        if not filename:
+            cprint("Gagal menentukan nama file.", color="flat_red")
+            return
 
-        if desc is None:
-            desc = cprint("Menginstall...", color="green", tqdm_desc=True)
+        if filename.endswith((".zip", ".tar", ".tar.gz", ".tgz", ".tar.lz4", ".tar.zst")):
+            stream_extract(url, directory, filename=filename)
 
-        deb_files = [os.path.join(dst, f) for f in os.listdir(dst) if f.endswith(".deb")]
-        for deb_files in tqdm(deb_files, desc=desc):
-             os.system(f'dpkg -i {deb_files}')
-        
-        os.remove(filename)
-        shutil.rmtree(dst)
-    
-    elif filename.endswith(".deb"):
-        os.system(f'dpkg -i {filename}')
-        os.remove(filename)
+        elif filename.endswith(".deb"):
+            response = requests.get(url, stream=True)
+            response.raise_for_status()
+
+            with open(os.path.join(directory, filename), "wb") as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    f.write(chunk)
+
+        manifest = {"url": url, "filename": filename, "fields": {}}
+
+    deb_files = sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".deb"))
+    pending = _pending_debs(deb_files, manifest["fields"]) if deb_files else []
+
+    if cache:
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f)
+
+    if pending:
+        cprint(desc or f"Menginstall {len(pending)} dari {len(deb_files)} paket...", color="green")
+        result = subprocess.run(["dpkg", "-i", *pending])
+        if result.returncode != 0:
+            cprint(f"dpkg gagal dengan kode {result.returncode}.", color="flat_red")
+    else:
+        cprint(f"Semua {len(deb_files)} paket sudah terpasang.", color="green")
+
+    if not cache:
+        shutil.rmtree(directory)
+
+LAYER_BACKENDS = ("overlayfs", "fuse-overlayfs", "unionfs-fuse", "symlink")
+
+def _overlay_options(lower_dirs, upper_dir, work_dir):
+    return f"lowerdir={':'.join(lower_dirs)},upperdir={upper_dir},workdir={work_dir}"
+
+def _mount_overlayfs(lower_dirs, upper_dir, merged_dir, work_dir):
+    if os.geteuid() != 0:
+        return False
+    with open("/proc/filesystems", "r") as f:
+        if "overlay" not in f.read():
+            return False
+    cmd = ["mount", "-t", "overlay", "overlay", "-o", _overlay_options(lower_dirs, upper_dir, work_dir), merged_dir]
+    return subprocess.run(cmd, capture_output=True).returncode == 0
+
+def _mount_fuse_overlayfs(lower_dirs, upper_dir, merged_dir, work_dir):
+    if not shutil.which("fuse-overlayfs") or not os.path.exists("/dev/fuse"):
+        return False
+    cmd = ["fuse-overlayfs", "-o", _overlay_options(lower_dirs, upper_dir, work_dir), merged_dir]
+    return subprocess.run(cmd, capture_output=True).returncode == 0
+
+def _mount_unionfs(lower_dirs, upper_dir, merged_dir, work_dir):
+    if not shutil.which("unionfs-fuse"):
+        return False
+    branches = ":".join([f"{upper_dir}=RW"] + [f"{directory}=RO" for directory in lower_dirs])
+    cmd = ["unionfs-fuse", "-o", "cow,allow_other,auto_unmount", branches, merged_dir]
+    return subprocess.run(cmd, capture_output=True).returncode == 0
+
+def _symlink_farm(layers, merged_dir, hardlink=False):
+    """
+    Membuat tampilan gabungan berupa symlink (atau hardlink) di `merged_dir`, diperbarui secara inkremental.
+
+    Layer pertama memiliki prioritas tertinggi. Link yang dibuat dicatat di `.exnavy_layers.json`,
+    sehingga pemanggilan berikutnya hanya menambah, mengganti, atau menghapus link yang berubah.
+    File asli di `merged_dir` yang bukan buatan farm tidak pernah disentuh.
+    """
+    manifest_path = os.path.join(merged_dir, ".exnavy_layers.json")
+    previous = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r") as f:
+            previous = json.load(f)
+
+    desired = {}
+    for layer in layers:
+        for root, dirnames, filenames in os.walk(layer):
+            rel_root = os.path.relpath(root, layer)
+            for name in filenames:
+                rel = os.path.normpath(os.path.join(rel_root, name))
+                desired.setdefault(rel, os.path.join(root, name))
+
+    def is_ours(path, source):
+        if os.path.islink(path):
+            return os.readlink(path) == source
+        try:
+            return os.path.samefile(path, source)
+        except OSError:
+            return False
+
+    for rel, source in previous.items():
+        path = os.path.join(merged_dir, rel)
+        if desired.get(rel) != source and os.path.lexists(path) and is_ours(path, source):
+            os.remove(path)
 
-    if not filename:
-        cprint("Gagal menentukan nama file.", color="flat_red")
-        return
+    created = {}
+    merged_device = os.stat(merged_dir).st_dev
+    for rel, source in desired.items():
+        path = os.path.join(merged_dir, rel)
+        if os.path.lexists(path):
+            if rel in previous and is_ours(path, source):
+                created[rel] = source
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if hardlink and os.stat(source).st_dev == merged_device:
+            os.link(source, path)
+        else:
+            os.symlink(source, path)
+        created[rel] = source
+
+    with open(manifest_path, "w") as f:
+        json.dump(created, f)
+
+    return True
+
+def layered_dir(lower_dirs, upper_dir, merged_dir, work_dir=None, backend=None, hardlink=False):
+    """
+    Menggabungkan beberapa direktori menjadi satu tampilan berlapis dengan backend tercepat yang tersedia.
+
+    Urutan backend: overlayfs kernel, fuse-overlayfs, unionfs-fuse, lalu "symlink" (farm symlink/hardlink
+    tanpa mount). Pada backend mount, tulisan masuk ke `upper_dir` (copy-on-write). Pada backend
+    "symlink", `upper_dir` ikut di-link dengan prioritas tertinggi dan file baru ditulis langsung ke
+    `merged_dir`; menulis ke file yang di-link akan mengubah file aslinya.
+
+    Args:
+        lower_dirs (str or list): Direktori read-only, yang pertama memiliki prioritas tertinggi.
+        upper_dir (str): Direktori read-write.
+        merged_dir (str): Direktori tampilan gabungan.
+        work_dir (str, optional): Direktori kerja overlayfs, harus satu filesystem dengan `upper_dir`. Defaultnya di samping `upper_dir`.
+        backend (str, optional): Paksa backend tertentu dari LAYER_BACKENDS. Defaultnya adalah Tidak Ada.
+        hardlink (bool, optional): Pakai hardlink untuk backend "symlink" jika satu filesystem. Defaultnya adalah Salah.
+
+    Raises:
+        RuntimeError: Jika backend yang diminta gagal.
+
+    Returns:
+        str: Nama backend yang dipakai.
+    """
+    if isinstance(lower_dirs, str):
+        lower_dirs = [lower_dirs]
+    lower_dirs = [os.path.abspath(directory) for directory in lower_dirs]
+    upper_dir = os.path.abspath(upper_dir)
+    merged_dir = os.path.abspath(merged_dir)
+    work_dir = os.path.abspath(work_dir or os.path.join(os.path.dirname(upper_dir), f".{os.path.basename(upper_dir)}-work"))
+
+    for directory in [*lower_dirs, upper_dir, merged_dir, work_dir]:
+        os.makedirs(directory, exist_ok=True)
+
+    mounters = {
+        "overlayfs"     : lambda: _mount_overlayfs(lower_dirs, upper_dir, merged_dir, work_dir),
+        "fuse-overlayfs": lambda: _mount_fuse_overlayfs(lower_dirs, upper_dir, merged_dir, work_dir),
+        "unionfs-fuse"  : lambda: _mount_unionfs(lower_dirs, upper_dir, merged_dir, work_dir),
+        "symlink"       : lambda: _symlink_farm([upper_dir, *lower_dirs], merged_dir, hardlink=hardlink),
+    }
+
+    if backend is not None and backend not in mounters:
+        raise ValueError(f"Backend tidak valid '{backend}'. Pilihan yang tersedia: {', '.join(LAYER_BACKENDS)}")
+
+    if os.path.ismount(merged_dir):
+        raise RuntimeError(f"{merged_dir} sudah ter-mount.")
+
+    for name in [backend] if backend else LAYER_BACKENDS:
+        if mounters[name]():
+            cprint(f"Direktori digabungkan dengan {name}.", color="flat_green")
+            return name
+
+    raise RuntimeError(f"Gagal menggabungkan direktori dengan {backend}.")
+
+def unmount_layered_dir(merged_dir, backend):
+    """
+    Melepas tampilan gabungan yang dibuat oleh `layered_dir`.
+
+    Args:
+        merged_dir (str): Direktori tampilan gabungan.
+        backend (str): Backend yang dikembalikan oleh `layered_dir`.
+    """
+    if backend == "overlayfs":
+        subprocess.run(["umount", merged_dir], check=True)
+    elif backend in ("fuse-overlayfs", "unionfs-fuse"):
+        fusermount = shutil.which("fusermount3") or shutil.which("fusermount") or "fusermount"
+        subprocess.run([fusermount, "-u", merged_dir], check=True)
+    elif backend == "symlink":
+        _symlink_farm([], merged_dir)
 
 def unionfuse(fused_dir: str, source_dir: str, destination_dir: str):
     """
     Menggabungkan dua direktori menggunakan FUSE.
+
+    Gunakan `layered_dir` untuk memilih backend yang lebih cepat secara otomatis.
     
     Args:
         fused_dir (str): Direktori yang digabungkan.
@@ -63,10 +274,7 @@ def unionfuse(fused_dir: str, source_dir: str, destination_dir: str):
         for directory in [source_dir, fused_dir, destination_dir]:
             os.makedirs(directory, exist_ok=True)
 
-        command = f"unionfs-fuse -o cow,allow_other,auto_unmount {source_dir}=RW:{fused_dir}=RO {destination_dir}"
-        result = os.system(command)
-
-        if result != 0:
+        if not _mount_unionfs([fused_dir], source_dir, destination_dir, None):
             cprint("FUSE tidak terpasang.", color="flat_red")
             raise RuntimeError("FUSE tidak terpasang.")
         else:
@@ -74,4 +282,4 @@ def unionfuse(fused_dir: str, source_dir: str, destination_dir: str):
         
     except Exception as e:
         cprint(f"Terjadi kesalahan saat menggabungkan direktori: {e}", color="flat_red")
-        raise e
\ No newline at end of file
+        raise e
@@ -1,7 +1,7 @@
 import os
-import zipfile
 import requests
 import shutil
+from .package_utils import stream_extract
 from .py_utils import get_filename
 from tqdm import tqdm
 from ..colortes import cprint
@@ -19,28 +19,26 @@ def windows_deps(url, dst, desc=None):
     os.makedirs(dst, exist_ok=True)
     filename = get_filename(url)
 
-    response = requests.get(url, stream=True)
-    response.raise_for_status()
-
-    with open(filename, "wb") as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
-
     if filename.endswith(".zip"):
-        with zipfile.ZipFile(filename, "r") as deps:
-            deps.extractall(dst)
+        stream_extract(url, dst, filename=filename)
 
         if desc is None:
             desc = cprint("Menginstall...", color="green", tqdm_desc=True)
 
         installer_files = [os.path.join(dst, f) for f in os.listdir(dst) if f.endswith(".msi") or f.endswith(".exe")]
-        for installer in tqdm(installer, desc=desc):
+        for installer in tqdm(installer_files, desc=desc):
              os.system(f'start /wait {installer}')
         
-        os.remove(filename)
         shutil.rmtree(dst)
 
     elif filename.endswith(".msi") or filename.endswith(".exe"):
+        response = requests.get(url, stream=True)
+        response.raise_for_status()
+
+        with open(filename, "wb") as f:
+            for chunk in response.iter_content(chunk_size=8192):
+                f.write(chunk)
+
         os.system(f'start /wait {filename}')
         os.remove(filename)
 
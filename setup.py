@@ -15,6 +15,12 @@ setup(
         'xmltodict==0.13.0',
         'pydantic==1.10.9'
     ],
+    extras_require={
+        'fast': [
+            'zstandard',
+            'lz4',
+        ],
+    },
     author='Revaldo',
     author_email='revaldoanjennurillifanderson@gmail.com',
     description='A utility library for Other Notebook',